@@ -8,6 +8,17 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api"
 
     DATABASE_URL: str
+    ASYNC_DATABASE_URL: Optional[str] = None  # Defaults to DATABASE_URL with the asyncpg driver
+
+    # Connection Pooling
+    DB_POOL_ROLE: str = "api"  # Role of the process importing the engine; Celery children switch to "worker"
+    DB_POOL_SIZE_API: int = 10
+    DB_MAX_OVERFLOW_API: int = 20
+    DB_POOL_SIZE_WORKER: int = 2
+    DB_MAX_OVERFLOW_WORKER: int = 6  # Fan-out upload threads open sessions of their own
+    DB_POOL_TIMEOUT: int = 30  # Seconds a checkout waits for a free connection
+    DB_POOL_RECYCLE: int = 30 * 60  # Connections older than this are replaced
+    DB_PGBOUNCER: bool = False  # Behind PgBouncer transaction pooling: no app-side pool
 
     # Logging
     LOG_LEVEL: str = "INFO"  # Can be overridden by environment variable
@@ -20,10 +31,110 @@ class Settings(BaseSettings):
     SOURCE_CONTENT_PATH: str = "storage/source"
     EDITED_CONTENT_PATH: str = "storage/edited"
     PREVIEWS_PATH: str = "storage/previews"
+    RENDITIONS_PATH: str = "storage/renditions"
+
+    # Downloads
+    MAX_CONCURRENT_DOWNLOADS: int = 3  # Clip downloads running at once per worker process
+    DOWNLOAD_FRAGMENT_CONCURRENCY: int = 4  # Fragments fetched in parallel per download
+
+    # Storage Garbage Collection
+    GC_INTERVAL_MINUTES: int = 60
+    GC_BATCH_SIZE: int = 500  # Files checked per database round trip
+    GC_MAX_BATCHES: int = 20  # Batches per run before the walk resumes on the next run
+    GC_BATCH_PAUSE_SECONDS: float = 0.5  # Pause between batches to leave I/O to active encodes
+    GC_MIN_AGE_SECONDS: int = 6 * 60 * 60  # Unreferenced files younger than this are kept
+    GC_PRESSURE_MIN_AGE_SECONDS: int = 60 * 60  # Minimum age used when the disk is nearly full
+    GC_MIN_FREE_FRACTION: float = 0.1  # Free disk fraction below which storage is under pressure
+    GC_POSTED_RETENTION_DAYS: int = 7  # How long edited media of posted items is kept
+    GC_RENDITION_MAX_AGE_SECONDS: int = 3 * 24 * 60 * 60  # Renditions unused for this long are deleted
+
+    # Duplicate Detection
+    DEDUP_ENABLED: bool = True
+    DEDUP_FRAME_SAMPLES: int = 16  # Frames hashed per video
+    DEDUP_VIDEO_MAX_DISTANCE: int = 10  # Aggregate hash distance that makes a candidate
+    DEDUP_FRAME_MAX_DISTANCE: int = 12  # Distance at which two frames match
+    DEDUP_MIN_FRAME_MATCH: float = 0.8  # Fraction of frames that must match a candidate
+    DEDUP_AUDIO_MAX_DISTANCE: int = 14  # Audio hash distance for a confirmed duplicate
+    DEDUP_INDEX_OVERLAP_SECONDS: int = 300  # Window re-read on each lookup for rows committed out of ID order
+
+    # Posting
+    POST_FANOUT_WORKERS: int = 4  # Destinations uploaded to concurrently per item
+    POST_MAX_ATTEMPTS: int = 3  # Attempts per destination before the item is marked as failed
+    POST_STALE_AFTER_SECONDS: int = 60 * 60  # A post still "posting" after this is assumed dead
+
+    # Config Snapshot
+    CONFIG_SNAPSHOT_CHECK_SECONDS: int = 5  # How often workers check whether the configuration changed
+
+    # Review
+    CONTENT_BULK_MAX_ITEMS: int = 1000  # Items approved or rejected per bulk request
+
+    # Daily Stats
+    STATS_REBUILD_INTERVAL_HOURS: int = 24  # How often recent daily stats are rebuilt from the queue and posts
+    STATS_REBUILD_DAYS: int = 3  # Days rebuilt by the periodic run; run rebuild_daily_stats with more for a backfill
+
+    # Post Metrics
+    METRICS_POLL_INTERVAL_MINUTES: int = 5  # How often due posts are looked up
+    METRICS_POLL_BASE_SECONDS: int = 15 * 60  # Delay before the first poll; doubles after each poll
+    METRICS_POLL_MAX_SECONDS: int = 24 * 60 * 60  # Longest delay between polls
+    METRICS_POLL_MAX_AGE_DAYS: int = 90  # Posts older than this are no longer polled
+    METRICS_POLL_BATCH_LIMIT: int = 1000  # Posts polled per run
+    METRICS_RAW_RETENTION_HOURS: int = 48  # Older samples are downsampled to hourly buckets
+    METRICS_HOURLY_RETENTION_DAYS: int = 30  # Older hourly buckets are downsampled to daily buckets
+
+    # Uploads
+    UPLOAD_CHUNK_SIZE: int = 8 * 1024 * 1024  # Bytes per resumable upload request
+    UPLOAD_BUFFER_SIZE: int = 64 * 1024  # Bytes read from disk at a time while sending a chunk
+    UPLOAD_REQUEST_TIMEOUT: int = 120
+    UPLOAD_MAX_RETRIES: int = 5
+    UPLOAD_PUBLISH_POLL_INTERVAL: int = 5  # Seconds between processing status checks
+    UPLOAD_PUBLISH_TIMEOUT: int = 300  # How long to wait for a platform to process an upload
+    INSTAGRAM_GRAPH_API_VERSION: str = "v21.0"
+    TIKTOK_CHUNK_SIZE: int = 10 * 1024 * 1024  # 5-64MB, fixed when the upload is initialised
+    TIKTOK_PRIVACY_LEVEL: str = "SELF_ONLY"  # Unaudited apps may only post privately
+
+    # Credentials
+    CREDENTIAL_REFRESH_MARGIN_SECONDS: int = 15 * 60  # Tokens expiring within this are refreshed
+    CREDENTIAL_REFRESH_INTERVAL_SECONDS: int = 5 * 60  # How often each worker checks for expiring tokens
+    CREDENTIAL_REQUEST_TIMEOUT: int = 30
+    CREDENTIAL_CACHE_MAX_CLIENTS: int = 256  # API clients kept per worker process
+    GOOGLE_CLIENT_ID: str = ""  # Used when an account's credentials have no client_id
+    GOOGLE_CLIENT_SECRET: str = ""
+    TIKTOK_CLIENT_KEY: str = ""  # Used when an account's credentials have no client_key
+    TIKTOK_CLIENT_SECRET: str = ""
+
+    # Queue Change Feed
+    QUEUE_EVENTS_REDIS_URL: str = "redis://localhost:6379/0"
+    QUEUE_EVENTS_STREAM: str = "content-app:queue-events"
+    QUEUE_EVENTS_PENDING_BATCHES: int = 10000  # Commits awaiting publication from the event loop before events are dropped
+    QUEUE_EVENTS_MAX_LENGTH: int = 10000  # Events kept for clients resuming with Last-Event-ID
+    QUEUE_EVENTS_HEARTBEAT_SECONDS: int = 15  # Keep-alive interval of idle event streams
 
     # Task Interval
     TASK_INTERVAL: int = 15
     
+    # Discovery Cache (TTLs in seconds)
+    DISCOVERY_SNIPPET_TTL: int = 7 * 24 * 60 * 60
+    DISCOVERY_STATISTICS_TTL: int = 6 * 60 * 60
+    DISCOVERY_MOST_REPLAYED_TTL: int = 3 * 24 * 60 * 60
+    DISCOVERY_NEGATIVE_TTL: int = 24 * 60 * 60  # How long to remember missing data
+
+    # YouTube
+    YOUTUBE_ENRICHMENT_WORKERS: int = 4  # Concurrent videos.list batches
+    YOUTUBE_DAILY_QUOTA: int = 10000  # Data API units per key per day
+    YOUTUBE_QUOTA_RESERVE: float = 0.1  # Fraction of the quota kept for high-priority flows
+    YOUTUBE_ESTIMATED_RUN_COST: int = 5  # Units a sourcing run is assumed to need when planning
+    QUOTA_YIELD_WINDOW_DAYS: int = 7  # History used to estimate each flow's yield
+
+    # Reddit
+    REDDIT_CLIENT_ID: str = ""
+    REDDIT_CLIENT_SECRET: str = ""
+    REDDIT_USER_AGENT: str = "content-app/1.0"
+    REDDIT_MAX_CONCURRENT_REQUESTS: int = 8  # In-flight API requests per client
+    REDDIT_REQUEST_TIMEOUT: float = 30.0
+    REDDIT_MAX_RETRIES: int = 3
+    REDDIT_MAX_DELTA_ITEMS: int = 500  # Newer submissions read per source per run
+    REDDIT_RANKED_SCAN_LIMIT: int = 100  # Top/hot submissions scanned per source per run
+
     # Content Settings
     MAX_CONTENT_SIZE: int = 500 * 1024 * 1024  # 500MB
 
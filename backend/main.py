@@ -6,7 +6,7 @@ from src.api.routes.config import router as config_router
 from src.api.routes.content import router as content_router
 from src.api.routes.queues import router as queues_router
 from src.api.routes.stats import router as stats_router
-from src.database.session import engine, Base, get_db, SessionLocal
+from src.database.session import engine, async_engine, Base, get_db, SessionLocal
 from src.core.orchestrator import ContentAppOrchestrator
 from sqlalchemy.orm import Session
 from config import Settings
@@ -26,6 +26,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],  # Keyset pagination cursor, config revision
 )
 
 # Include routers
@@ -52,6 +53,7 @@ async def shutdown_event():
     if orchestrator and orchestrator.db:
         orchestrator.db.close()
     orchestrator = None
+    await async_engine.dispose()
     print("ContentAppOrchestrator stopped.")
 
 
@@ -0,0 +1,147 @@
+"""Concurrent load benchmark for the Content App API.
+
+Fires requests at one or more endpoints from many concurrent clients and
+reports throughput and latency percentiles. Run it against the same data set
+before and after a change, saving each run, then compare the two:
+
+    python scripts/benchmark_api.py --output before.json
+    # ... deploy the change ...
+    python scripts/benchmark_api.py --output after.json --compare before.json
+
+By default it mixes the queue list (full and projected), the pending inbox
+and the overview stats; pass --path to benchmark other endpoints.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Dict, List
+
+import httpx
+
+DEFAULT_PATHS = [
+    "/api/queues/items?limit=50",
+    "/api/queues/items?limit=50&fields=id,status,preview_path",
+    "/api/content/pending",
+    "/api/stats/overview",
+]
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(int(round(percentile / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+async def _client_loop(
+    client: httpx.AsyncClient,
+    paths: List[str],
+    offset: int,
+    deadline: float,
+    results: Dict[str, Dict[str, list]]
+) -> None:
+    index = offset
+    while time.monotonic() < deadline:
+        path = paths[index % len(paths)]
+        index += 1
+        started = time.perf_counter()
+        try:
+            response = await client.get(path)
+            ok = response.status_code < 500
+        except httpx.HTTPError:
+            ok = False
+        elapsed = time.perf_counter() - started
+        results[path]["latencies" if ok else "errors"].append(elapsed)
+
+
+async def run_benchmark(base_url: str, paths: List[str], concurrency: int, duration: float, warmup: float) -> Dict:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        if warmup > 0:
+            warmup_results = {path: {"latencies": [], "errors": []} for path in paths}
+            await asyncio.gather(*(
+                _client_loop(client, paths, i, time.monotonic() + warmup, warmup_results)
+                for i in range(concurrency)
+            ))
+
+        results = {path: {"latencies": [], "errors": []} for path in paths}
+        started = time.monotonic()
+        await asyncio.gather(*(
+            _client_loop(client, paths, i, started + duration, results)
+            for i in range(concurrency)
+        ))
+        elapsed = time.monotonic() - started
+
+    report = {"base_url": base_url, "concurrency": concurrency, "duration": elapsed, "endpoints": {}}
+    all_latencies = []
+    total_errors = 0
+    for path, result in results.items():
+        latencies = result["latencies"]
+        all_latencies.extend(latencies)
+        total_errors += len(result["errors"])
+        report["endpoints"][path] = {
+            "requests": len(latencies),
+            "errors": len(result["errors"]),
+            "rps": len(latencies) / elapsed,
+            "p50_ms": _percentile(latencies, 50) * 1000,
+            "p95_ms": _percentile(latencies, 95) * 1000,
+            "p99_ms": _percentile(latencies, 99) * 1000,
+        }
+    report["total"] = {
+        "requests": len(all_latencies),
+        "errors": total_errors,
+        "rps": len(all_latencies) / elapsed,
+        "mean_ms": statistics.mean(all_latencies) * 1000 if all_latencies else 0.0,
+        "p50_ms": _percentile(all_latencies, 50) * 1000,
+        "p95_ms": _percentile(all_latencies, 95) * 1000,
+        "p99_ms": _percentile(all_latencies, 99) * 1000,
+    }
+    return report
+
+
+def _print_report(report: Dict) -> None:
+    print(f"{report['base_url']}  concurrency={report['concurrency']}  duration={report['duration']:.1f}s")
+    print(f"{'endpoint':60} {'req':>7} {'err':>5} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for path, stats in list(report["endpoints"].items()) + [("TOTAL", report["total"])]:
+        print(
+            f"{path[:60]:60} {stats['requests']:>7} {stats['errors']:>5} {stats['rps']:>8.1f} "
+            f"{stats['p50_ms']:>7.1f}ms {stats['p95_ms']:>6.1f}ms {stats['p99_ms']:>6.1f}ms"
+        )
+
+
+def _print_comparison(before: Dict, after: Dict) -> None:
+    print("\nChange against baseline:")
+    for label, key in (("throughput", "rps"), ("p50 latency", "p50_ms"), ("p95 latency", "p95_ms"), ("p99 latency", "p99_ms")):
+        old, new = before["total"][key], after["total"][key]
+        change = (new - old) / old * 100 if old else 0.0
+        print(f"  {label:12} {old:10.1f} -> {new:10.1f}  ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent load benchmark for the Content App API")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--path", action="append", dest="paths", help="Endpoint to request (repeatable)")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent clients")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Unmeasured seconds before the run")
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    parser.add_argument("--compare", help="Baseline JSON report to compare against")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark(
+        args.base_url, args.paths or DEFAULT_PATHS, args.concurrency, args.duration, args.warmup
+    ))
+    _print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            _print_comparison(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Local mock of a resumable upload platform.
+
+Implements the Content-Range protocol used by ContentRangeTransport:
+
+    POST /upload                 -> 200, Location: <session URL>
+    PUT  /upload/<id>            Content-Range: bytes a-b/total
+                                 -> 308 Range: bytes=0-N while incomplete
+                                 -> 201 {"id": ...} once every byte arrived
+    PUT  /upload/<id>            Content-Range: bytes */total (offset query)
+
+Uploaded files are written to --storage. Use --fail-every to drop every Nth
+chunk midway, which exercises resuming from the acknowledged offset.
+
+    python scripts/mock_upload_server.py --port 8089 --fail-every 3
+"""
+import argparse
+import json
+import os
+import re
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BUFFER_SIZE = 64 * 1024
+
+
+class UploadState:
+    def __init__(self, storage: str, fail_every: int):
+        self.storage = storage
+        self.fail_every = fail_every
+        self.sessions = {}  # session ID -> {"total": int, "received": int}
+        self.chunk_count = 0
+        self.lock = threading.Lock()
+
+    def path_for(self, session_id: str) -> str:
+        return os.path.join(self.storage, f"{session_id}.bin")
+
+
+class UploadHandler(BaseHTTPRequestHandler):
+    state: UploadState
+
+    def _send_json(self, status: int, payload: dict, headers: dict = None) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_progress(self, session_id: str) -> None:
+        session = self.state.sessions[session_id]
+        if session["received"] >= session["total"]:
+            self._send_json(201, {"id": session_id, "size": session["total"]})
+            return
+        self.send_response(308)
+        if session["received"]:
+            self.send_header("Range", f"bytes=0-{session['received'] - 1}")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        if self.path != "/upload":
+            self._send_json(404, {"error": "not found"})
+            return
+        # Drain the metadata body
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        total = int(self.headers.get("X-Upload-Content-Length", 0))
+        session_id = uuid.uuid4().hex
+        with self.state.lock:
+            self.state.sessions[session_id] = {"total": total, "received": 0}
+        open(self.state.path_for(session_id), "wb").close()
+        host = self.headers.get("Host", f"localhost:{self.server.server_port}")
+        self._send_json(200, {}, {"Location": f"http://{host}/upload/{session_id}"})
+
+    def do_PUT(self):
+        match = re.fullmatch(r"/upload/([0-9a-f]+)", self.path)
+        session_id = match.group(1) if match else None
+        if session_id not in self.state.sessions:
+            self._send_json(404, {"error": "unknown upload session"})
+            return
+        session = self.state.sessions[session_id]
+        content_range = self.headers.get("Content-Range", "")
+        length = int(self.headers.get("Content-Length", 0))
+
+        if content_range.startswith("bytes */"):
+            self._send_progress(session_id)
+            return
+
+        range_match = re.fullmatch(r"bytes (\d+)-(\d+)/(\d+)", content_range)
+        if not range_match:
+            self._send_json(400, {"error": "invalid Content-Range"})
+            return
+        start = int(range_match.group(1))
+        if start != session["received"]:
+            # Out of order, tell the client where to continue
+            self.rfile.read(length)
+            self._send_progress(session_id)
+            return
+
+        with self.state.lock:
+            self.state.chunk_count += 1
+            fail = self.state.fail_every and self.state.chunk_count % self.state.fail_every == 0
+        # A dropped chunk keeps only its first half, like a connection lost mid-request
+        keep = length // 2 if fail else length
+
+        with open(self.state.path_for(session_id), "r+b") as f:
+            f.seek(start)
+            remaining = length
+            while remaining:
+                data = self.rfile.read(min(BUFFER_SIZE, remaining))
+                if not data:
+                    break
+                written = max(min(len(data), keep - (length - remaining)), 0)
+                f.write(data[:written])
+                session["received"] += written
+                remaining -= len(data)
+
+        if fail:
+            self._send_json(503, {"error": "simulated failure"})
+            return
+        self._send_progress(session_id)
+
+    def log_message(self, format, *args):
+        print(f"{self.address_string()} {format % args}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock resumable upload server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--storage", default="mock_uploads")
+    parser.add_argument("--fail-every", type=int, default=0, help="Fail every Nth chunk (0 disables)")
+    args = parser.parse_args()
+
+    os.makedirs(args.storage, exist_ok=True)
+    UploadHandler.state = UploadState(args.storage, args.fail_every)
+    server = ThreadingHTTPServer((args.host, args.port), UploadHandler)
+    print(f"Mock upload server listening on http://{args.host}:{args.port}/upload")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
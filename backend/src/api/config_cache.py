@@ -0,0 +1,90 @@
+"""Revision-keyed cache and conditional GET support for configuration endpoints."""
+
+from typing import Any, Callable, Dict, Optional, Tuple
+import threading
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session
+from src.core.config_revision import current_revision
+
+
+class ConfigResponseCache:
+    """Serialized configuration responses of this process, keyed by resource.
+
+    An entry is valid only for the configuration revision it was built at.
+    A write in any process bumps the revision, so the next request rebuilds
+    the entry instead of serving the old one.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[int, bytes]] = {}
+        self._adapters: Dict[Any, TypeAdapter] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, revision: int) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and entry[0] == revision:
+            return entry[1]
+        return None
+
+    def put(self, key: str, revision: int, body: bytes) -> None:
+        with self._lock:
+            cached = self._entries.get(key)
+            # A slower request built at an older revision must not replace a newer entry
+            if not cached or cached[0] <= revision:
+                self._entries[key] = (revision, body)
+
+    def serialize(self, response_type: Any, data: Any) -> bytes:
+        with self._lock:
+            adapter = self._adapters.get(response_type)
+            if adapter is None:
+                adapter = self._adapters[response_type] = TypeAdapter(response_type)
+        return adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+
+
+config_response_cache = ConfigResponseCache()
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def config_response(
+    request: Request,
+    db: Session,
+    key: str,
+    response_type: Any,
+    load: Callable[[], Any]
+) -> Response:
+    """Serve a configuration resource with an ETag of the configuration revision.
+
+    Answers 304 when the client already has the current revision, serves the
+    cached body when this process has one for the revision, and only loads
+    and serializes the resource otherwise.
+
+    Args:
+        request: Incoming request, for If-None-Match
+        db: Database session
+        key: Cache key of the resource, e.g. "flows"
+        response_type: Type the loaded data is serialized as, e.g. List[schemas.ContentFlow]
+        load: Loads the resource's ORM objects
+
+    Returns:
+        JSON response, or an empty 304 response
+    """
+    # Read before the data, so the tag is never newer than the body
+    revision = current_revision(db)
+    etag = f'"{revision}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    body = config_response_cache.get(key, revision)
+    if body is None:
+        body = config_response_cache.serialize(response_type, load())
+        config_response_cache.put(key, revision, body)
+    return Response(content=body, media_type="application/json", headers=headers)
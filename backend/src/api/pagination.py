@@ -0,0 +1,79 @@
+"""Keyset (cursor) pagination helpers for list endpoints."""
+
+from typing import Any, List, Optional, Tuple
+from datetime import datetime
+import base64
+import binascii
+import json
+from fastapi import HTTPException, Response, status
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, item_id: int) -> str:
+    """Opaque cursor pointing just past the given row."""
+    raw = json.dumps([created_at.isoformat(), item_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by encode_cursor.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, item_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(item_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+async def keyset_page(
+    db: AsyncSession,
+    statement: Select,
+    created_at_column: Any,
+    id_column: Any,
+    cursor: Optional[str],
+    limit: int,
+    response: Response
+) -> List[Any]:
+    """Fetch one page, newest first, and set the next page's cursor header.
+
+    Rows are ordered by (created_at, id) descending and each page starts after
+    the last row of the previous one, so the database seeks straight to it
+    through a matching index instead of scanning skipped rows. Rows inserted
+    while paging do not shift later pages.
+
+    Args:
+        db: Database session
+        statement: Filtered select of ORM entities that have the two columns
+        created_at_column: Creation timestamp column
+        id_column: Primary key column, the tie breaker
+        cursor: Cursor from the previous page's header, None for the first page
+        limit: Page size
+        response: Response that gets the X-Next-Cursor header if there are more rows
+
+    Returns:
+        Rows of the page
+    """
+    if cursor:
+        created_at, item_id = decode_cursor(cursor)
+        statement = statement.where(tuple_(created_at_column, id_column) < tuple_(created_at, item_id))
+
+    # One extra row tells whether there is a next page
+    result = await db.execute(statement.order_by(created_at_column.desc(), id_column.desc()).limit(limit + 1))
+    rows = list(result.scalars().all())
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            getattr(last, created_at_column.key), getattr(last, id_column.key)
+        )
+    return rows
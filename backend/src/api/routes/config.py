@@ -1,24 +1,16 @@
 """Configuration routes for the Content App API."""
 
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Depends, Request
+from sqlalchemy.orm import Session, joinedload, selectinload
 from typing import List
 from src.database import models, schemas
 from src.database.session import get_db
+from src.api.config_cache import config_response
 
 router = APIRouter(tags=["config"])  
 
 # Global Config Routes
-@router.get("/global", response_model=schemas.GlobalConfig)
-def get_global_config(db: Session = Depends(get_db)):
-    """Get the global configuration.
-    
-    Returns:
-        GlobalConfig: Global configuration settings
-        
-    Raises:
-        HTTPException: If no global config exists
-    """
+def _load_global_config(db: Session) -> models.GlobalConfig:
     config = db.query(models.GlobalConfig).first()
     if not config:
         config = models.GlobalConfig()
@@ -27,6 +19,15 @@ def get_global_config(db: Session = Depends(get_db)):
         db.refresh(config)
     return config
 
+@router.get("/global", response_model=schemas.GlobalConfig)
+def get_global_config(request: Request, db: Session = Depends(get_db)):
+    """Get the global configuration.
+    
+    Returns:
+        GlobalConfig: Global configuration settings
+    """
+    return config_response(request, db, "global", schemas.GlobalConfig, lambda: _load_global_config(db))
+
 @router.put("/global", response_model=schemas.GlobalConfig)
 def update_global_config(config: schemas.GlobalConfigUpdate, db: Session = Depends(get_db)):
     """Update the global configuration.
@@ -54,13 +55,15 @@ def update_global_config(config: schemas.GlobalConfigUpdate, db: Session = Depen
 
 # Source Config Routes
 @router.get("/sources", response_model=List[schemas.SourceConfig])
-def list_source_configs(db: Session = Depends(get_db)):
+def list_source_configs(request: Request, db: Session = Depends(get_db)):
     """List all source configurations.
     
     Returns:
         List[SourceConfig]: List of all source configurations in the system
     """
-    return db.query(models.SourceConfig).all()
+    return config_response(
+        request, db, "sources", List[schemas.SourceConfig], lambda: db.query(models.SourceConfig).all()
+    )
 
 @router.post("/sources", response_model=schemas.SourceConfig)
 def create_source_config(config: schemas.SourceConfigCreate, db: Session = Depends(get_db)):
@@ -242,13 +245,15 @@ def delete_source_rate_limit(rate_limit_id: int, db: Session = Depends(get_db)):
 
 # Editing Pipeline Routes
 @router.get("/pipelines", response_model=List[schemas.EditingPipeline])
-def list_editing_pipelines(db: Session = Depends(get_db)):
+def list_editing_pipelines(request: Request, db: Session = Depends(get_db)):
     """List all editing pipeline configurations.
     
     Returns:
         List[EditingPipeline]: List of all editing pipelines in the system
     """
-    return db.query(models.EditingPipeline).all()
+    return config_response(
+        request, db, "pipelines", List[schemas.EditingPipeline], lambda: db.query(models.EditingPipeline).all()
+    )
 
 @router.post("/pipelines", response_model=schemas.EditingPipeline)
 def create_editing_pipeline(pipeline: schemas.EditingPipelineCreate, db: Session = Depends(get_db)):
@@ -427,13 +432,15 @@ def delete_destination_rate_limit(rate_limit_id: int, db: Session = Depends(get_
 
 # Destination Account Routes
 @router.get("/destinations", response_model=List[schemas.DestinationAccount])
-def list_destination_accounts(db: Session = Depends(get_db)):
+def list_destination_accounts(request: Request, db: Session = Depends(get_db)):
     """List all destination account configurations.
     
     Returns:
         List[DestinationAccount]: List of all destination accounts in the system
     """
-    return db.query(models.DestinationAccount).all()
+    return config_response(
+        request, db, "destinations", List[schemas.DestinationAccount], lambda: db.query(models.DestinationAccount).all()
+    )
 
 @router.post("/destinations", response_model=schemas.DestinationAccount)
 def create_destination_account(account: schemas.DestinationAccountCreate, db: Session = Depends(get_db)):
@@ -509,7 +516,10 @@ def delete_destination_account(account_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Destination account not found")
     
     # Check if account is being used
-    flows = db.query(models.ContentFlow).filter(models.ContentFlow.destination_account_id == account_id).all()
+    flows = db.query(models.ContentFlow).filter(
+        (models.ContentFlow.destination_account_id == account_id)
+        | models.ContentFlow.additional_destinations.any(models.DestinationAccount.id == account_id)
+    ).all()
     if flows:
         raise HTTPException(
             status_code=400,
@@ -521,14 +531,39 @@ def delete_destination_account(account_id: int, db: Session = Depends(get_db)):
     return {"message": "Destination account deleted"}
 
 # Content Flow Routes
+def _get_destination_accounts(account_ids: List[int], db: Session) -> List[models.DestinationAccount]:
+    """Load destination accounts by ID.
+    
+    Raises:
+        HTTPException: If any account does not exist
+    """
+    if not account_ids:
+        return []
+    accounts = db.query(models.DestinationAccount).filter(models.DestinationAccount.id.in_(account_ids)).all()
+    missing = set(account_ids) - {account.id for account in accounts}
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Destination accounts not found: {sorted(missing)}")
+    return accounts
+
 @router.get("/flows", response_model=List[schemas.ContentFlow])
-def list_content_flows(db: Session = Depends(get_db)):
+def list_content_flows(request: Request, db: Session = Depends(get_db)):
     """List all content flow configurations.
     
     Returns:
         List[ContentFlow]: List of all content flows in the system
     """
-    return db.query(models.ContentFlow).all()
+    return config_response(
+        request,
+        db,
+        "flows",
+        List[schemas.ContentFlow],
+        lambda: db.query(models.ContentFlow).options(
+            joinedload(models.ContentFlow.source_config),
+            joinedload(models.ContentFlow.editing_pipeline),
+            joinedload(models.ContentFlow.destination_account),
+            selectinload(models.ContentFlow.additional_destinations),
+        ).all()
+    )
 
 @router.post("/flows", response_model=schemas.ContentFlow)
 def create_content_flow(flow: schemas.ContentFlowCreate, db: Session = Depends(get_db)):
@@ -540,7 +575,10 @@ def create_content_flow(flow: schemas.ContentFlowCreate, db: Session = Depends(g
     Returns:
         ContentFlow: Created flow configuration
     """
-    db_flow = models.ContentFlow(**flow.model_dump())
+    flow_data = flow.model_dump()
+    additional_destination_ids = flow_data.pop("additional_destination_ids")
+    db_flow = models.ContentFlow(**flow_data)
+    db_flow.additional_destinations = _get_destination_accounts(additional_destination_ids, db)
     db.add(db_flow)
     db.commit()
     db.refresh(db_flow)
@@ -582,8 +620,11 @@ def update_content_flow(flow_id: int, flow: schemas.ContentFlowCreate, db: Sessi
     if not db_flow:
         raise HTTPException(status_code=404, detail="Content flow not found")
     
-    for key, value in flow.model_dump().items():
+    flow_data = flow.model_dump()
+    additional_destination_ids = flow_data.pop("additional_destination_ids")
+    for key, value in flow_data.items():
         setattr(db_flow, key, value)
+    db_flow.additional_destinations = _get_destination_accounts(additional_destination_ids, db)
     
     db.commit()
     db.refresh(db_flow)
@@ -1,41 +1,253 @@
 """Content management routes for the Content App API."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from src.database.session import get_db
+from collections import Counter
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, load_only
+from typing import Any, List, Optional
+from src.database.session import get_async_db
 from src.core.orchestrator import ContentAppOrchestrator
 from src.database import schemas, models
-from datetime import datetime
+from src.api.pagination import keyset_page
+from src.events.queue_events import publish_events, queue_event
+from src.stats.rollups import flow_stats_increment
+from datetime import datetime, timezone
+from config import Settings
+
+settings = Settings()
 
 router = APIRouter(tags=["content"])  # Remove prefix since it's added in main.py
 
+# Statuses an item can be approved or rejected from; a rejection can be revisited
+REVIEWABLE_STATUSES = {
+    "approve": (models.ContentStatus.READY, models.ContentStatus.REJECTED),
+    "reject": (models.ContentStatus.READY, models.ContentStatus.APPROVED),
+}
+REVIEW_STATUS = {"approve": models.ContentStatus.APPROVED, "reject": models.ContentStatus.REJECTED}
+REVIEW_COUNTER = {"approve": "approved", "reject": "rejected"}
+
+# Queue item columns serialized by schemas.PendingContentItem
+PENDING_ITEM_COLUMNS = [
+    name for name in schemas.PendingContentItem.model_fields if name != "content_flow"
+]
+
 
-@router.get("/pending", response_model=List[schemas.ContentQueue])
+@router.get("/pending", response_model=List[schemas.PendingContentItem])
 async def get_pending_content(
-    skip: int = 0, limit: int = 10, db: Session = Depends(get_db)
+    response: Response,
+    flow_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=50, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get pending content that needs approval.
+    """Get content awaiting approval, newest first.
+    
+    Pages are chained with cursors: when more items exist, the response has an
+    X-Next-Cursor header whose value is passed as ``cursor`` for the next page.
     
     Args:
-        skip (int, optional): Number of records to skip. Defaults to 0.
-        limit (int, optional): Maximum number of records to return. Defaults to 10.
+        flow_id (int, optional): Only return items of this flow
+        cursor (str, optional): Cursor of the next page
+        limit (int, optional): Maximum number of records to return. Defaults to 50.
         
     Returns:
-        List[ContentQueue]: List of pending content items
+        List[PendingContentItem]: List of pending content items
+    """
+    item = models.ContentQueueItem
+    query = (
+        select(item)
+        .options(
+            load_only(*(getattr(item, name) for name in PENDING_ITEM_COLUMNS)),
+            joinedload(item.content_flow).load_only(
+                models.ContentFlow.id, models.ContentFlow.name, models.ContentFlow.require_approval
+            ),
+        )
+        .where(item.status == models.ContentStatus.READY)
+    )
+    if flow_id:
+        query = query.where(item.content_flow_id == flow_id)
+    return await keyset_page(db, query, item.created_at, item.id, cursor, limit, response)
+
+
+async def _apply_review(
+    db: AsyncSession,
+    action: str,
+    condition: Any,
+    reason: Optional[str] = None,
+    limit: Optional[int] = None
+) -> List[Any]:
+    """Approve or reject every reviewable item matching ``condition`` in one UPDATE.
+
+    The matching rows are locked, updated and returned with their previous
+    status in a single statement, and the flow statistics are incremented in
+    the same transaction. Change feed events are published after the commit,
+    since a bulk UPDATE bypasses the session's flush.
+
+    Args:
+        db: Database session
+        action: "approve" or "reject"
+        condition: Filter on ContentQueueItem selecting the candidates
+        reason: Rejection reason
+        limit: Maximum number of items to update, oldest first
+
+    Returns:
+        Rows of (id, content_flow_id, source_platform, previous_status) of the updated items
     """
-    pending = (
-        db.query(models.ContentQueueItem)
-        .filter(models.ContentQueueItem.status == models.ContentStatus.COMPLETED)
-        .offset(skip)
-        .limit(limit)
-        .all()
+    item = models.ContentQueueItem
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    if action == "approve":
+        values = {"approved_at": now, "rejected_at": None, "rejection_reason": None}
+    else:
+        values = {"approved_at": None, "rejected_at": now, "rejection_reason": reason}
+
+    candidates = (
+        select(item.id, item.status)
+        .where(condition, item.status.in_(REVIEWABLE_STATUSES[action]))
+        .order_by(item.created_at, item.id)
+    )
+    if limit is not None:
+        candidates = candidates.limit(limit)
+    previous = candidates.with_for_update().subquery("previous")
+
+    result = await db.execute(
+        update(item)
+        .where(item.id == previous.c.id)
+        .values(status=REVIEW_STATUS[action], **values)
+        .returning(item.id, item.content_flow_id, item.source_platform, previous.c.status.label("previous_status"))
+        .execution_options(synchronize_session=False)
     )
-    return pending
+    rows = result.all()
+
+    per_flow = Counter((row.content_flow_id, row.source_platform) for row in rows)
+    for (flow_id, platform), count in per_flow.items():
+        await db.execute(flow_stats_increment(flow_id, platform, **{REVIEW_COUNTER[action]: count}))
+    await db.commit()
+
+    await run_in_threadpool(publish_events, [
+        queue_event("updated", row.id, row.content_flow_id, row.source_platform, REVIEW_STATUS[action], row.previous_status)
+        for row in rows
+    ])
+    return rows
+
+
+async def _review_one(db: AsyncSession, content_id: int, action: str, reason: Optional[str] = None) -> None:
+    """Approve or reject a single item.
+
+    Raises:
+        HTTPException: 404 if the item does not exist, 409 if it is not reviewable
+    """
+    if await _apply_review(db, action, models.ContentQueueItem.id == content_id, reason):
+        return
+    content = await db.get(models.ContentQueueItem, content_id)
+    if not content:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Content not found"
+        )
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"Content with status {content.status.value} cannot be {REVIEW_STATUS[action].value}"
+    )
+
+
+def _filter_condition(content_filter: schemas.ContentBulkFilter) -> Any:
+    item = models.ContentQueueItem
+    conditions = [item.status == content_filter.status]
+    if content_filter.content_flow_id is not None:
+        conditions.append(item.content_flow_id == content_filter.content_flow_id)
+    if content_filter.source_platform is not None:
+        conditions.append(item.source_platform == content_filter.source_platform)
+    if content_filter.created_after is not None:
+        conditions.append(item.created_at >= content_filter.created_after)
+    if content_filter.created_before is not None:
+        conditions.append(item.created_at < content_filter.created_before)
+    return and_(*conditions)
+
+
+@router.post("/bulk", response_model=schemas.ContentBulkReviewResult)
+async def review_content_bulk(
+    request: schemas.ContentBulkReview,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Approve or reject many items in one transaction.
+
+    Items are selected either by ``ids``, which reports a result per id, or by
+    ``filter``, which reports the updated items. A filter updates at most
+    CONTENT_BULK_MAX_ITEMS items, oldest first; ``has_more`` tells whether to
+    repeat the request.
+
+    Args:
+        request: Action, selection and rejection reason
+
+    Returns:
+        ContentBulkReviewResult: Number of updated items and per-item results
+
+    Raises:
+        HTTPException: If the selection is invalid or a rejection has no reason
+    """
+    if (request.ids is None) == (request.filter is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide either ids or filter"
+        )
+    if request.action == "reject" and not request.reason:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A reason is required to reject content"
+        )
+
+    new_status = REVIEW_STATUS[request.action]
+    if request.filter is not None:
+        limit = settings.CONTENT_BULK_MAX_ITEMS
+        rows = await _apply_review(db, request.action, _filter_condition(request.filter), request.reason, limit)
+        return {
+            "action": request.action,
+            "updated": len(rows),
+            "has_more": len(rows) == limit,
+            "results": [
+                {"id": row.id, "result": "updated", "status": new_status, "previous_status": row.previous_status}
+                for row in rows
+            ],
+        }
+
+    ids = list(dict.fromkeys(request.ids))
+    if len(ids) > settings.CONTENT_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.CONTENT_BULK_MAX_ITEMS} ids per request"
+        )
+    updated = {
+        row.id: row
+        for row in await _apply_review(db, request.action, models.ContentQueueItem.id.in_(ids), request.reason)
+    }
+    skipped = [content_id for content_id in ids if content_id not in updated]
+    current = {}
+    if skipped:
+        current = dict((await db.execute(
+            select(models.ContentQueueItem.id, models.ContentQueueItem.status)
+            .where(models.ContentQueueItem.id.in_(skipped))
+        )).all())
+
+    results = []
+    for content_id in ids:
+        if content_id in updated:
+            results.append({
+                "id": content_id,
+                "result": "updated",
+                "status": new_status,
+                "previous_status": updated[content_id].previous_status,
+            })
+        elif content_id in current:
+            results.append({"id": content_id, "result": "not_reviewable", "status": current[content_id]})
+        else:
+            results.append({"id": content_id, "result": "not_found"})
+    return {"action": request.action, "updated": len(updated), "results": results}
 
 
 @router.post("/{content_id}/approve")
-async def approve_content(content_id: int, db: Session = Depends(get_db)):
+async def approve_content(content_id: int, db: AsyncSession = Depends(get_async_db)):
     """Approve content for posting.
     
     Args:
@@ -45,27 +257,14 @@ async def approve_content(content_id: int, db: Session = Depends(get_db)):
         dict: Success message
         
     Raises:
-        HTTPException: If content not found or approval fails
+        HTTPException: If content not found or cannot be approved
     """
-    content = db.query(models.ContentQueueItem).get(content_id)
-    if not content:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Content not found"
-        )
-    
-    try:
-        content.status = models.ContentStatus.APPROVED
-        content.approved_at = datetime.utcnow()
-        db.commit()
-        return {"message": "Content approved successfully"}
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    await _review_one(db, content_id, "approve")
+    return {"message": "Content approved successfully"}
 
 
 @router.post("/{content_id}/reject")
-async def reject_content(content_id: int, reason: str, db: Session = Depends(get_db)):
+async def reject_content(content_id: int, reason: str, db: AsyncSession = Depends(get_async_db)):
     """Reject content and provide reason.
     
     Args:
@@ -76,26 +275,16 @@ async def reject_content(content_id: int, reason: str, db: Session = Depends(get
         dict: Success message
         
     Raises:
-        HTTPException: If content not found
+        HTTPException: If content not found or cannot be rejected
     """
-    content = db.query(models.ContentQueueItem).get(content_id)
-    if not content:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Content not found"
-        )
-    
-    content.status = models.ContentStatus.REJECTED
-    content.rejection_reason = reason
-    db.commit()
-    
+    await _review_one(db, content_id, "reject", reason)
     return {"message": "Content rejected successfully"}
 
 
 @router.post("/flows/{flow_id}/source", status_code=status.HTTP_202_ACCEPTED)
 async def trigger_content_sourcing(
     flow_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Trigger immediate content sourcing and editing for a flow.
     
@@ -111,7 +300,7 @@ async def trigger_content_sourcing(
     Raises:
         HTTPException: If flow not found or inactive
     """
-    flow = db.query(models.ContentFlow).get(flow_id)
+    flow = await db.get(models.ContentFlow, flow_id)
     if not flow:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,42 +1,141 @@
 """Queue management routes for the Content App API."""
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response, Request, Header
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, selectinload
 from typing import List, Optional
 from datetime import datetime
-from src.database.session import get_db
+import json
+from src.database.session import get_async_db
 from src.database import schemas, models
+from src.api.pagination import keyset_page
+from src.events.queue_events import RESET, QueueEventFeed
 
 router = APIRouter(tags=["queues"])  # Remove the prefix here since it's added in main.py
 
+QUEUE_ITEM_FIELDS = list(schemas.ContentQueueItemListEntry.model_fields)
 
-@router.get("/items", response_model=List[schemas.ContentQueueItemResponse])
+
+def _parse_fields(fields: Optional[str]) -> List[str]:
+    """Fields to return for each item; ``id`` is always included.
+
+    Raises:
+        HTTPException: If an unknown field is requested
+    """
+    if not fields:
+        return QUEUE_ITEM_FIELDS
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = sorted(set(requested) - set(QUEUE_ITEM_FIELDS))
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+    return ["id"] + [name for name in QUEUE_ITEM_FIELDS if name in requested and name != "id"]
+
+
+@router.get(
+    "/items",
+    response_model=List[schemas.ContentQueueItemListEntry],
+    response_model_exclude_unset=True,
+)
 async def get_queue_items(
+    response: Response,
     flow_id: Optional[int] = None,
     platform: Optional[str] = None,
     status: Optional[str] = None,
-    skip: int = Query(default=0, ge=0),
+    cursor: Optional[str] = None,
     limit: int = Query(default=100, ge=1, le=100),
-    db: Session = Depends(get_db),
+    fields: Optional[str] = Query(
+        default=None,
+        description="Comma-separated fields to return, e.g. id,status,preview_path. Defaults to all."
+    ),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """Get queue items with optional filtering."""
-    query = db.query(models.ContentQueueItem)
+    """Get queue items with optional filtering, newest first.
+    
+    Pages are chained with cursors: when more items exist, the response has an
+    X-Next-Cursor header whose value is passed as ``cursor`` for the next page.
+    """
+    selected = _parse_fields(fields)
+    # created_at is always loaded for the cursor; relationships are loaded separately
+    columns = {name for name in selected if name != "destination_posts"} | {"created_at"}
+    query = select(models.ContentQueueItem).options(
+        load_only(*(getattr(models.ContentQueueItem, name) for name in columns))
+    )
+    if "destination_posts" in selected:
+        query = query.options(selectinload(models.ContentQueueItem.destination_posts))
 
     if flow_id:
-        query = query.filter(models.ContentQueueItem.content_flow_id == flow_id)
+        query = query.where(models.ContentQueueItem.content_flow_id == flow_id)
     if platform:
-        query = query.filter(models.ContentQueueItem.source_platform == platform)
+        query = query.where(models.ContentQueueItem.source_platform == platform)
     if status:
-        query = query.filter(models.ContentQueueItem.status == status)
+        query = query.where(models.ContentQueueItem.status == status)
+
+    items = await keyset_page(
+        db,
+        query,
+        models.ContentQueueItem.created_at,
+        models.ContentQueueItem.id,
+        cursor,
+        limit,
+        response
+    )
+    # Unrequested fields stay unset and are left out of the response
+    return [
+        schemas.ContentQueueItemListEntry.model_validate({name: getattr(item, name) for name in selected})
+        for item in items
+    ]
+
+
+@router.get("/events")
+async def stream_queue_events(
+    request: Request,
+    flow_id: Optional[int] = None,
+    platform: Optional[str] = None,
+    status: Optional[str] = Query(default=None, description="Comma-separated statuses to watch"),
+    since: Optional[str] = Query(default=None, description="Event ID to resume after"),
+    last_event_id: Optional[str] = Header(default=None),
+):
+    """Stream queue item changes as server-sent events.
+    
+    Each ``queue_item`` event carries the item ID, its flow and platform and the
+    status transition. A status filter matches transitions into or out of the
+    watched statuses. Browsers resume with the Last-Event-ID header after a
+    reconnect; ``since`` does the same for the first connection. A ``reset``
+    event means events were missed and the client must re-fetch the queue.
+    """
+    feed = QueueEventFeed(
+        flow_id=flow_id,
+        platform=platform,
+        statuses=[value.strip() for value in status.split(",") if value.strip()] if status else None
+    )
+
+    async def event_stream():
+        async for entry in feed.events(last_event_id or since):
+            if await request.is_disconnected():
+                break
+            if entry is None:
+                yield ": keep-alive\n\n"
+                continue
+            event_id, queue_event = entry
+            event_name = RESET if queue_event["type"] == RESET else "queue_item"
+            yield f"id: {event_id}\nevent: {event_name}\ndata: {json.dumps(queue_event)}\n\n"
 
-    items = query.order_by(models.ContentQueueItem.created_at.desc()).offset(skip).limit(limit).all()
-    return items  # FastAPI will automatically convert empty list to JSON []
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/items/{item_id}", response_model=schemas.ContentQueueItemResponse)
 async def get_queue_item(
     item_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get a specific queue item by ID.
     
@@ -49,7 +148,11 @@ async def get_queue_item(
     Raises:
         HTTPException: If item not found
     """
-    item = db.query(models.ContentQueueItem).get(item_id)
+    item = await db.get(
+        models.ContentQueueItem,
+        item_id,
+        options=[selectinload(models.ContentQueueItem.destination_posts)]
+    )
     if not item:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,11 +1,14 @@
 """Statistics and analytics routes for the Content App API."""
 
 from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Optional
 from datetime import datetime, timedelta
-from src.database.session import get_db
+from src.database.session import get_async_db, get_db, pool_metrics
 from src.database import models
+from src.source_adapters.quota import QuotaManager
+from src.stats.rollups import StatsReader
 
 router = APIRouter(tags=["stats"])  # Remove prefix since it's added in main.py
 
@@ -13,43 +16,80 @@ router = APIRouter(tags=["stats"])  # Remove prefix since it's added in main.py
 @router.get("/overview")
 async def get_overview_stats(
     days: Optional[int] = Query(default=7, ge=1, le=30),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get overview statistics for the dashboard.
     
     Args:
         days (int, optional): Number of days to look back. Defaults to 7.
         Must be between 1 and 30 days.
+    
+    Returns:
+        dict: Sourcing, editing, review and posting totals with error rates, and
+        the same counts per day
     """
-    # TODO: Implement overview stats
-    pass
+    return await StatsReader(db).overview(days)
 
 
 @router.get("/performance")
 async def get_performance_stats(
     days: Optional[int] = Query(default=30, ge=1, le=90),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get performance statistics for content processing.
     
     Args:
         days (int, optional): Number of days to look back. Defaults to 30.
         Must be between 1 and 90 days.
+    
+    Returns:
+        list: Per flow counts, edit durations, approval and error rates and
+        posting latency
     """
-    # TODO: Implement performance stats
-    pass
+    return await StatsReader(db).performance(days)
 
 
 @router.get("/destination")
 async def get_destination_stats(
     days: Optional[int] = Query(default=30, ge=1, le=90),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get statistics about destination platforms.
     
     Args:
         days (int, optional): Number of days to look back. Defaults to 30.
         Must be between 1 and 90 days.
+    
+    Returns:
+        dict: Posting counts, error rates and latency per destination account
+        and per platform
+    """
+    return await StatsReader(db).destinations(days)
+
+
+@router.get("/quota")
+def get_quota_stats(db: Session = Depends(get_db)):
+    """Get today's API quota spend and remaining budget per source API key.
+    
+    QuotaManager is synchronous, so this route runs in the threadpool rather
+    than on the event loop.
+    
+    Returns:
+        list: One entry per API key with spent, remaining and paced allowance units
     """
-    # TODO: Implement destination stats
-    pass
+    return QuotaManager(db, models.Platform.YOUTUBE).metrics()
+
+
+@router.get("/pool")
+async def get_pool_stats():
+    """Get database connection pool state and checkout wait times.
+    
+    Values are for the API process serving the request; with several uvicorn
+    workers, each reports its own pools.
+    
+    Returns:
+        dict: Per engine ("sync", "async") pool class, size, checked out and
+        idle connections, overflow, checkouts, timeouts and wait percentiles
+    """
+    return pool_metrics()
+
@@ -0,0 +1,78 @@
+"""Monotonic revision of the configuration tables.
+
+Every flush that creates, changes or deletes a configuration row bumps the
+single row of config_revision in the same transaction, so the revision a
+reader sees never runs ahead of the configuration it describes. Readers in
+any process compare revisions instead of re-reading the configuration.
+"""
+from typing import Any
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from src.database.models import (
+    ConfigRevision,
+    ContentFlow,
+    DestinationAccount,
+    DestinationRateLimit,
+    EditingPipeline,
+    GlobalConfig,
+    SourceConfig,
+    SourceRateLimit,
+)
+
+CONFIG_REVISION_ID = 1
+
+CONFIG_MODELS = (
+    GlobalConfig,
+    SourceConfig,
+    SourceRateLimit,
+    EditingPipeline,
+    DestinationAccount,
+    DestinationRateLimit,
+    ContentFlow,
+)
+
+# Attributes written at runtime rather than by configuring, e.g. rate limit counters
+RUNTIME_ATTRIBUTES = {"current_action_count", "last_action_at", "updated_at"}
+
+
+def _config_modified(instance: Any) -> bool:
+    # Also covers collection changes, e.g. a flow's additional destinations
+    return any(
+        attr.history.has_changes()
+        for attr in inspect(instance).attrs
+        if attr.key not in RUNTIME_ATTRIBUTES
+    )
+
+
+def _changes_config(session: Session) -> bool:
+    for instance in session.new:
+        if isinstance(instance, CONFIG_MODELS):
+            return True
+    for instance in session.deleted:
+        if isinstance(instance, CONFIG_MODELS):
+            return True
+    for instance in session.dirty:
+        if isinstance(instance, CONFIG_MODELS) and _config_modified(instance):
+            return True
+    return False
+
+
+@event.listens_for(Session, "before_flush")
+def _bump_revision(session: Session, flush_context: Any, instances: Any) -> None:
+    """Bump the revision in the transaction that writes the configuration change."""
+    if not _changes_config(session):
+        return
+    statement = insert(ConfigRevision).values(id=CONFIG_REVISION_ID, revision=1)
+    session.connection().execute(statement.on_conflict_do_update(
+        index_elements=[ConfigRevision.id],
+        set_={"revision": ConfigRevision.revision + 1, "updated_at": func.now()}
+    ))
+
+
+def current_revision(db: Session) -> int:
+    """Latest committed configuration revision, 0 before the first change."""
+    revision = db.execute(
+        select(ConfigRevision.revision).where(ConfigRevision.id == CONFIG_REVISION_ID)
+    ).scalar()
+    return revision or 0
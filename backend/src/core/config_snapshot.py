@@ -0,0 +1,283 @@
+"""Worker-local, immutable snapshot of the flow configuration.
+
+Scheduler tasks read flows, their source configs, pipelines and destination
+accounts, and the global config from a snapshot held in process memory
+instead of querying them on every run. The snapshot is rebuilt only when the
+configuration revision moves, and the revision is checked at most once every
+CONFIG_SNAPSHOT_CHECK_SECONDS, so a hot task costs no configuration queries.
+Runtime state such as rate limit counters stays in the database.
+"""
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Type
+from dataclasses import dataclass, field
+from types import MappingProxyType
+import threading
+import time
+from pydantic import BaseModel
+from sqlalchemy.orm import Session, joinedload, selectinload
+from src.core.config_revision import current_revision
+from src.database import schemas
+from src.database.models import ContentFlow, GlobalConfig, Platform
+from src.database.session import SessionLocal
+from src.logging.log_manager import LogManager
+from config import Settings
+
+settings = Settings()
+log_manager = LogManager()
+logger_name = "config-snapshot"
+
+
+def freeze(value: Any) -> Any:
+    """Read-only deep copy of a JSON value."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+_frozen_models: Dict[Type[BaseModel], Type[BaseModel]] = {}
+_frozen_models_lock = threading.Lock()
+
+
+def freeze_model(model: BaseModel) -> BaseModel:
+    """Copy of a validated model whose fields cannot be reassigned.
+
+    The copy is an instance of a frozen subclass, so adapters still see the
+    platform's parameter type.
+    """
+    model_class = type(model)
+    with _frozen_models_lock:
+        frozen_class = _frozen_models.get(model_class)
+        if frozen_class is None:
+            frozen_class = _frozen_models[model_class] = type(
+                model_class.__name__,
+                (model_class,),
+                {"model_config": {**model_class.model_config, "frozen": True}, "__module__": model_class.__module__}
+            )
+    return frozen_class.model_construct(_fields_set=model.model_fields_set, **dict(model))
+
+
+def thaw(value: Any) -> Any:
+    """Mutable deep copy of a frozen JSON value, for code that expects dicts and lists."""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+@dataclass(frozen=True)
+class SourceConfigSnapshot:
+    id: int
+    name: str
+    platform: Platform
+    credentials: Mapping[str, Any]
+    discovery_parameters: schemas.BaseDiscoveryParameters  # Validated and frozen
+    sourcing_parameters: schemas.BaseSourcingParameters
+    rate_limit_id: Optional[int]
+
+
+@dataclass(frozen=True)
+class EditingPipelineSnapshot:
+    id: int
+    name: str
+    transformations: Tuple[Any, ...]
+
+
+@dataclass(frozen=True)
+class DestinationAccountSnapshot:
+    id: int
+    platform: Platform
+    name: str
+    credentials: Mapping[str, Any]
+    rate_limit_id: Optional[int]
+
+
+@dataclass(frozen=True)
+class FlowSnapshot:
+    id: int
+    name: str
+    is_active: bool
+    require_approval: bool
+    source_interval: Optional[int]
+    post_schedule: Optional[Mapping[str, Any]]  # Validated against schemas.PostSchedule
+    source_config: SourceConfigSnapshot
+    editing_pipeline: EditingPipelineSnapshot
+    destination_account_id: int
+    destinations: Tuple[DestinationAccountSnapshot, ...]  # Primary destination first
+
+
+@dataclass(frozen=True)
+class GlobalConfigSnapshot:
+    require_approval: bool = True
+    enable_automatic_posting: bool = False
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    revision: int
+    global_config: GlobalConfigSnapshot
+    flows: Mapping[int, FlowSnapshot] = field(default_factory=lambda: MappingProxyType({}))
+
+    def flow(self, flow_id: int) -> Optional[FlowSnapshot]:
+        return self.flows.get(flow_id)
+
+    def active_flows(self) -> List[FlowSnapshot]:
+        return [flow for flow in self.flows.values() if flow.is_active]
+
+
+def _account_snapshot(account: Any) -> DestinationAccountSnapshot:
+    return DestinationAccountSnapshot(
+        id=account.id,
+        platform=account.platform,
+        name=account.name,
+        credentials=freeze(account.credentials or {}),
+        rate_limit_id=account.rate_limit_id
+    )
+
+
+def _flow_snapshot(flow: ContentFlow, accounts: Dict[int, DestinationAccountSnapshot]) -> FlowSnapshot:
+    """Validate a flow and copy it into an immutable snapshot.
+
+    Raises:
+        ValueError: If the flow's source parameters or post schedule are invalid
+    """
+    source = flow.source_config
+    discovery_parameters, sourcing_parameters = schemas.validate_source_config_parameters(
+        source.platform, source.discovery_parameters or {}, source.sourcing_parameters or {}
+    )
+    schedule = None
+    if flow.post_schedule:
+        schedule = schemas.PostSchedule(**flow.post_schedule).model_dump()
+
+    for account in flow.destinations:
+        accounts.setdefault(account.id, _account_snapshot(account))
+    pipeline = flow.editing_pipeline
+    return FlowSnapshot(
+        id=flow.id,
+        name=flow.name,
+        is_active=bool(flow.is_active),
+        require_approval=bool(flow.require_approval),
+        source_interval=flow.source_interval,
+        post_schedule=freeze(schedule),
+        source_config=SourceConfigSnapshot(
+            id=source.id,
+            name=source.name,
+            platform=source.platform,
+            credentials=freeze(source.credentials or {}),
+            discovery_parameters=freeze_model(discovery_parameters),
+            sourcing_parameters=freeze_model(sourcing_parameters),
+            rate_limit_id=source.rate_limit_id
+        ),
+        editing_pipeline=EditingPipelineSnapshot(
+            id=pipeline.id,
+            name=pipeline.name,
+            transformations=freeze(pipeline.transformations or [])
+        ),
+        destination_account_id=flow.destination_account_id,
+        destinations=tuple(accounts[account.id] for account in flow.destinations)
+    )
+
+
+def load_snapshot(db: Session, revision: int) -> ConfigSnapshot:
+    """Load every flow with its configuration in a fixed number of queries.
+
+    A flow whose configuration fails validation is left out and logged, so
+    tasks never run it with parameters the API would have rejected.
+    """
+    global_config = db.query(GlobalConfig).first()
+    flows = (
+        db.query(ContentFlow)
+        .options(
+            joinedload(ContentFlow.source_config),
+            joinedload(ContentFlow.editing_pipeline),
+            joinedload(ContentFlow.destination_account),
+            selectinload(ContentFlow.additional_destinations),
+        )
+        .all()
+    )
+
+    accounts: Dict[int, DestinationAccountSnapshot] = {}
+    snapshots = {}
+    for flow in flows:
+        try:
+            snapshots[flow.id] = _flow_snapshot(flow, accounts)
+        except (ValueError, TypeError) as e:
+            log_manager.error(
+                logger_name,
+                "Invalid flow configuration, flow left out of the snapshot",
+                context={"flow_id": flow.id, "revision": revision},
+                error=e
+            )
+
+    return ConfigSnapshot(
+        revision=revision,
+        global_config=GlobalConfigSnapshot(
+            require_approval=bool(global_config.require_approval),
+            enable_automatic_posting=bool(global_config.enable_automatic_posting)
+        ) if global_config else GlobalConfigSnapshot(),
+        flows=MappingProxyType(snapshots)
+    )
+
+
+class ConfigSnapshotStore:
+    """Holds the current snapshot of this process and refreshes it on a revision bump."""
+
+    def __init__(self):
+        self._snapshot: Optional[ConfigSnapshot] = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, check: bool = False) -> ConfigSnapshot:
+        """The current snapshot.
+
+        Args:
+            check: Check the revision now instead of waiting for the next scheduled check
+
+        Raises:
+            Exception: If no snapshot could be loaded yet
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and not check and time.monotonic() < self._next_check:
+            return snapshot
+
+        with self._lock:
+            if self._snapshot is not None and not check and time.monotonic() < self._next_check:
+                return self._snapshot
+            db = SessionLocal()
+            try:
+                # Read before the data, so the snapshot is never older than its revision
+                revision = current_revision(db)
+                if self._snapshot is None or self._snapshot.revision != revision:
+                    self._snapshot = load_snapshot(db, revision)
+                    log_manager.info(
+                        logger_name,
+                        "Loaded config snapshot",
+                        context={"revision": revision, "flows": len(self._snapshot.flows)}
+                    )
+            except Exception as e:
+                if self._snapshot is None:
+                    raise
+                log_manager.warning(
+                    logger_name,
+                    "Config revision check failed, keeping the current snapshot",
+                    context={"revision": self._snapshot.revision, "error": str(e)}
+                )
+            finally:
+                db.close()
+            self._next_check = time.monotonic() + settings.CONFIG_SNAPSHOT_CHECK_SECONDS
+            return self._snapshot
+
+    def flow(self, flow_id: int) -> Optional[FlowSnapshot]:
+        """A flow from the snapshot, checking the revision first if the flow is unknown.
+
+        A flow created moments ago may be newer than the snapshot, so a miss
+        is only trusted after the revision has been checked.
+        """
+        flow = self.get().flow(flow_id)
+        if flow is None:
+            flow = self.get(check=True).flow(flow_id)
+        return flow
+
+
+config_snapshots = ConfigSnapshotStore()
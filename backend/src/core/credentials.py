@@ -0,0 +1,301 @@
+"""Per-process cache of account credentials and the API clients built from them."""
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Union
+import hashlib
+import json
+import os
+import threading
+import time
+import requests
+from sqlalchemy.orm import Session
+from src.database.models import DestinationAccount, Platform
+from src.database.session import SessionLocal
+from src.logging.log_manager import LogManager
+from config import Settings
+
+settings = Settings()
+log_manager = LogManager()
+logger_name = "credentials"
+
+GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
+TIKTOK_TOKEN_URL = "https://open.tiktokapis.com/v2/oauth/token/"
+INSTAGRAM_REFRESH_URL = "https://graph.instagram.com/refresh_access_token"
+
+
+class CredentialError(Exception):
+    """Raised when credentials cannot be refreshed."""
+    pass
+
+
+def credentials_version(credentials: Union[str, Dict[str, Any], None]) -> str:
+    """Stable hash of a credentials value; it changes whenever any field changes."""
+    raw = json.dumps(credentials, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+def needs_refresh(credentials: Dict[str, Any]) -> bool:
+    """Whether an expiring OAuth token is within the refresh margin.
+
+    Credentials without an ``expires_at`` (Unix seconds) never expire, e.g. API
+    keys and long-lived page tokens.
+    """
+    expires_at = credentials.get("expires_at")
+    if not expires_at:
+        return False
+    return float(expires_at) - time.time() <= settings.CREDENTIAL_REFRESH_MARGIN_SECONDS
+
+
+def _token_request(method: str, url: str, action: str, **kwargs: Any) -> Dict[str, Any]:
+    try:
+        response = requests.request(method, url, timeout=settings.CREDENTIAL_REQUEST_TIMEOUT, **kwargs)
+    except requests.RequestException as e:
+        raise CredentialError(f"{action}: {str(e)}") from e
+    if response.status_code >= 400:
+        raise CredentialError(f"{action}: HTTP {response.status_code} {response.text[:500]}")
+    return response.json()
+
+
+def _expires_at(expires_in: Optional[Union[int, str]]) -> Optional[int]:
+    return int(time.time()) + int(expires_in) if expires_in else None
+
+
+def _refresh_google(credentials: Dict[str, Any]) -> Dict[str, Any]:
+    if not credentials.get("refresh_token"):
+        raise CredentialError("Google credentials have no refresh_token")
+    token = _token_request(
+        "POST",
+        GOOGLE_TOKEN_URL,
+        "Refresh Google token",
+        data={
+            "client_id": credentials.get("client_id") or settings.GOOGLE_CLIENT_ID,
+            "client_secret": credentials.get("client_secret") or settings.GOOGLE_CLIENT_SECRET,
+            "refresh_token": credentials["refresh_token"],
+            "grant_type": "refresh_token",
+        }
+    )
+    return {"access_token": token["access_token"], "expires_at": _expires_at(token.get("expires_in"))}
+
+
+def _refresh_tiktok(credentials: Dict[str, Any]) -> Dict[str, Any]:
+    if not credentials.get("refresh_token"):
+        raise CredentialError("TikTok credentials have no refresh_token")
+    token = _token_request(
+        "POST",
+        TIKTOK_TOKEN_URL,
+        "Refresh TikTok token",
+        data={
+            "client_key": credentials.get("client_key") or settings.TIKTOK_CLIENT_KEY,
+            "client_secret": credentials.get("client_secret") or settings.TIKTOK_CLIENT_SECRET,
+            "refresh_token": credentials["refresh_token"],
+            "grant_type": "refresh_token",
+        }
+    )
+    if "access_token" not in token:
+        raise CredentialError(f"Refresh TikTok token: {token.get('error')} {token.get('error_description')}")
+    # TikTok rotates the refresh token, so the new one must be stored
+    return {
+        "access_token": token["access_token"],
+        "expires_at": _expires_at(token.get("expires_in")),
+        "refresh_token": token.get("refresh_token", credentials["refresh_token"]),
+        "open_id": token.get("open_id", credentials.get("open_id")),
+    }
+
+
+def _refresh_instagram(credentials: Dict[str, Any]) -> Dict[str, Any]:
+    # Long-lived Instagram user tokens are refreshed with themselves
+    token = _token_request(
+        "GET",
+        INSTAGRAM_REFRESH_URL,
+        "Refresh Instagram token",
+        params={"grant_type": "ig_refresh_token", "access_token": credentials.get("access_token")}
+    )
+    return {"access_token": token["access_token"], "expires_at": _expires_at(token.get("expires_in"))}
+
+
+# Token refresh per platform: credentials -> fields to merge into them
+TOKEN_REFRESHERS: Dict[Platform, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    Platform.YOUTUBE: _refresh_google,
+    Platform.TIKTOK: _refresh_tiktok,
+    Platform.INSTAGRAM: _refresh_instagram,
+}
+
+
+class CredentialCache:
+    """Process-wide cache of API clients and fresh OAuth credentials.
+
+    Clients are keyed by (kind, account, credentials version), so a client is
+    built once per worker process and reused by every task until the account's
+    credentials change. A refresh stores new credentials, which changes the
+    version, so the next lookup builds a client for the new token and drops
+    the old one.
+
+    Expiring tokens are refreshed by a background thread in each worker before
+    they expire, so tasks normally find valid credentials and never wait on a
+    token exchange. Refreshes hold a row lock on the account, so workers racing
+    to refresh the same token do not spend a rotated refresh token twice.
+    """
+
+    _clients: "OrderedDict[Tuple[str, Hashable, str], Any]" = OrderedDict()
+    _build_locks: Dict[Tuple[str, Hashable, str], threading.Lock] = {}
+    _lock = threading.Lock()
+    _refresh_pid: Optional[int] = None
+
+    def client(
+        self,
+        kind: str,
+        account_key: Hashable,
+        credentials: Union[str, Dict[str, Any], None],
+        factory: Callable[[], Any]
+    ) -> Any:
+        """Cached client for an account, built with ``factory`` on first use.
+
+        Args:
+            kind: Client type, e.g. "youtube-data" or "tiktok-http"
+            account_key: Account the client belongs to, e.g. a destination account ID
+            credentials: Credentials the client is built from
+            factory: Builds the client
+
+        Returns:
+            The cached or newly built client
+        """
+        key = (kind, account_key, credentials_version(credentials))
+        with self._lock:
+            if key in self._clients:
+                self._clients.move_to_end(key)
+                return self._clients[key]
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+
+        # Built outside the cache lock, so a slow build only blocks callers of the same key
+        with build_lock:
+            with self._lock:
+                if key in self._clients:
+                    return self._clients[key]
+            built = factory()
+            with self._lock:
+                # Clients built from superseded credentials are not handed out again.
+                # Dropped clients are not closed: a task or worker thread may still
+                # be using one, and it is released once the last reference goes.
+                for stale in [k for k in self._clients if k[:2] == key[:2]]:
+                    del self._clients[stale]
+                self._clients[key] = built
+                self._build_locks.pop(key, None)
+                while len(self._clients) > settings.CREDENTIAL_CACHE_MAX_CLIENTS:
+                    self._clients.popitem(last=False)
+            log_manager.info(
+                logger_name,
+                "Built API client",
+                context={"kind": kind, "account": str(account_key)}
+            )
+            return built
+
+    def refresh_account(self, db: Session, account_id: int) -> Dict[str, Any]:
+        """Refresh an account's OAuth token if it is about to expire.
+
+        Args:
+            db: Database session, committed by this call
+            account_id: Destination account ID
+
+        Returns:
+            The account's current credentials
+
+        Raises:
+            CredentialError: If the account does not exist or the refresh fails
+        """
+        account = (
+            db.query(DestinationAccount)
+            .filter(DestinationAccount.id == account_id)
+            .populate_existing()
+            .with_for_update()
+            .first()
+        )
+        if account is None:
+            db.rollback()
+            raise CredentialError(f"Destination account {account_id} not found")
+
+        credentials = dict(account.credentials or {})
+        refresher = TOKEN_REFRESHERS.get(account.platform)
+        # Another worker may have refreshed the token while this one waited for the lock
+        if refresher is None or not needs_refresh(credentials):
+            db.commit()
+            return credentials
+
+        try:
+            refreshed = {**credentials, **refresher(credentials)}
+        except CredentialError:
+            db.rollback()
+            raise
+        account.credentials = refreshed
+        db.commit()
+        log_manager.info(
+            logger_name,
+            "Refreshed OAuth token",
+            context={"destination_account_id": account_id, "platform": account.platform.value}
+        )
+        return refreshed
+
+    def credentials_for(self, db: Session, account: DestinationAccount) -> Dict[str, Any]:
+        """An account's credentials, refreshed first if the token is about to expire.
+
+        Normally the background refresh got there first and the stored
+        credentials are returned as is. A failed refresh is logged and the stored
+        token is used, which stays valid until the margin has passed.
+        """
+        credentials = account.credentials or {}
+        if not needs_refresh(credentials):
+            return credentials
+        try:
+            return self.refresh_account(db, account.id)
+        except CredentialError as e:
+            log_manager.warning(
+                logger_name,
+                "Token refresh failed, using stored token",
+                context={"destination_account_id": account.id, "error": str(e)}
+            )
+            return credentials
+
+    def refresh_expiring(self) -> int:
+        """Refresh every destination account token that is about to expire.
+
+        Returns:
+            Number of accounts that were due for a refresh
+        """
+        db = SessionLocal()
+        try:
+            due = [
+                account_id
+                for account_id, platform, credentials in db.query(
+                    DestinationAccount.id, DestinationAccount.platform, DestinationAccount.credentials
+                ).all()
+                if platform in TOKEN_REFRESHERS and needs_refresh(credentials or {})
+            ]
+            for account_id in due:
+                try:
+                    self.refresh_account(db, account_id)
+                except CredentialError as e:
+                    log_manager.error(
+                        logger_name,
+                        "Failed to refresh OAuth token",
+                        context={"destination_account_id": account_id},
+                        error=e
+                    )
+            return len(due)
+        finally:
+            db.close()
+
+    @classmethod
+    def start_background_refresh(cls) -> None:
+        """Start this process' token refresh thread, once per process."""
+        with cls._lock:
+            if cls._refresh_pid == os.getpid():
+                return
+            cls._refresh_pid = os.getpid()
+        threading.Thread(target=cls._refresh_loop, name="credential-refresh", daemon=True).start()
+
+    @classmethod
+    def _refresh_loop(cls) -> None:
+        while True:
+            try:
+                cls().refresh_expiring()
+            except Exception as e:
+                log_manager.error(logger_name, "Error in credential refresh loop", error=e)
+            time.sleep(settings.CREDENTIAL_REFRESH_INTERVAL_SECONDS)
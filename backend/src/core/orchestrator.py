@@ -96,6 +96,33 @@ class ContentAppOrchestrator:
                 'args': ()
             }
 
+            # Incremental cleanup of orphaned media files
+            celery_app.conf.beat_schedule['collect_storage_garbage'] = {
+                'task': 'src.scheduler.scheduler.collect_storage_garbage',
+                'schedule': settings.GC_INTERVAL_MINUTES * 60,
+                'args': ()
+            }
+
+            # Engagement metrics of posted items, each polled on its own back-off
+            celery_app.conf.beat_schedule['poll_post_metrics'] = {
+                'task': 'src.scheduler.scheduler.poll_post_metrics',
+                'schedule': settings.METRICS_POLL_INTERVAL_MINUTES * 60,
+                'args': ()
+            }
+
+            celery_app.conf.beat_schedule['downsample_post_metrics'] = {
+                'task': 'src.scheduler.scheduler.downsample_post_metrics',
+                'schedule': 60 * 60,
+                'args': ()
+            }
+
+            # Repairs recent daily stats from the queue and posting history
+            celery_app.conf.beat_schedule['rebuild_stats'] = {
+                'task': 'src.scheduler.scheduler.rebuild_stats',
+                'schedule': settings.STATS_REBUILD_INTERVAL_HOURS * 60 * 60,
+                'args': ()
+            }
+
         except Exception as e:
             error_msg = f"Error setting up periodic tasks: {str(e)}"
             self.log_manager.error(self.logger_name, error_msg, {"context": "setup_periodic_tasks"})
@@ -1,12 +1,17 @@
 from enum import Enum
 from sqlalchemy import (
+    Table,
     Column,
     Integer,
+    BigInteger,
     String,
     DateTime,
+    Date,
     JSON,
     ForeignKey,
     Boolean,
+    Float,
+    LargeBinary,
     Enum as SQLEnum,
     Index,
     UniqueConstraint,
@@ -29,6 +34,7 @@ class ContentStatus(str, Enum):
     EDITING = "editing"
     READY = "ready"
     APPROVED = "approved"
+    REJECTED = "rejected"
     POSTING = "posting"
     COMPLETED = "completed"
     EDITING_ERROR = "editing_error"
@@ -78,6 +84,21 @@ class Transformation(str, Enum):
     ADD_TRANSITION = "transition"
 
 
+class DestinationPostStatus(str, Enum):
+    """Posting state of a queue item on one destination account."""
+    PENDING = "pending"
+    POSTING = "posting"
+    POSTED = "posted"
+    FAILED = "failed"
+
+
+class UploadSessionStatus(str, Enum):
+    """State of a resumable upload."""
+    IN_PROGRESS = "in_progress"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
 class GlobalConfig(Base):
     __tablename__ = "global_config"
     id = Column(Integer, primary_key=True)
@@ -90,6 +111,17 @@ class GlobalConfig(Base):
         app_label = "contentapp"
 
 
+class ConfigRevision(Base):
+    """Single-row counter bumped by every committed configuration change."""
+    __tablename__ = "config_revision"
+    id = Column(Integer, primary_key=True)
+    revision = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    class Meta:
+        app_label = "contentapp"
+
+
 class SourceRateLimit(Base):
     """Rate limits for content sourcing (e.g., API rate limits for fetching content)."""
     __tablename__ = "source_rate_limits"
@@ -146,6 +178,15 @@ class SourceConfig(Base):
         app_label = "contentapp"
 
 
+# Extra destination accounts a flow cross-posts to, besides destination_account_id
+content_flow_destinations = Table(
+    "content_flow_destinations",
+    Base.metadata,
+    Column("content_flow_id", Integer, ForeignKey("content_flows.id", ondelete="CASCADE"), primary_key=True),
+    Column("destination_account_id", Integer, ForeignKey("destination_accounts.id"), primary_key=True),
+)
+
+
 class ContentFlow(Base):
     __tablename__ = "content_flows"
     id = Column(Integer, primary_key=True)
@@ -162,6 +203,7 @@ class ContentFlow(Base):
     source_config = relationship("SourceConfig", back_populates="content_flows")
     editing_pipeline = relationship("EditingPipeline", back_populates="content_flows")
     destination_account = relationship("DestinationAccount", back_populates="content_flows")
+    additional_destinations = relationship("DestinationAccount", secondary=content_flow_destinations)
     queue_items = relationship("ContentQueueItem", back_populates="content_flow")
     posted_items = relationship("PostedItem", back_populates="content_flow")
 
@@ -170,6 +212,20 @@ class ContentFlow(Base):
 
     __table_args__ = (Index("ix_content_flows_is_active", "is_active"),)
 
+    @property
+    def additional_destination_ids(self):
+        return [account.id for account in self.additional_destinations]
+
+    @property
+    def destinations(self):
+        """Every account the flow posts to, the primary destination first."""
+        accounts = [self.destination_account]
+        accounts += [
+            account for account in self.additional_destinations
+            if account.id != self.destination_account_id
+        ]
+        return accounts
+
     class Meta:
         app_label = "contentapp"
 
@@ -204,6 +260,30 @@ class DestinationAccount(Base):
         app_label = "contentapp"
 
 
+class SourceMedia(Base):
+    """Downloaded source media, shared by every queue and posted item that uses it.
+
+    Media is content addressed by (platform, source ID, time range, format), so two
+    flows sourcing the same clip share one file. The reference count is the number
+    of ContentQueueItem and PostedItem rows pointing at the media.
+    """
+    __tablename__ = "source_media"
+    id = Column(Integer, primary_key=True)
+    media_key = Column(String, nullable=False, unique=True)  # sha256 of the addressing fields
+    platform = Column(SQLEnum(Platform), nullable=False)
+    source_id = Column(String, nullable=False)  # Platform video/post ID
+    start_ms = Column(Integer, nullable=True)  # NULL for the full video
+    end_ms = Column(Integer, nullable=True)
+    format = Column(String, nullable=False)
+    file_path = Column(String, nullable=False)
+    size_bytes = Column(BigInteger, nullable=True)
+    created_at = Column(DateTime, default=func.now())
+    last_used_at = Column(DateTime, default=func.now())
+
+    class Meta:
+        app_label = "contentapp"
+
+
 class ContentQueueItem(Base):
     __tablename__ = "content_queue"
     id = Column(Integer, primary_key=True)
@@ -211,17 +291,34 @@ class ContentQueueItem(Base):
     source_url = Column(String)
     source_data = Column(JSON)
     edited_content_path = Column(String, nullable=True)
+    source_media_id = Column(Integer, ForeignKey("source_media.id"), nullable=True, index=True)
     content_flow_id = Column(Integer, ForeignKey("content_flows.id"), index=True)
     preview_path = Column(String, nullable=True)
     status = Column(SQLEnum(ContentStatus))
     error_log = Column(JSON, nullable=True)
+    approved_at = Column(DateTime, nullable=True)
+    rejected_at = Column(DateTime, nullable=True)
+    rejection_reason = Column(String, nullable=True)
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
     # Relationships
     content_flow = relationship("ContentFlow", back_populates="queue_items")
-
-    __table_args__ = (Index("ix_content_queue_status", "status"),)
+    source_media = relationship("SourceMedia")
+    destination_posts = relationship("DestinationPost", back_populates="queue_item")
+
+    # Keyset pagination indexes, one per filter combination of the queue list.
+    # A flow has a single source platform, so flow filters cover flow + platform.
+    __table_args__ = (
+        Index("ix_content_queue_created", "created_at", "id"),
+        Index("ix_content_queue_status_created", "status", "created_at", "id"),
+        Index("ix_content_queue_flow_created", "content_flow_id", "created_at", "id"),
+        Index("ix_content_queue_flow_status_created", "content_flow_id", "status", "created_at", "id"),
+        Index("ix_content_queue_platform_created", "source_platform", "created_at", "id"),
+        Index("ix_content_queue_platform_status_created", "source_platform", "status", "created_at", "id"),
+        # Approval inbox: only items awaiting review, which stays small as the queue grows
+        Index("ix_content_queue_pending_created", "created_at", "id", postgresql_where=(status == ContentStatus.READY)),
+    )
 
     class Meta:
         app_label = "contentapp"
@@ -235,13 +332,299 @@ class PostedItem(Base):
     source_url = Column(String)  # Original source URL
     source_data = Column(JSON)  # Original source data
     edited_content_path = Column(String)  # Path to edited content
+    source_media_id = Column(Integer, ForeignKey("source_media.id"), nullable=True, index=True)
+    destination_account_id = Column(Integer, ForeignKey("destination_accounts.id"), nullable=True, index=True)
     external_id = Column(String)  # Platform post ID
-    performance_metrics = Column(JSON, nullable=True)  # likes, views, etc.
+    performance_metrics = Column(JSON, nullable=True)  # Latest likes, views, etc.; history is in post_metric_samples
+    metrics_next_poll_at = Column(DateTime, nullable=True)  # None once the post is no longer polled
+    metrics_poll_count = Column(Integer, nullable=False, default=0, server_default="0")
     posted_at = Column(DateTime, default=func.now())
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     
     content_flow = relationship("ContentFlow", back_populates="posted_items")
+    source_media = relationship("SourceMedia")
+    destination_account = relationship("DestinationAccount")
+
+    __table_args__ = (Index("ix_posted_items_metrics_next_poll", "metrics_next_poll_at"),)
+
+    class Meta:
+        app_label = "contentapp"
+
+
+class DestinationPost(Base):
+    """Posting status of a queue item on one of its flow's destination accounts.
+
+    Rows outlive the queue item, which is deleted once every destination has
+    been posted to, and then point at the PostedItem instead.
+    """
+    __tablename__ = "destination_posts"
+    id = Column(Integer, primary_key=True)
+    queue_item_id = Column(Integer, ForeignKey("content_queue.id", ondelete="SET NULL"), nullable=True)
+    destination_account_id = Column(Integer, ForeignKey("destination_accounts.id"), nullable=False)
+    status = Column(SQLEnum(DestinationPostStatus), nullable=False, default=DestinationPostStatus.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    external_id = Column(String, nullable=True)  # Platform post ID once posted
+    posted_item_id = Column(Integer, ForeignKey("posted_items.id"), nullable=True)
+    error = Column(String, nullable=True)
+    posted_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    queue_item = relationship("ContentQueueItem", back_populates="destination_posts")
+    destination_account = relationship("DestinationAccount")
+
+    __table_args__ = (
+        UniqueConstraint("queue_item_id", "destination_account_id", name="uq_destination_post_item_account"),
+    )
+
+    class Meta:
+        app_label = "contentapp"
+
+
+class DiscoveryCacheEntry(Base):
+    """Cached discovery results for a single source video.
+
+    Each field has its own timestamp so it can expire independently. A field whose
+    timestamp is set but whose value is NULL is a negative entry (e.g. a video
+    that has no most replayed heatmap).
+    """
+    __tablename__ = "discovery_cache"
+    id = Column(Integer, primary_key=True)
+    platform = Column(SQLEnum(Platform), nullable=False)
+    video_id = Column(String, nullable=False)
+    snippet = Column(JSON, nullable=True)  # Title, description, thumbnails, etc.
+    snippet_cached_at = Column(DateTime, nullable=True)
+    statistics = Column(JSON, nullable=True)  # Duration, views, likes, comments
+    statistics_cached_at = Column(DateTime, nullable=True)
+    most_replayed = Column(JSON, nullable=True)  # Raw most replayed heatmap
+    most_replayed_cached_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("platform", "video_id", name="uq_discovery_cache_platform_video"),
+    )
+
+    class Meta:
+        app_label = "contentapp"
+
+
+class ApiQuotaUsage(Base):
+    """Daily API quota units spent per API key and content flow."""
+    __tablename__ = "api_quota_usage"
+    id = Column(Integer, primary_key=True)
+    platform = Column(SQLEnum(Platform), nullable=False)
+    api_key_id = Column(String, nullable=False)  # Hash of the API key, never the key itself
+    quota_day = Column(Date, nullable=False)  # Day in the platform's quota reset timezone
+    content_flow_id = Column(Integer, ForeignKey("content_flows.id"), nullable=False)
+    units = Column(Integer, nullable=False, default=0)
+    request_count = Column(Integer, nullable=False, default=0)
+    exhausted_at = Column(DateTime, nullable=True)  # Set when the platform reports the quota as exceeded
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint(
+            "platform", "api_key_id", "quota_day", "content_flow_id",
+            name="uq_api_quota_usage_key_day_flow"
+        ),
+        Index("ix_api_quota_usage_day", "quota_day"),
+    )
+
+    class Meta:
+        app_label = "contentapp"
+
+
+class ApiQuotaBudget(Base):
+    """Daily API quota units spent per API key, across all flows.
+
+    One row per key and day, so a spend can be checked against the budget
+    and charged in a single conditional upsert that holds the row lock.
+    """
+    __tablename__ = "api_quota_budget"
+    id = Column(Integer, primary_key=True)
+    platform = Column(SQLEnum(Platform), nullable=False)
+    api_key_id = Column(String, nullable=False)  # Hash of the API key, never the key itself
+    quota_day = Column(Date, nullable=False)  # Day in the platform's quota reset timezone
+    units = Column(Integer, nullable=False, default=0)
+    exhausted_at = Column(DateTime, nullable=True)  # Set when the platform reports the quota as exceeded
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("platform", "api_key_id", "quota_day", name="uq_api_quota_budget_key_day"),
+    )
+
+    class Meta:
+        app_label = "contentapp"
+
+
+class SourceCursor(Base):
+    """High-water mark of the newest item seen per flow and source.
+
+    Lets adapters request only items newer than the last run, e.g. with Reddit's
+    ``before=`` pagination. ``source_key`` identifies the source within the
+    platform, e.g. "r/videos" or "u/someone".
+    """
+    __tablename__ = "source_cursors"
+    id = Column(Integer, primary_key=True)
+    content_flow_id = Column(Integer, ForeignKey("content_flows.id"), nullable=False)
+    platform = Column(SQLEnum(Platform), nullable=False)
+    source_key = Column(String, nullable=False)
+    last_fullname = Column(String, nullable=True)  # Platform ID of the newest item seen
+    last_created_utc = Column(Float, nullable=True)  # Creation time of that item (Unix seconds)
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint(
+            "content_flow_id", "platform", "source_key",
+            name="uq_source_cursor_flow_platform_source"
+        ),
+    )
+
+    class Meta:
+        app_label = "contentapp"
+
+
+class ContentFingerprint(Base):
+    """Perceptual fingerprint of sourced media, used to drop near-duplicates.
+
+    Hashes are 64-bit values stored as signed BIGINTs. Per-frame hashes are kept
+    as packed little-endian uint64 bytes. Fingerprints are scoped to the
+    destination account, since the same clip may be posted to different accounts.
+    """
+    __tablename__ = "content_fingerprints"
+    id = Column(Integer, primary_key=True)
+    destination_account_id = Column(Integer, ForeignKey("destination_accounts.id"), nullable=False)
+    content_flow_id = Column(Integer, ForeignKey("content_flows.id"), nullable=False)
+    source_platform = Column(SQLEnum(Platform), nullable=False)
+    source_url = Column(String, nullable=True)
+    source_media_id = Column(Integer, ForeignKey("source_media.id"), nullable=True, index=True)
+    video_hash = Column(BigInteger, nullable=False)  # pHash of the averaged frame DCTs
+    frame_hashes = Column(LargeBinary, nullable=False)  # pHash of each sampled frame
+    audio_hash = Column(BigInteger, nullable=True)  # NULL for media without audio
+    duration = Column(Float, nullable=True)
+    created_at = Column(DateTime, default=func.now())
+
+    __table_args__ = (
+        Index("ix_content_fingerprints_destination", "destination_account_id", "id"),
+        Index("ix_content_fingerprints_destination_created", "destination_account_id", "created_at"),
+    )
+
+    class Meta:
+        app_label = "contentapp"
+
+
+class UploadSession(Base):
+    """Persisted state of a resumable upload, so a restarted worker can continue it.
+
+    ``upload_key`` identifies the file version and destination account. The
+    offset is the number of bytes the platform has acknowledged.
+    """
+    __tablename__ = "upload_sessions"
+    id = Column(Integer, primary_key=True)
+    upload_key = Column(String, nullable=False, unique=True)
+    platform = Column(SQLEnum(Platform), nullable=False)
+    file_path = Column(String, nullable=False)
+    file_size = Column(BigInteger, nullable=False)
+    session_url = Column(String, nullable=True)  # Platform upload URL of the session
+    session_data = Column(JSON, nullable=True)  # Platform IDs needed to finish the upload
+    offset = Column(BigInteger, nullable=False, default=0)
+    status = Column(SQLEnum(UploadSessionStatus), nullable=False, default=UploadSessionStatus.IN_PROGRESS)
+    result = Column(JSON, nullable=True)
+    error = Column(String, nullable=True)
+    expires_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    class Meta:
+        app_label = "contentapp"
+
+
+class FlowDailyStats(Base):
+    """Daily sourcing, editing and review counters per content flow.
+
+    Rows are incremented by the scheduler and the review routes in the same
+    transaction as the change they count, so the stats endpoints read a few
+    rows per day instead of scanning the queue and posting history.
+    """
+    __tablename__ = "flow_daily_stats"
+    id = Column(Integer, primary_key=True)
+    day = Column(Date, nullable=False)  # UTC day
+    content_flow_id = Column(Integer, ForeignKey("content_flows.id", ondelete="CASCADE"), nullable=False)
+    source_platform = Column(SQLEnum(Platform), nullable=False)
+    sourced = Column(Integer, nullable=False, default=0)  # Queue items created
+    duplicates = Column(Integer, nullable=False, default=0)  # Sourced items skipped as duplicates
+    edited = Column(Integer, nullable=False, default=0)
+    edit_errors = Column(Integer, nullable=False, default=0)
+    edit_seconds_total = Column(Float, nullable=False, default=0.0)
+    edit_seconds_max = Column(Float, nullable=False, default=0.0)
+    approved = Column(Integer, nullable=False, default=0)
+    rejected = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("day", "content_flow_id", "source_platform", name="uq_flow_daily_stats_day_flow_platform"),
+        Index("ix_flow_daily_stats_day", "day"),
+    )
+
+    class Meta:
+        app_label = "contentapp"
+
+
+class DestinationDailyStats(Base):
+    """Daily posting counters per content flow and destination account."""
+    __tablename__ = "destination_daily_stats"
+    id = Column(Integer, primary_key=True)
+    day = Column(Date, nullable=False)  # UTC day
+    content_flow_id = Column(Integer, ForeignKey("content_flows.id", ondelete="CASCADE"), nullable=False)
+    destination_account_id = Column(
+        Integer, ForeignKey("destination_accounts.id", ondelete="CASCADE"), nullable=False
+    )
+    platform = Column(SQLEnum(Platform), nullable=False)
+    posted = Column(Integer, nullable=False, default=0)
+    post_errors = Column(Integer, nullable=False, default=0)  # Destinations that failed their last attempt
+    post_latency_seconds_total = Column(Float, nullable=False, default=0.0)  # Queue item created -> posted
+    post_latency_seconds_max = Column(Float, nullable=False, default=0.0)
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint(
+            "day", "content_flow_id", "destination_account_id",
+            name="uq_destination_daily_stats_day_flow_account"
+        ),
+        Index("ix_destination_daily_stats_day", "day"),
+    )
+
+    class Meta:
+        app_label = "contentapp"
+
+
+class PostMetricSample(Base):
+    """Append-only engagement counters of a posted item over time.
+
+    Counters are cumulative, so a bucket is represented by its last sample.
+    Recent samples are kept as polled; older ones are downsampled to one per
+    hour and then one per day, as recorded in ``bucket_seconds``.
+    """
+    __tablename__ = "post_metric_samples"
+    id = Column(BigInteger, primary_key=True)
+    posted_item_id = Column(Integer, ForeignKey("posted_items.id", ondelete="CASCADE"), nullable=False)
+    sampled_at = Column(DateTime, nullable=False)
+    bucket_seconds = Column(Integer, nullable=False, default=0)  # 0 for raw samples
+    views = Column(BigInteger, nullable=True)
+    likes = Column(BigInteger, nullable=True)
+    comments = Column(BigInteger, nullable=True)
+    shares = Column(BigInteger, nullable=True)
+
+    __table_args__ = (
+        Index("ix_post_metric_samples_item_time", "posted_item_id", "sampled_at"),
+        Index("ix_post_metric_samples_bucket_time", "bucket_seconds", "sampled_at"),
+    )
 
     class Meta:
         app_label = "contentapp"
@@ -9,6 +9,7 @@ from .models import (
     SourceSelectionStrategy,
     ContentSelectionStrategy,
     ContentProcessingType,
+    DestinationPostStatus,
 )
 
 
@@ -58,6 +59,19 @@ class YouTubeSourcingParameters(BaseSourcingParameters):
     end_time: Optional[int] = None
     quality: str = Field(default="1080p", pattern="^(360p|480p|720p|1080p)$")
     include_audio: bool = True
+    clip_duration: int = Field(
+        default=30, gt=0,
+        description="Length in seconds of clips generated from the most replayed heatmap"
+    )
+    max_clips_per_video: int = Field(
+        default=1, ge=1, le=10,
+        description="Maximum number of non-overlapping most replayed clips to extract per video"
+    )
+    precise_cuts: Optional[bool] = Field(
+        default=None,
+        description="Re-encode at clip boundaries for frame-accurate cuts. "
+                    "Defaults to keyframe cuts when the editing pipeline trims the clip"
+    )
 
 
 class RedditDiscoveryParameters(BaseDiscoveryParameters):
@@ -73,7 +87,7 @@ class RedditDiscoveryParameters(BaseDiscoveryParameters):
 
 
 class RedditSourcingParameters(BaseSourcingParameters):
-    pass
+    quality: str = Field(default="1080p", pattern="^(360p|480p|720p|1080p)$")
 
 
 class InstagramDiscoveryParameters(BaseDiscoveryParameters):
@@ -119,6 +133,19 @@ SourcingParameters = Union[
 ]
 
 
+class DestinationPostResponse(BaseModel):
+    id: int
+    destination_account_id: int
+    status: DestinationPostStatus
+    attempts: int
+    external_id: Optional[str]
+    error: Optional[str]
+    posted_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+
 class ContentQueueItemResponse(BaseModel):
     id: int
     source_platform: str
@@ -130,6 +157,10 @@ class ContentQueueItemResponse(BaseModel):
     status: str
     scheduled_time: Optional[datetime]
     error_log: Optional[Dict[str, Any]]
+    approved_at: Optional[datetime] = None
+    rejected_at: Optional[datetime] = None
+    rejection_reason: Optional[str] = None
+    destination_posts: List[DestinationPostResponse] = []
     created_at: datetime
     updated_at: datetime
 
@@ -137,6 +168,85 @@ class ContentQueueItemResponse(BaseModel):
         from_attributes = True
 
 
+class ContentQueueItemListEntry(BaseModel):
+    """Schema for queue items in list views; only the requested fields are set."""
+    id: int
+    source_platform: Optional[str] = None
+    source_url: Optional[str] = None
+    source_data: Optional[Dict[str, Any]] = None
+    edited_content_path: Optional[str] = None
+    content_flow_id: Optional[int] = None
+    preview_path: Optional[str] = None
+    status: Optional[str] = None
+    error_log: Optional[Dict[str, Any]] = None
+    approved_at: Optional[datetime] = None
+    rejected_at: Optional[datetime] = None
+    rejection_reason: Optional[str] = None
+    destination_posts: Optional[List[DestinationPostResponse]] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class PendingContentFlow(BaseModel):
+    """Flow summary shown with items awaiting approval."""
+    id: int
+    name: str
+    require_approval: Optional[bool] = None
+
+    class Config:
+        from_attributes = True
+
+
+class PendingContentItem(BaseModel):
+    """Schema for the approval inbox; carries what a reviewer needs and nothing more."""
+    id: int
+    source_platform: Platform
+    source_url: str
+    source_data: Optional[Dict[str, Any]] = None
+    edited_content_path: Optional[str] = None
+    preview_path: Optional[str] = None
+    content_flow_id: int
+    created_at: datetime
+    content_flow: PendingContentFlow
+
+    class Config:
+        from_attributes = True
+
+
+class ContentBulkFilter(BaseModel):
+    """Selects queue items for a bulk review by their attributes instead of by id."""
+    content_flow_id: Optional[int] = None
+    source_platform: Optional[Platform] = None
+    status: ContentStatus = ContentStatus.READY
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+
+
+class ContentBulkReview(BaseModel):
+    """Approve or reject the listed items, or the items matching a filter."""
+    action: Literal["approve", "reject"]
+    ids: Optional[List[int]] = None
+    filter: Optional[ContentBulkFilter] = None
+    reason: Optional[str] = None  # Required when rejecting
+
+
+class ContentBulkItemResult(BaseModel):
+    id: int
+    result: Literal["updated", "not_found", "not_reviewable"]
+    status: Optional[ContentStatus] = None  # Status after the request
+    previous_status: Optional[ContentStatus] = None
+
+
+class ContentBulkReviewResult(BaseModel):
+    action: Literal["approve", "reject"]
+    updated: int
+    has_more: bool = False  # Filter requests stop at CONTENT_BULK_MAX_ITEMS; repeat to continue
+    results: List[ContentBulkItemResult]
+
+
 # Source Config Schemas
 class SourceConfigBase(BaseModel):
     name: str
@@ -313,6 +423,10 @@ class ContentFlowBase(BaseModel):
     source_config_id: int
     editing_pipeline_id: int
     destination_account_id: int
+    additional_destination_ids: List[int] = Field(
+        default_factory=list,
+        description="Further destination accounts each edited item is cross-posted to"
+    )
     source_interval: Optional[int] = None
     post_schedule: Optional[PostSchedule] = None
     is_active: bool = True
@@ -328,6 +442,7 @@ class ContentFlow(ContentFlowBase):
     source_config: SourceConfig
     editing_pipeline: EditingPipeline
     destination_account: DestinationAccount
+    additional_destinations: List[DestinationAccount] = []
 
     class Config:
         from_attributes = True
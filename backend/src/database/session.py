@@ -1,5 +1,13 @@
+from collections import deque
+from typing import Any, Dict, Tuple
+import threading
+import time
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 from sqlalchemy.ext.declarative import declarative_base
 from config import Settings
 
@@ -7,15 +15,185 @@ settings = Settings()
 
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, pool_pre_ping=True  # Enable automatic reconnection
-)
+# Pool size and overflow per process role. The API serves many concurrent
+# requests from one process; a prefork Celery child runs one task at a time,
+# plus its fan-out upload threads and the credential refresh thread.
+POOL_ROLES: Dict[str, Tuple[int, int]] = {
+    "api": (settings.DB_POOL_SIZE_API, settings.DB_MAX_OVERFLOW_API),
+    "worker": (settings.DB_POOL_SIZE_WORKER, settings.DB_MAX_OVERFLOW_WORKER),
+}
+
+RECENT_WAITS = 1000  # Checkout waits kept per pool for percentiles
+
+
+class PoolMetrics:
+    """Checkout wait times of one connection pool in this process."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.recent = deque(maxlen=RECENT_WAITS)
+        self.lock = threading.Lock()
+
+    def record(self, wait: float, timed_out: bool) -> None:
+        with self.lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+                self.recent.append(wait)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            recent = sorted(self.recent)
+            checkouts, timeouts, total_wait, max_wait = self.checkouts, self.timeouts, self.total_wait, self.max_wait
+
+        def percentile(value: float) -> float:
+            return recent[min(int(value * len(recent)), len(recent) - 1)] * 1000 if recent else 0.0
+
+        return {
+            "checkouts": checkouts,
+            "timeouts": timeouts,
+            "mean_wait_ms": total_wait / checkouts * 1000 if checkouts else 0.0,
+            "p95_wait_ms": percentile(0.95),
+            "p99_wait_ms": percentile(0.99),
+            "max_wait_ms": max_wait * 1000,
+        }
+
+
+_pool_metrics: Dict[str, PoolMetrics] = {}
+
+
+class _CheckoutTimingMixin:
+    """Times how long each checkout waits for a free connection."""
+
+    metrics_name = "default"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            _pool_metrics[self.metrics_name].record(time.perf_counter() - started, timed_out=True)
+            raise
+        _pool_metrics[self.metrics_name].record(time.perf_counter() - started, timed_out=False)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics_name = self.metrics_name
+        return pool
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _async_database_url(url: str) -> str:
+    """The same database through the asyncpg driver, e.g. for postgresql:// or postgresql+psycopg2:// URLs."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "postgresql":
+        parsed = parsed.set(drivername="postgresql+asyncpg")
+    return parsed.render_as_string(hide_password=False)
+
+
+def _pool_options(name: str, role: str, pool_class: type) -> Dict[str, Any]:
+    """Engine pool arguments for a process role.
+
+    Behind PgBouncer in transaction mode, PgBouncer does the pooling, so the
+    application opens a connection per checkout and releases it straight away.
+    """
+    if settings.DB_PGBOUNCER:
+        return {"poolclass": NullPool}
+    pool_size, max_overflow = POOL_ROLES[role]
+    _pool_metrics.setdefault(name, PoolMetrics())
+    return {
+        "poolclass": pool_class,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": True,  # Enable automatic reconnection
+    }
+
+
+def create_sync_engine(role: str) -> Engine:
+    engine = create_engine(SQLALCHEMY_DATABASE_URL, **_pool_options("sync", role, InstrumentedQueuePool))
+    engine.pool.metrics_name = "sync"
+    return engine
+
+
+def _create_async_engine():
+    connect_args = {}
+    if settings.DB_PGBOUNCER:
+        # asyncpg's prepared statement caches break under transaction pooling
+        connect_args = {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+    async_engine = create_async_engine(
+        settings.ASYNC_DATABASE_URL or _async_database_url(SQLALCHEMY_DATABASE_URL),
+        connect_args=connect_args,
+        **_pool_options("async", "api", InstrumentedAsyncQueuePool)
+    )
+    async_engine.sync_engine.pool.metrics_name = "async"
+    return async_engine
+
+
+engine = create_sync_engine(settings.DB_POOL_ROLE)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for the API routes, so a slow query never blocks the event loop
+async_engine = _create_async_engine()
+
+# Objects stay usable after commit; expiring them would need an await to reload
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 
+def configure_process(role: str) -> None:
+    """Give a freshly forked process its own engine, sized for its role.
+
+    Celery prefork children inherit the parent's engine, including any pooled
+    sockets the parent opened. Sharing a socket between processes corrupts
+    the connection, so the inherited pools are dropped without closing the
+    parent's connections and SessionLocal is rebound to a new engine.
+    """
+    global engine
+    inherited = engine
+    engine = create_sync_engine(role)
+    SessionLocal.configure(bind=engine)
+    inherited.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
+    for metrics_name in list(_pool_metrics):
+        _pool_metrics[metrics_name] = PoolMetrics()
+
+
+def pool_metrics() -> Dict[str, Any]:
+    """Connection pool state and checkout wait times of this process."""
+    metrics = {}
+    for name, pool in (("sync", engine.pool), ("async", async_engine.sync_engine.pool)):
+        entry: Dict[str, Any] = {"pool": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            entry.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": pool.overflow(),
+            })
+        if name in _pool_metrics:
+            entry.update(_pool_metrics[name].snapshot())
+        metrics[name] = entry
+    return metrics
+
+
 # Dependency for FastAPI
 def get_db():
     db = SessionLocal()
@@ -23,3 +201,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Async dependency for FastAPI
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,155 @@
+"""Perceptual video and audio fingerprints."""
+from typing import List, Optional, TypedDict
+import ffmpeg
+import numpy as np
+from config import Settings
+
+settings = Settings()
+
+FRAME_SIZE = 32  # Frames are reduced to FRAME_SIZE x FRAME_SIZE greyscale
+HASH_SIZE = 8  # Low-frequency HASH_SIZE x HASH_SIZE block -> 64-bit hash
+AUDIO_SAMPLE_RATE = 11025
+AUDIO_WINDOW = 4096
+AUDIO_HOP = 2048
+CHROMA_SEGMENTS = 16  # Chromagram is averaged into this many time segments
+CHROMA_MIN_HZ = 55.0
+CHROMA_MAX_HZ = 5000.0
+
+
+class FingerprintError(Exception):
+    """Raised when media cannot be decoded for fingerprinting."""
+    pass
+
+
+class Fingerprint(TypedDict):
+    video_hash: int
+    frame_hashes: List[int]
+    audio_hash: Optional[int]
+    duration: float
+
+
+def _dct_matrix(size: int) -> np.ndarray:
+    """Orthonormal DCT-II matrix, so ``D @ x @ D.T`` is the 2D DCT of x."""
+    k = np.arange(size)[:, None]
+    n = np.arange(size)[None, :]
+    matrix = np.sqrt(2 / size) * np.cos(np.pi * (2 * n + 1) * k / (2 * size))
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+
+def _low_frequencies(matrices: np.ndarray) -> np.ndarray:
+    """Low-frequency HASH_SIZE x HASH_SIZE DCT block of each matrix in a stack."""
+    rows = _dct_matrix(matrices.shape[-2])
+    cols = _dct_matrix(matrices.shape[-1])
+    return (rows @ matrices @ cols.T)[..., :HASH_SIZE, :HASH_SIZE]
+
+
+def _hash_bits(block: np.ndarray) -> int:
+    """64-bit hash of a DCT block: one bit per coefficient above the median.
+
+    The DC coefficient only reflects overall brightness/loudness, so it is left
+    out of the median.
+    """
+    flat = block.reshape(-1)
+    bits = flat > np.median(flat[1:])
+    return int(np.packbits(bits.astype(np.uint8)).view(">u8")[0])
+
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits between two 64-bit hashes."""
+    return bin(a ^ b).count("1")
+
+
+def _probe_duration(path: str) -> float:
+    try:
+        return float(ffmpeg.probe(path)["format"]["duration"])
+    except (ffmpeg.Error, KeyError, ValueError) as e:
+        raise FingerprintError(f"Failed to probe {path}") from e
+
+
+def _sample_frames(path: str, duration: float, count: int) -> np.ndarray:
+    """Decode ``count`` evenly spaced greyscale frames of FRAME_SIZE x FRAME_SIZE."""
+    try:
+        raw, _ = (
+            ffmpeg.input(path)
+            .filter("fps", fps=count / max(duration, 0.001))
+            .filter("scale", FRAME_SIZE, FRAME_SIZE)
+            .output("pipe:", format="rawvideo", pix_fmt="gray", vframes=count)
+            .run(capture_stdout=True, capture_stderr=True)
+        )
+    except ffmpeg.Error as e:
+        raise FingerprintError(f"Failed to decode frames of {path}") from e
+    frames = np.frombuffer(raw, dtype=np.uint8)
+    if frames.size < FRAME_SIZE * FRAME_SIZE:
+        raise FingerprintError(f"No frames decoded from {path}")
+    return frames[:frames.size // (FRAME_SIZE * FRAME_SIZE) * FRAME_SIZE * FRAME_SIZE].reshape(
+        -1, FRAME_SIZE, FRAME_SIZE
+    ).astype(np.float64)
+
+
+def _decode_audio(path: str) -> Optional[np.ndarray]:
+    """Mono PCM samples in [-1, 1], or None if the media has no audio."""
+    try:
+        raw, _ = (
+            ffmpeg.input(path)
+            .output("pipe:", format="s16le", acodec="pcm_s16le", ac=1, ar=AUDIO_SAMPLE_RATE)
+            .run(capture_stdout=True, capture_stderr=True)
+        )
+    except ffmpeg.Error:
+        return None  # ffmpeg fails when there is no audio stream to map
+    samples = np.frombuffer(raw, dtype="<i2").astype(np.float64) / 32768
+    return samples if samples.size >= AUDIO_WINDOW else None
+
+
+def _chromagram(samples: np.ndarray) -> np.ndarray:
+    """Energy per pitch class (frames x 12) from a short-time Fourier transform."""
+    starts = np.arange(0, samples.size - AUDIO_WINDOW + 1, AUDIO_HOP)
+    frames = samples[starts[:, None] + np.arange(AUDIO_WINDOW)] * np.hanning(AUDIO_WINDOW)
+    spectrum = np.abs(np.fft.rfft(frames, axis=1)) ** 2
+
+    frequencies = np.fft.rfftfreq(AUDIO_WINDOW, 1 / AUDIO_SAMPLE_RATE)
+    in_range = (frequencies >= CHROMA_MIN_HZ) & (frequencies <= CHROMA_MAX_HZ)
+    pitch_classes = np.round(12 * np.log2(frequencies[in_range] / 440.0)).astype(int) % 12
+
+    chroma = np.zeros((spectrum.shape[0], 12))
+    for pitch_class in range(12):
+        chroma[:, pitch_class] = spectrum[:, in_range][:, pitch_classes == pitch_class].sum(axis=1)
+    return chroma / np.maximum(chroma.sum(axis=1, keepdims=True), 1e-12)
+
+
+def _audio_hash(samples: np.ndarray) -> Optional[int]:
+    """pHash of the chromagram averaged into CHROMA_SEGMENTS time segments.
+
+    Chroma ignores timbre and loudness, so re-encoded or re-mixed copies of the
+    same audio keep the same hash.
+    """
+    chroma = _chromagram(samples)
+    if chroma.shape[0] < CHROMA_SEGMENTS:
+        return None
+    segments = np.stack([segment.mean(axis=0) for segment in np.array_split(chroma, CHROMA_SEGMENTS)])
+    return _hash_bits(_low_frequencies(segments))
+
+
+def fingerprint_video(path: str) -> Fingerprint:
+    """Compute the perceptual fingerprint of a video file.
+
+    Args:
+        path: Path of the video file
+
+    Returns:
+        Fingerprint with an aggregate 64-bit video hash, a hash per sampled frame,
+        an audio chroma hash (None without audio) and the duration in seconds
+
+    Raises:
+        FingerprintError: If the video cannot be decoded
+    """
+    duration = _probe_duration(path)
+    frames = _sample_frames(path, duration, settings.DEDUP_FRAME_SAMPLES)
+    blocks = _low_frequencies(frames)
+    samples = _decode_audio(path)
+    return {
+        "video_hash": _hash_bits(blocks.mean(axis=0)),
+        "frame_hashes": [_hash_bits(block) for block in blocks],
+        "audio_hash": _audio_hash(samples) if samples is not None else None,
+        "duration": duration,
+    }
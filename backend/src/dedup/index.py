@@ -0,0 +1,212 @@
+"""Near-duplicate lookup over stored content fingerprints."""
+from typing import Dict, Iterator, List, Optional, Tuple
+from datetime import datetime, timedelta
+import threading
+import numpy as np
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from src.database.models import ContentFingerprint, Platform
+from src.dedup.fingerprint import Fingerprint, hamming
+from src.logging.log_manager import LogManager
+from config import Settings
+
+settings = Settings()
+log_manager = LogManager()
+logger_name = "dedup-index"
+
+
+def to_signed(value: int) -> int:
+    """Map an unsigned 64-bit hash onto Postgres' signed BIGINT range."""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def to_unsigned(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+def pack_hashes(hashes: List[int]) -> bytes:
+    return np.asarray(hashes, dtype="<u8").tobytes()
+
+
+def unpack_hashes(data: bytes) -> List[int]:
+    return [int(value) for value in np.frombuffer(data, dtype="<u8")]
+
+
+class BKTree:
+    """Burkhard-Keller tree over 64-bit hashes with Hamming distance.
+
+    Each child edge is labelled with its distance to the parent, so by the
+    triangle inequality a query with radius r only has to visit children whose
+    label lies within r of the query's distance to the parent.
+    """
+
+    def __init__(self):
+        self._root: Optional[Tuple[int, int, Dict[int, tuple]]] = None
+        self.size = 0
+
+    def add(self, value: int, item_id: int) -> None:
+        self.size += 1
+        if self._root is None:
+            self._root = (value, item_id, {})
+            return
+        node = self._root
+        while True:
+            distance = hamming(value, node[0])
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = (value, item_id, {})
+                return
+            node = child
+
+    def search(self, value: int, radius: int) -> Iterator[Tuple[int, int]]:
+        """Yield (item ID, distance) of every stored hash within ``radius``."""
+        if self._root is None:
+            return
+        stack = [self._root]
+        while stack:
+            node_value, item_id, children = stack.pop()
+            distance = hamming(value, node_value)
+            if distance <= radius:
+                yield item_id, distance
+            for label, child in children.items():
+                if distance - radius <= label <= distance + radius:
+                    stack.append(child)
+
+
+class DedupIndex:
+    """Process-wide BK-trees over the fingerprints of each destination account.
+
+    Trees are loaded lazily. Each lookup then adds the rows stored since the
+    previous one, so a lookup sees fingerprints stored by other processes and
+    by earlier items of the same batch.
+
+    IDs are assigned at insert but rows become visible at commit, so a row can
+    appear after rows with higher IDs. Each lookup therefore also re-reads the
+    rows created within DEDUP_INDEX_OVERLAP_SECONDS of the newest loaded row
+    and adds the ones it has not seen yet.
+    """
+
+    _trees: Dict[int, BKTree] = {}
+    _loaded_up_to: Dict[int, int] = {}
+    _recent: Dict[int, Dict[int, datetime]] = {}  # Loaded rows inside the overlap window, ID -> created_at
+    _lock = threading.Lock()
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _tree(self, destination_account_id: int) -> BKTree:
+        """The account's tree, updated with fingerprints stored since the last call."""
+        with self._lock:
+            tree = self._trees.setdefault(destination_account_id, BKTree())
+            last_id = self._loaded_up_to.get(destination_account_id, 0)
+            recent = self._recent.setdefault(destination_account_id, {})
+            overlap = timedelta(seconds=settings.DEDUP_INDEX_OVERLAP_SECONDS)
+
+            condition = ContentFingerprint.id > last_id
+            if recent:
+                condition = or_(condition, ContentFingerprint.created_at >= max(recent.values()) - overlap)
+            rows = (
+                self.db.query(ContentFingerprint.id, ContentFingerprint.video_hash, ContentFingerprint.created_at)
+                .filter(ContentFingerprint.destination_account_id == destination_account_id, condition)
+                .order_by(ContentFingerprint.id)
+                .all()
+            )
+            for fingerprint_id, video_hash, created_at in rows:
+                if fingerprint_id in recent:
+                    continue
+                tree.add(to_unsigned(video_hash), fingerprint_id)
+                if created_at is not None:
+                    recent[fingerprint_id] = created_at
+                last_id = max(last_id, fingerprint_id)
+            self._loaded_up_to[destination_account_id] = last_id
+
+            if recent:
+                cutoff = max(recent.values()) - overlap
+                for fingerprint_id in [key for key, created_at in recent.items() if created_at < cutoff]:
+                    del recent[fingerprint_id]
+            return tree
+
+    def _confirms(self, fingerprint: Fingerprint, candidate: ContentFingerprint) -> bool:
+        """Check a candidate found by the aggregate hash against the finer hashes."""
+        if fingerprint["audio_hash"] is not None and candidate.audio_hash is not None:
+            if hamming(fingerprint["audio_hash"], to_unsigned(candidate.audio_hash)) > settings.DEDUP_AUDIO_MAX_DISTANCE:
+                return False
+
+        # Most sampled frames must have a close match in the candidate, so clips
+        # that merely share a few shots are not treated as duplicates
+        candidate_frames = unpack_hashes(candidate.frame_hashes)
+        matched = sum(
+            1 for frame_hash in fingerprint["frame_hashes"]
+            if min(hamming(frame_hash, other) for other in candidate_frames) <= settings.DEDUP_FRAME_MAX_DISTANCE
+        )
+        return matched >= settings.DEDUP_MIN_FRAME_MATCH * len(fingerprint["frame_hashes"])
+
+    def find_duplicate(self, destination_account_id: int, fingerprint: Fingerprint) -> Optional[ContentFingerprint]:
+        """Find stored content that the fingerprint duplicates.
+
+        Args:
+            destination_account_id: Account the content would be posted to
+            fingerprint: Fingerprint of the new content
+
+        Returns:
+            Closest matching fingerprint row, or None if the content is new
+        """
+        matches = sorted(
+            self._tree(destination_account_id).search(fingerprint["video_hash"], settings.DEDUP_VIDEO_MAX_DISTANCE),
+            key=lambda match: match[1]
+        )
+        if not matches:
+            return None
+
+        candidates = {
+            candidate.id: candidate
+            for candidate in self.db.query(ContentFingerprint).filter(
+                ContentFingerprint.id.in_([fingerprint_id for fingerprint_id, _ in matches])
+            )
+        }
+        for fingerprint_id, _ in matches:
+            candidate = candidates.get(fingerprint_id)
+            if candidate and self._confirms(fingerprint, candidate):
+                return candidate
+        return None
+
+    def stored_for_media(self, source_media_id: int) -> Optional[Fingerprint]:
+        """Fingerprint already computed for the same stored media, if any."""
+        row = (
+            self.db.query(ContentFingerprint)
+            .filter(ContentFingerprint.source_media_id == source_media_id)
+            .first()
+        )
+        if row is None:
+            return None
+        return {
+            "video_hash": to_unsigned(row.video_hash),
+            "frame_hashes": unpack_hashes(row.frame_hashes),
+            "audio_hash": to_unsigned(row.audio_hash) if row.audio_hash is not None else None,
+            "duration": row.duration,
+        }
+
+    def add(
+        self,
+        destination_account_id: int,
+        content_flow_id: int,
+        source_platform: Platform,
+        source_url: Optional[str],
+        source_media_id: Optional[int],
+        fingerprint: Fingerprint
+    ) -> ContentFingerprint:
+        """Store a fingerprint so later content is checked against it."""
+        row = ContentFingerprint(
+            destination_account_id=destination_account_id,
+            content_flow_id=content_flow_id,
+            source_platform=source_platform,
+            source_url=source_url,
+            source_media_id=source_media_id,
+            video_hash=to_signed(fingerprint["video_hash"]),
+            frame_hashes=pack_hashes(fingerprint["frame_hashes"]),
+            audio_hash=to_signed(fingerprint["audio_hash"]) if fingerprint["audio_hash"] is not None else None,
+            duration=fingerprint["duration"]
+        )
+        self.db.add(row)
+        self.db.commit()
+        return row
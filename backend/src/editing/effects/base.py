@@ -40,17 +40,18 @@ class Transformation(ABC):
         """
         pass
     
-    def _get_output_path(self, input_path: str, suffix: str = "") -> str:
+    def _get_output_path(self, input_path: str, suffix: str = "", directory: Optional[str] = None) -> str:
         """Generate output path for transformed file.
         
         Args:
             input_path: Original file path
             suffix: Optional suffix to add to filename
+            directory: Working directory of the pipeline run (default: next to the input)
             
         Returns:
             Path for output file
         """
-        directory = os.path.dirname(input_path)
+        directory = directory or os.path.dirname(input_path)
         filename = os.path.basename(input_path)
         name, ext = os.path.splitext(filename)
         return os.path.join(directory, f"{name}{suffix}{ext}")
@@ -47,7 +47,7 @@ class TrimTransformation(TransformationBase):
             for content in content_items:
                 # Build ffmpeg command
                 input_path = content["file_path"]
-                output_path = self._get_output_path(input_path, "_trimmed")
+                output_path = self._get_output_path(input_path, "_trimmed", content.get("work_dir"))
                 
                 stream = ffmpeg.input(input_path, ss=start_time, t=end_time-start_time)
                 self._run_ffmpeg(stream, output_path)
@@ -131,7 +131,7 @@ class SubtitleTransformation(TransformationBase):
                 )
                 
                 # Extract audio
-                audio_path = self._get_output_path(input_path, "_audio.wav")
+                audio_path = self._get_output_path(input_path, "_audio.wav", content.get("work_dir"))
                 stream = ffmpeg.input(input_path)
                 stream = ffmpeg.output(stream, audio_path, acodec="pcm_s16le", ac=1, ar="16k")
                 self._run_ffmpeg(stream, audio_path)
@@ -148,7 +148,7 @@ class SubtitleTransformation(TransformationBase):
                 )
                 
                 # Create SRT file
-                srt_path = self._get_output_path(input_path, ".srt")
+                srt_path = self._get_output_path(input_path, ".srt", content.get("work_dir"))
                 with open(srt_path, "w", encoding="utf-8") as f:
                     for i, segment in enumerate(result["segments"], 1):
                         start = str(timedelta(seconds=segment["start"])).replace(".", ",")[:12]
@@ -158,7 +158,7 @@ class SubtitleTransformation(TransformationBase):
                         f.write(f"{segment['text'].strip()}\n\n")
                 
                 # Add subtitles to video
-                output_path = self._get_output_path(input_path, "_subtitled")
+                output_path = self._get_output_path(input_path, "_subtitled", content.get("work_dir"))
                 subtitle_filter = f"subtitles={srt_path}:force_style='FontSize={font_size},PrimaryColour={font_color}'"
                 
                 stream = ffmpeg.input(input_path)
@@ -223,15 +223,16 @@ class CombineVideos(TransformationBase):
             # Prepare input files
             items_to_combine = content_items[:max_videos]
             input_files = [item["file_path"] for item in items_to_combine]
+            work_dir = items_to_combine[0].get("work_dir")
             
             # Create file list for ffmpeg
-            list_path = self._get_output_path(input_files[0], "_list.txt")
+            list_path = self._get_output_path(input_files[0], "_list.txt", work_dir)
             with open(list_path, "w") as f:
                 for file_path in input_files:
                     f.write(f"file '{file_path}'\n")
             
             # Build ffmpeg command
-            output_path = self._get_output_path(input_files[0], "_combined")
+            output_path = self._get_output_path(input_files[0], "_combined", work_dir)
             
             if transition:
                 # Complex command with transition effects
@@ -268,6 +269,7 @@ class CombineVideos(TransformationBase):
                 ),
                 "duration": sum(item.get("duration", 0) for item in items_to_combine),
                 "url": items_to_combine[0]["url"],  # Use first video's URL as primary
+                "work_dir": work_dir,
                 "combined_from": [{
                     "url": item["url"],
                     "title": item["title"],
@@ -1,9 +1,13 @@
 from typing import Dict, Any, List
+import os
+import tempfile
 from src.database.models import Transformation
 from src.editing.effects.registry import TransformationRegistry
 from src.editing.effects.base import Transformation as TransformationBase
 from src.logging.log_manager import LogManager
+from config import Settings
 
+settings = Settings()
 log_manager = LogManager()
 logger_name = "transformation-pipeline"
 
@@ -40,6 +44,9 @@ class TransformationPipeline:
     def transform(self, content_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Execute all transformations in sequence on the given content.
         
+        Source files may be shared with other flows, so every run writes its
+        outputs into its own working directory, set as ``work_dir`` on the items.
+
         Args:
             content_items: List of content objects, each containing file_path and metadata
             
@@ -56,8 +63,11 @@ class TransformationPipeline:
                 context={"input_count": len(content_items)}
             )
             
+            os.makedirs(settings.EDITED_CONTENT_PATH, exist_ok=True)
+            work_dir = tempfile.mkdtemp(prefix="edit-", dir=settings.EDITED_CONTENT_PATH)
+
             # Update content objects as we go
-            current_items = content_items.copy()
+            current_items = [{**item, "work_dir": work_dir} for item in content_items]
             
             for transformation, parameters in self.steps:
                 transformation_name = transformation.__class__.__name__
@@ -0,0 +1,268 @@
+"""Platform-specific renditions derived from an edited master."""
+from typing import Dict, Iterable, Optional, Tuple, TypedDict
+import hashlib
+import json
+import os
+import threading
+import ffmpeg
+from src.database.models import Platform
+from src.storage.media_store import TEMP_PREFIX, file_lock
+from src.storage.paths import sharded_path
+from src.logging.log_manager import LogManager
+from config import Settings
+
+settings = Settings()
+log_manager = LogManager()
+logger_name = "renditions"
+
+HASH_CHUNK_SIZE = 1024 * 1024
+FITS_SUFFIX = ".fits"  # Marker next to a rendition path: the master satisfies the profile as is
+
+
+class RenditionError(Exception):
+    """Raised when a rendition cannot be produced."""
+    pass
+
+
+class RenditionProfile(TypedDict):
+    name: str
+    width: int
+    height: int
+    max_fps: int
+    max_duration: int  # Seconds
+    video_bitrate: str  # Target average bitrate, e.g. "8M"
+    max_video_bitrate: int  # Bits per second
+    audio_bitrate: str
+    audio_sample_rate: int
+    max_file_size: int  # Bytes
+
+
+# Vertical 9:16 H.264/AAC MP4 for every platform; limits follow each platform's upload rules
+PLATFORM_PROFILES: Dict[Platform, RenditionProfile] = {
+    Platform.TIKTOK: {
+        "name": "tiktok-v1",
+        "width": 1080,
+        "height": 1920,
+        "max_fps": 60,
+        "max_duration": 600,
+        "video_bitrate": "8M",
+        "max_video_bitrate": 12_000_000,
+        "audio_bitrate": "128k",
+        "audio_sample_rate": 44100,
+        "max_file_size": 4 * 1024 ** 3,
+    },
+    Platform.INSTAGRAM: {
+        "name": "instagram-reels-v1",
+        "width": 1080,
+        "height": 1920,
+        "max_fps": 60,
+        "max_duration": 900,
+        "video_bitrate": "8M",
+        "max_video_bitrate": 25_000_000,
+        "audio_bitrate": "128k",
+        "audio_sample_rate": 48000,
+        "max_file_size": 1024 ** 3,
+    },
+    Platform.YOUTUBE: {
+        "name": "youtube-shorts-v1",
+        "width": 1080,
+        "height": 1920,
+        "max_fps": 60,
+        "max_duration": 180,
+        "video_bitrate": "10M",
+        "max_video_bitrate": 15_000_000,
+        "audio_bitrate": "192k",
+        "audio_sample_rate": 48000,
+        "max_file_size": 4 * 1024 ** 3,
+    },
+}
+
+
+def _profile_key(profile: RenditionProfile) -> str:
+    """Hash of every profile setting, so editing a profile invalidates its renditions."""
+    return hashlib.sha256(json.dumps(profile, sort_keys=True).encode()).hexdigest()[:16]
+
+
+class RenditionCache:
+    """Per-platform variants of edited masters, encoded once and shared.
+
+    Renditions are stored under RENDITIONS_PATH by (master sha256, profile), so
+    every destination account on the same platform reuses one encode. Concurrent
+    requests for the same rendition wait on a file lock for a single encoder.
+    A master that already satisfies a profile is used as is, and a marker
+    stored in place of the rendition remembers that, so it is probed once.
+    """
+
+    # Master hashes by (path, size, mtime), so a master is only read once per process
+    _master_hashes: Dict[Tuple[str, int, int], str] = {}
+    _hash_lock = threading.Lock()
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or settings.RENDITIONS_PATH
+
+    def master_hash(self, master_path: str) -> str:
+        stat = os.stat(master_path)
+        cache_key = (os.path.abspath(master_path), stat.st_size, int(stat.st_mtime))
+        with self._hash_lock:
+            if cache_key in self._master_hashes:
+                return self._master_hashes[cache_key]
+
+        digest = hashlib.sha256()
+        with open(master_path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        master_hash = digest.hexdigest()
+        with self._hash_lock:
+            self._master_hashes[cache_key] = master_hash
+        return master_hash
+
+    def path_for(self, master_hash: str, profile: RenditionProfile) -> str:
+        key = f"{master_hash}:{_profile_key(profile)}"
+        return sharded_path(self.root, profile["name"], key, f"{master_hash[:16]}_{_profile_key(profile)}.mp4")
+
+    def _fits(self, master_path: str, profile: RenditionProfile) -> bool:
+        """Whether the master already satisfies every limit of the profile."""
+        try:
+            probe = ffmpeg.probe(master_path)
+        except ffmpeg.Error:
+            return False
+        streams = {stream["codec_type"]: stream for stream in probe["streams"]}
+        video = streams.get("video")
+        audio = streams.get("audio")
+        if not video or video.get("codec_name") != "h264" or video.get("pix_fmt") != "yuv420p":
+            return False
+        if audio and audio.get("codec_name") != "aac":
+            return False
+        if probe["format"].get("format_name", "").split(",")[0] not in ("mov", "mp4"):
+            return False
+
+        numerator, _, denominator = video.get("avg_frame_rate", "0/1").partition("/")
+        fps = float(numerator) / float(denominator or 1) if float(denominator or 1) else 0
+        # The container bit rate includes audio; fall back to it minus the audio stream
+        video_bit_rate = int(video.get("bit_rate") or 0)
+        if not video_bit_rate:
+            audio_bit_rate = int(audio.get("bit_rate") or 0) if audio else 0
+            video_bit_rate = int(probe["format"].get("bit_rate") or 0) - audio_bit_rate
+        return (
+            (int(video["width"]), int(video["height"])) == (profile["width"], profile["height"])
+            and fps <= profile["max_fps"]
+            and float(probe["format"].get("duration", 0)) <= profile["max_duration"]
+            and video_bit_rate <= profile["max_video_bitrate"]
+            and int(probe["format"].get("size", 0)) <= profile["max_file_size"]
+        )
+
+    def _encode(self, master_path: str, output_path: str, profile: RenditionProfile) -> None:
+        width, height = profile["width"], profile["height"]
+        master = ffmpeg.input(master_path, t=profile["max_duration"])
+        video = (
+            master.video
+            .filter("scale", width, height, force_original_aspect_ratio="decrease")
+            .filter("pad", width, height, "(ow-iw)/2", "(oh-ih)/2")
+            .filter("fps", fps=f"min(source_fps,{profile['max_fps']})")
+        )
+        has_audio = any(
+            stream["codec_type"] == "audio" for stream in ffmpeg.probe(master_path)["streams"]
+        )
+        streams = [video, master.audio] if has_audio else [video]
+        audio_options = {
+            "acodec": "aac",
+            "audio_bitrate": profile["audio_bitrate"],
+            "ar": profile["audio_sample_rate"],
+        } if has_audio else {}
+        try:
+            (
+                ffmpeg.output(
+                    *streams,
+                    output_path,
+                    vcodec="libx264",
+                    pix_fmt="yuv420p",
+                    video_bitrate=profile["video_bitrate"],
+                    maxrate=profile["max_video_bitrate"],
+                    bufsize=profile["max_video_bitrate"] * 2,
+                    movflags="+faststart",
+                    **audio_options
+                )
+                .overwrite_output()
+                .run(capture_stdout=True, capture_stderr=True)
+            )
+        except ffmpeg.Error as e:
+            error_message = e.stderr.decode() if e.stderr else str(e)
+            raise RenditionError(f"Failed to encode {profile['name']} rendition: {error_message}") from e
+
+    def get(self, master_path: str, platform: Platform) -> str:
+        """Path of the platform's rendition of a master, encoding it if needed.
+
+        Args:
+            master_path: Edited master video
+            platform: Destination platform
+
+        Returns:
+            Path of the rendition, or of the master itself when it already fits
+
+        Raises:
+            RenditionError: If the rendition cannot be encoded
+        """
+        profile = PLATFORM_PROFILES.get(platform)
+        if profile is None:
+            return master_path
+
+        rendition_path = self.path_for(self.master_hash(master_path), profile)
+        fits_path = f"{rendition_path}{FITS_SUFFIX}"
+        for cached_path, result in ((rendition_path, rendition_path), (fits_path, master_path)):
+            if os.path.exists(cached_path):
+                os.utime(cached_path)  # Marks the rendition as recently used for the GC
+                return result
+
+        directory = os.path.dirname(rendition_path)
+        os.makedirs(directory, exist_ok=True)
+        with file_lock(f"{rendition_path}.lock"):
+            if os.path.exists(rendition_path):
+                return rendition_path
+            if os.path.exists(fits_path):
+                return master_path
+            if self._fits(master_path, profile):
+                # Keyed by the master's hash like a rendition, so the master is probed only once
+                with open(fits_path, "w"):
+                    pass
+                log_manager.info(
+                    logger_name,
+                    "Master already fits profile, skipping encode",
+                    context={"master": master_path, "profile": profile["name"]}
+                )
+                return master_path
+
+            temp_path = os.path.join(directory, f"{TEMP_PREFIX}{os.path.basename(rendition_path)}")
+            try:
+                self._encode(master_path, temp_path, profile)
+                os.replace(temp_path, rendition_path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+
+        log_manager.info(
+            logger_name,
+            "Encoded rendition",
+            context={"master": master_path, "profile": profile["name"], "path": rendition_path}
+        )
+        return rendition_path
+
+    def prerender(self, master_path: str, platforms: Iterable[Platform]) -> Dict[Platform, str]:
+        """Encode the renditions of a master for several platforms ahead of posting.
+
+        Failures are logged and left for post time, which will try again.
+
+        Returns:
+            Dictionary of platform to rendition path for the successful encodes
+        """
+        renditions = {}
+        for platform in set(platforms):
+            try:
+                renditions[platform] = self.get(master_path, platform)
+            except (RenditionError, OSError) as e:
+                log_manager.error(
+                    logger_name,
+                    "Failed to pre-render rendition",
+                    context={"master": master_path, "platform": platform},
+                    error=e
+                )
+        return renditions
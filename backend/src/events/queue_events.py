@@ -0,0 +1,264 @@
+"""Change feed of queue item status transitions, published through a Redis stream.
+
+Every session that flushes a created, status-changed or deleted queue item
+publishes an event once its transaction commits. The API streams the feed to
+clients as server-sent events, so they no longer re-fetch the queue to see
+status changes.
+"""
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from datetime import datetime, timezone
+import asyncio
+import json
+import queue
+import threading
+import redis
+import redis.asyncio
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from src.database.models import ContentQueueItem
+from src.logging.log_manager import LogManager
+from config import Settings
+
+settings = Settings()
+log_manager = LogManager()
+logger_name = "queue-events"
+
+PENDING_EVENTS_KEY = "queue_events"
+RESET = "reset"  # Event type telling a client it missed events and must re-fetch
+
+_publisher: Optional[redis.Redis] = None
+
+
+def _client() -> redis.Redis:
+    global _publisher
+    if _publisher is None:
+        _publisher = redis.Redis.from_url(settings.QUEUE_EVENTS_REDIS_URL)
+    return _publisher
+
+
+class _BackgroundPublisher:
+    """Publishes events from a daemon thread, for commits made on an event loop.
+
+    AsyncSession commits run the after_commit listener on the event loop's
+    thread, where a blocking Redis call would stall every other request.
+    """
+
+    def __init__(self):
+        self._pending: "queue.Queue[List[Dict[str, Any]]]" = queue.Queue(maxsize=settings.QUEUE_EVENTS_PENDING_BATCHES)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, events: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="queue-events-publisher", daemon=True)
+                self._thread.start()
+        try:
+            self._pending.put_nowait(events)
+        except queue.Full:
+            log_manager.warning(
+                logger_name,
+                "Queue event backlog full, dropping events",
+                context={"count": len(events)}
+            )
+
+    def _run(self) -> None:
+        while True:
+            publish_events(self._pending.get())
+
+
+_background_publisher = _BackgroundPublisher()
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _value(value: Any) -> Any:
+    return getattr(value, "value", value)
+
+
+def queue_event(
+    event_type: str,
+    item_id: int,
+    content_flow_id: Optional[int],
+    source_platform: Any,
+    status: Any,
+    previous_status: Any
+) -> Dict[str, Any]:
+    """Build a change feed event, e.g. for rows changed by a bulk UPDATE."""
+    return {
+        "type": event_type,
+        "item_id": item_id,
+        "content_flow_id": content_flow_id,
+        "source_platform": _value(source_platform),
+        "status": None if event_type == "deleted" else _value(status),
+        "previous_status": _value(previous_status),
+        "at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def _event(event_type: str, item: ContentQueueItem, previous_status: Any) -> Dict[str, Any]:
+    # Read from the instance state, so a deleted or expired item never triggers a load
+    state = inspect(item)
+    return queue_event(
+        event_type,
+        state.dict.get("id") or (state.identity or (None,))[0],
+        state.dict.get("content_flow_id"),
+        state.dict.get("source_platform"),
+        state.dict.get("status"),
+        previous_status
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_events(session: Session, flush_context: Any) -> None:
+    """Record queue item changes; they are published when the transaction commits."""
+    events = []
+    for item in session.new:
+        if isinstance(item, ContentQueueItem):
+            events.append(_event("created", item, None))
+    for item in session.dirty:
+        if isinstance(item, ContentQueueItem):
+            history = inspect(item).attrs.status.history
+            if history.added:
+                events.append(_event("updated", item, history.deleted[0] if history.deleted else None))
+    for item in session.deleted:
+        if isinstance(item, ContentQueueItem):
+            events.append(_event("deleted", item, inspect(item).dict.get("status")))
+    if events:
+        session.info.setdefault(PENDING_EVENTS_KEY, []).extend(events)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session) -> None:
+    events = session.info.pop(PENDING_EVENTS_KEY, [])
+    if not events:
+        return
+    if _on_event_loop():
+        _background_publisher.submit(events)
+    else:
+        publish_events(events)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(PENDING_EVENTS_KEY, None)
+
+
+def publish_events(events: List[Dict[str, Any]]) -> None:
+    """Append events to the stream.
+
+    Also used directly for changes made with bulk UPDATE statements, which do
+    not go through the flush. A failure is logged and never fails the commit;
+    clients that miss events re-fetch on their next reset.
+    """
+    if not events:
+        return
+    try:
+        pipeline = _client().pipeline(transaction=False)
+        for queue_event in events:
+            pipeline.xadd(
+                settings.QUEUE_EVENTS_STREAM,
+                {"data": json.dumps(queue_event)},
+                maxlen=settings.QUEUE_EVENTS_MAX_LENGTH,
+                approximate=True
+            )
+        pipeline.execute()
+    except redis.RedisError as e:
+        log_manager.warning(
+            logger_name,
+            "Failed to publish queue events",
+            context={"count": len(events), "error": str(e)}
+        )
+
+
+def _parse_id(event_id: str) -> Tuple[int, int]:
+    milliseconds, _, sequence = event_id.partition("-")
+    return int(milliseconds), int(sequence or 0)
+
+
+class QueueEventFeed:
+    """One client's view of the change feed, filtered by flow, platform and status."""
+
+    def __init__(
+        self,
+        flow_id: Optional[int] = None,
+        platform: Optional[str] = None,
+        statuses: Optional[List[str]] = None
+    ):
+        self.flow_id = flow_id
+        self.platform = platform
+        self.statuses = set(statuses) if statuses else None
+
+    def matches(self, queue_event: Dict[str, Any]) -> bool:
+        if self.flow_id is not None and queue_event.get("content_flow_id") != self.flow_id:
+            return False
+        if self.platform and queue_event.get("source_platform") != self.platform:
+            return False
+        if self.statuses is not None:
+            # A transition out of a watched status matters as much as one into it
+            return bool({queue_event.get("status"), queue_event.get("previous_status")} & self.statuses)
+        return True
+
+    async def _trimmed_after(self, client: redis.asyncio.Redis, last: Tuple[int, int]) -> bool:
+        """Whether any event after ``last`` was already trimmed from the stream."""
+        try:
+            info = await client.xinfo_stream(settings.QUEUE_EVENTS_STREAM)
+        except redis.ResponseError:
+            return False  # No stream yet, so nothing was trimmed
+        max_deleted = info.get("max-deleted-entry-id")
+        if max_deleted:
+            # Redis 7 tracks the newest trimmed ID, which answers exactly
+            return _parse_id(max_deleted) > last
+        # Older servers: only an oldest entry beyond the next possible ID proves a gap
+        first = info.get("first-entry")
+        return bool(first) and _parse_id(first[0]) > (last[0], last[1] + 1)
+
+    async def _start_id(self, client: redis.asyncio.Redis, last_event_id: Optional[str]) -> Tuple[str, bool]:
+        """Stream ID to read after, and whether events since ``last_event_id`` were trimmed."""
+        if last_event_id:
+            try:
+                last = _parse_id(last_event_id)
+            except ValueError:
+                last = None
+            if last is not None:
+                return last_event_id, await self._trimmed_after(client, last)
+        newest = await client.xrevrange(settings.QUEUE_EVENTS_STREAM, count=1)
+        return (newest[0][0] if newest else "0-0"), bool(last_event_id)
+
+    async def events(self, last_event_id: Optional[str] = None) -> AsyncIterator[Optional[Tuple[str, Dict[str, Any]]]]:
+        """Yield (event ID, event) for matching events after ``last_event_id``.
+
+        Without a last event ID the feed starts at the newest event. If the
+        events after it were already trimmed from the stream, or the ID is not
+        valid, a RESET event comes first. None is yielded whenever no event
+        arrived for QUEUE_EVENTS_HEARTBEAT_SECONDS, so the caller can send a
+        keep-alive and notice disconnected clients.
+        """
+        client = redis.asyncio.Redis.from_url(settings.QUEUE_EVENTS_REDIS_URL, decode_responses=True)
+        try:
+            cursor, missed = await self._start_id(client, last_event_id)
+            if missed:
+                yield cursor, {"type": RESET}
+            while True:
+                response = await client.xread(
+                    {settings.QUEUE_EVENTS_STREAM: cursor},
+                    count=100,
+                    block=settings.QUEUE_EVENTS_HEARTBEAT_SECONDS * 1000
+                )
+                if not response:
+                    yield None
+                    continue
+                for _, entries in response:
+                    for event_id, fields in entries:
+                        cursor = event_id
+                        queue_event = json.loads(fields["data"])
+                        if self.matches(queue_event):
+                            yield event_id, queue_event
+        finally:
+            await client.aclose()
@@ -1,25 +1,41 @@
 """Task scheduler for content processing."""
 
 from celery import Celery
+from celery.signals import worker_process_init
 from sqlalchemy.orm import Session, joinedload
 from src.database.models import (
-    ContentFlow,
     Platform,
     Transformation,
     ContentQueueItem,
     ContentStatus,
-    GlobalConfig,
     PostedItem,
+    DestinationPost,
+    DestinationPostStatus,
     SourceRateLimit,
     DestinationRateLimit,
 )
 from src.source_adapters.registry import SourceRegistry
+from src.source_adapters import reddit  # noqa: F401  Registers the Reddit adapter
+from src.source_adapters.quota import QuotaManager
 from src.editing.effects.registry import TransformationRegistry
 from src.editing.pipeline import TransformationPipeline
+from src.editing.renditions import RenditionCache
+from src.core.credentials import CredentialCache
 from src.upload.registry import UploadRegistry
-from src.database.session import SessionLocal
-from sqlalchemy import func
-from datetime import datetime, timezone
+from src.upload import instagram, tiktok  # noqa: F401  Registers the uploaders
+from src.storage.gc import StorageGarbageCollector
+from src.dedup.fingerprint import FingerprintError, fingerprint_video
+from src.dedup.index import DedupIndex
+from src.stats.rollups import destination_stats_increment, flow_stats_increment, rebuild_daily_stats
+from src.stats.metrics import MetricsPoller
+from src.database.session import SessionLocal, configure_process
+from src.events import queue_events  # noqa: F401  Publishes queue item changes on commit
+from src.core import config_revision  # noqa: F401  Bumps the config revision on config writes
+from src.core.config_snapshot import config_snapshots, thaw
+from sqlalchemy import and_, func, or_
+from datetime import datetime, timedelta, timezone
+import time
+from concurrent.futures import ThreadPoolExecutor
 from src.logging.log_manager import LogManager, LogLevel
 from zoneinfo import ZoneInfo
 from config import Settings
@@ -34,6 +50,18 @@ app.config_from_object("celeryconfig")
 app.conf.beat_scheduler = "celery.beat.schedulers.DatabaseScheduler"
 
 
+@worker_process_init.connect
+def _init_database_engine(**kwargs):
+    """Replace the engine inherited from the parent process, before any task uses it."""
+    configure_process("worker")
+
+
+@worker_process_init.connect
+def _start_credential_refresh(**kwargs):
+    """Keep OAuth tokens fresh in each worker process, so tasks never wait on a refresh."""
+    CredentialCache.start_background_refresh()
+
+
 def _should_reset_rate_limit(rate_limit):
     """Check if rate limit should be reset based on last action time.
     
@@ -140,15 +168,82 @@ def _is_posting_time(schedule, current_time):
         return False  # Don't post if we can't validate the schedule
 
 
+def _has_quota_budget(flow, quota, priorities):
+    """Check if a flow's source API key has budget for another sourcing run.
+    
+    Args:
+        flow: FlowSnapshot of the flow
+        quota: QuotaManager for the flow's source platform
+        priorities: Flow priorities from QuotaManager.flow_priorities
+    """
+    source_config = flow.source_config
+    if not source_config or source_config.platform != Platform.YOUTUBE:
+        return True
+    
+    api_key = (source_config.credentials or {}).get("api_key")
+    if not api_key:
+        return True
+        
+    return quota.can_spend(
+        api_key,
+        settings.YOUTUBE_ESTIMATED_RUN_COST,
+        priorities.get(flow.id, 1.0)
+    )
+
+
+def _check_duplicate(flow, item, dedup_index):
+    """Fingerprint sourced content and check it against the destination's history.
+
+    Content that cannot be fingerprinted is let through. The fingerprint of
+    new content is returned, not stored; the caller adds it to the index once
+    the item is READY, so content that failed editing can be sourced again.
+
+    Returns:
+        Tuple of whether the content is a duplicate and its fingerprint, if any
+    """
+    if not settings.DEDUP_ENABLED:
+        return False, None
+
+    fingerprint = None
+    if item.get("source_media_id"):
+        fingerprint = dedup_index.stored_for_media(item["source_media_id"])
+    if fingerprint is None:
+        try:
+            fingerprint = fingerprint_video(item["file_path"])
+        except FingerprintError as e:
+            log_manager.warning(
+                logger_name,
+                f"Could not fingerprint content for flow {flow.id}, skipping duplicate check: {str(e)}"
+            )
+            return False, None
+
+    duplicate = dedup_index.find_duplicate(flow.destination_account_id, fingerprint)
+    if duplicate:
+        log_manager.info(
+            logger_name,
+            f"Dropping duplicate of fingerprint {duplicate.id} for flow {flow.id}",
+        )
+        return True, None
+    return False, fingerprint
+
+
 @app.task
 def process_all_flows():
     """Process all active content flows."""
     db = SessionLocal()
     try:
         # Get all active flows
-        flows = db.query(ContentFlow).filter_by(is_active=True).all()
+        flows = config_snapshots.get().active_flows()
         now = datetime.now(timezone.utc)
         
+        # Trigger flows with the best expected yield first so they get the quota
+        quota = QuotaManager(db, Platform.YOUTUBE)
+        priorities = quota.flow_priorities(
+            flow.id for flow in flows
+            if flow.source_config and flow.source_config.platform == Platform.YOUTUBE
+        )
+        flows.sort(key=lambda flow: priorities.get(flow.id, 1.0), reverse=True)
+        
         for flow in flows:
             try:
                 # Get task ID for this flow
@@ -192,12 +287,20 @@ def process_all_flows():
                     (now - latest_content.created_at).total_seconds() / 60 >= source_interval_minutes
                 )
                 
+                if should_process and not _has_quota_budget(flow, quota, priorities):
+                    log_manager.info(
+                        logger_name,
+                        f"Skipping flow {flow.id} to preserve API quota for higher-yield flows"
+                    )
+                    continue
+                
                 if should_process:
                     # Check rate limit before triggering task
                     source_config = flow.source_config
-                    if source_config and source_config.rate_limit:
-                        rate_limit = source_config.rate_limit
-                        
+                    rate_limit = None
+                    if source_config.rate_limit_id:
+                        rate_limit = db.get(SourceRateLimit, source_config.rate_limit_id)
+                    if rate_limit:
                         if _should_reset_rate_limit(rate_limit):
                             reset_rate_limit(rate_limit, db)
                             
@@ -242,7 +345,7 @@ def source_and_edit(flow_id):
     """Source and edit content for a specific flow."""
     db = SessionLocal()
     try:
-        flow = db.query(ContentFlow).get(flow_id)
+        flow = config_snapshots.flow(flow_id)
         if not flow or not flow.is_active:
             log_manager.warning(
                 logger_name,
@@ -270,7 +373,7 @@ def source_and_edit(flow_id):
             
         source_adapter = adapter_class(
             content_flow_id=flow_id,
-            credentials=source_config.credentials,
+            credentials=thaw(source_config.credentials),
             discovery_parameters=source_config.discovery_parameters,
             sourcing_parameters=source_config.sourcing_parameters
         )
@@ -287,8 +390,10 @@ def source_and_edit(flow_id):
                 return
                 
             # Update rate limit after successful sourcing
-            if source_config.rate_limit:
-                update_rate_limit(source_config.rate_limit, db)
+            if source_config.rate_limit_id:
+                rate_limit = db.get(SourceRateLimit, source_config.rate_limit_id)
+                if rate_limit:
+                    update_rate_limit(rate_limit, db)
                 
         except Exception as e:
             log_manager.error(
@@ -299,25 +404,36 @@ def source_and_edit(flow_id):
 
         # Create pipeline for editing
         pipeline = TransformationPipeline(
-            flow.editing_pipeline.transformation_config,
+            thaw(flow.editing_pipeline.transformations),
             TransformationRegistry
         )
 
         # Process each content item
+        dedup_index = DedupIndex(db)
         for item in content_items:
+            queue_item = None
             try:
+                is_duplicate, fingerprint = _check_duplicate(flow, item, dedup_index)
+                if is_duplicate:
+                    db.execute(flow_stats_increment(flow.id, source_config.platform, duplicates=1))
+                    db.commit()
+                    continue
+
                 # Create queue item
                 queue_item = ContentQueueItem(
                     content_flow_id=flow.id,
                     source_platform=source_config.platform,
-                    source_url=item.url,
-                    source_data=item.metadata,
+                    source_url=item["url"],
+                    source_data=item,
+                    source_media_id=item.get("source_media_id"),
                     status=ContentStatus.EDITING
                 )
                 db.add(queue_item)
+                db.execute(flow_stats_increment(flow.id, source_config.platform, sourced=1))
                 db.commit()
                 
                 # Apply editing pipeline
+                edit_started = time.monotonic()
                 edited_content = pipeline.process(item)
                 
                 # Update queue item with edited content
@@ -325,7 +441,35 @@ def source_and_edit(flow_id):
                 queue_item.preview_path = edited_content.preview_path
                 queue_item.status = ContentStatus.READY
                 db.add(queue_item)
+                db.execute(flow_stats_increment(
+                    flow.id,
+                    source_config.platform,
+                    edit_seconds=time.monotonic() - edit_started,
+                    edited=1
+                ))
                 db.commit()
+
+                if fingerprint is not None:
+                    # Later items, including ones from this batch, are checked against it
+                    try:
+                        dedup_index.add(
+                            flow.destination_account_id,
+                            flow.id,
+                            source_config.platform,
+                            item.get("url"),
+                            item.get("source_media_id"),
+                            fingerprint
+                        )
+                    except Exception as e:
+                        # The item is READY; a missing fingerprint only weakens later checks
+                        db.rollback()
+                        log_manager.warning(
+                            logger_name,
+                            f"Could not store fingerprint for queue item {queue_item.id}: {str(e)}"
+                        )
+
+                # Encode platform renditions now so posting never waits on them
+                prerender_renditions.delay(queue_item.id)
                 
                 log_manager.info(
                     logger_name,
@@ -337,6 +481,7 @@ def source_and_edit(flow_id):
                     queue_item.status = ContentStatus.EDITING_ERROR
                     queue_item.error_log = {"error": str(e)}
                     db.add(queue_item)
+                    db.execute(flow_stats_increment(flow.id, source_config.platform, edit_errors=1))
                     db.commit()
                     
                 log_manager.error(
@@ -356,52 +501,40 @@ def source_and_edit(flow_id):
 @app.task
 def check_and_post_content():
     """Check queue items and post content if conditions are met."""
-    db = SessionLocal()
+    snapshot = config_snapshots.get()
     # Check if automatic posting is enabled
-    if db.query(GlobalConfig).first().nable_automatic_posting == False:
+    if not snapshot.global_config.enable_automatic_posting:
         log_manager.info(
             logger_name,
             "Automatic posting is disabled, skipping check"
         )
         return
+    db = SessionLocal()
     try:
         now = datetime.now(timezone.utc)
-        
-        # Get all ready items
+        stale_before = (now - timedelta(seconds=settings.POST_STALE_AFTER_SECONDS)).replace(tzinfo=None)
+
+        # Get all ready and approved items, and items whose posting worker died
         items = (
             db.query(ContentQueueItem)
-            .filter(ContentQueueItem.status == ContentStatus.READY)
+            .filter(or_(
+                ContentQueueItem.status.in_((ContentStatus.READY, ContentStatus.APPROVED)),
+                and_(ContentQueueItem.status == ContentStatus.POSTING, ContentQueueItem.updated_at < stale_before)
+            ))
             .all()
         )
 
-        # Filter items by schedule
-        items = [
-            item for item in items 
-            if item.content_flow and item.content_flow.is_active and 
-            _is_posting_time(item.content_flow.post_schedule, now)
-        ]
-
         for item in items:
-            # Get rate limit for the destination account
-            rate_limit = item.content_flow.destination_account.rate_limit
-            if rate_limit:
-                if _should_reset_rate_limit(rate_limit):
-                    reset_rate_limit(rate_limit, db)
-
-                # Skip if we've hit the daily limit
-                if rate_limit.current_action_count >= rate_limit.max_daily_actions:
-                    continue
-
-                # Skip if not enough time has passed since last post
-                if not check_time_between_actions(rate_limit):
-                    continue
+            # Filter items by schedule
+            flow = snapshot.flow(item.content_flow_id)
+            if not flow or not flow.is_active or not _is_posting_time(flow.post_schedule, now):
+                continue
 
-                update_rate_limit(rate_limit, db)
+            # Destination rate limits are checked per account in post_content
 
             # Check if approval requirement is met
-            global_approval_required = db.query(GlobalConfig).first().approval_required
-            approavl_required = global_approval_required or item.content_flow.approval_required
-            if approavl_required and not item.status == ContentStatus.APPROVED:
+            approval_required = snapshot.global_config.require_approval or flow.require_approval
+            if approval_required and item.status == ContentStatus.READY:
                 log_manager.info(
                     logger_name,
                     f"Skipping item {item.id} due to approval requirement"
@@ -424,9 +557,112 @@ def check_and_post_content():
         db.close()
 
 
+def _claim_rate_limit(account, db):
+    """Reserve one post on an account's rate limit, if it has room.
+
+    Returns:
+        True if the account may post now
+    """
+    if not account.rate_limit_id:
+        return True
+    rate_limit = db.get(DestinationRateLimit, account.rate_limit_id)
+    if not rate_limit:
+        return True
+    if _should_reset_rate_limit(rate_limit):
+        reset_rate_limit(rate_limit, db)
+    if rate_limit.max_daily_actions and rate_limit.current_action_count >= rate_limit.max_daily_actions:
+        return False
+    if not check_time_between_actions(rate_limit):
+        return False
+    update_rate_limit(rate_limit, db)
+    return True
+
+
+def _claim_destinations(item, flow, db):
+    """Create missing destination posts and claim the ones that may post now.
+
+    Rows are locked while they are claimed so overlapping post_content runs for
+    the same item never upload to the same destination twice. A POSTING row
+    whose worker died is claimed again after POST_STALE_AFTER_SECONDS; its
+    upload resumes from the persisted offset.
+    """
+    existing = {
+        post.destination_account_id: post
+        for post in db.query(DestinationPost)
+        .filter(DestinationPost.queue_item_id == item.id)
+        .with_for_update()
+    }
+    for account in flow.destinations:
+        if account.id not in existing:
+            post = DestinationPost(
+                queue_item_id=item.id,
+                destination_account_id=account.id,
+                status=DestinationPostStatus.PENDING,
+                attempts=0
+            )
+            db.add(post)
+            existing[account.id] = post
+
+    stale_before = (
+        datetime.now(timezone.utc) - timedelta(seconds=settings.POST_STALE_AFTER_SECONDS)
+    ).replace(tzinfo=None)
+    claimed = []
+    for account in flow.destinations:
+        post = existing[account.id]
+        if post.status == DestinationPostStatus.POSTED:
+            continue
+        if post.status == DestinationPostStatus.POSTING and post.updated_at and post.updated_at > stale_before:
+            continue
+        if post.status == DestinationPostStatus.FAILED and not _is_retryable(post):
+            continue
+        if not _claim_rate_limit(account, db):
+            log_manager.info(
+                logger_name,
+                f"Rate limit reached for account {account.id}, deferring item {item.id}"
+            )
+            continue
+        post.status = DestinationPostStatus.POSTING
+        post.attempts += 1
+        claimed.append((post, account))
+    if claimed:
+        item.status = ContentStatus.POSTING
+    db.commit()
+    return claimed
+
+
+def _postable_status(flow):
+    """Status that lets check_and_post_content pick an item of the flow up again."""
+    approval_required = config_snapshots.get().global_config.require_approval or flow.require_approval
+    return ContentStatus.APPROVED if approval_required else ContentStatus.READY
+
+
+def _is_retryable(post):
+    """Whether a destination post may still succeed on a later run."""
+    if post.status in (DestinationPostStatus.PENDING, DestinationPostStatus.POSTING):
+        return True
+    return post.status == DestinationPostStatus.FAILED and post.attempts < settings.POST_MAX_ATTEMPTS
+
+
+def _upload_to_destination(path, platform, credentials, metadata):
+    """Upload one file to one account. Runs in a fan-out worker thread."""
+    uploader = UploadRegistry.get_uploader(platform)
+    if not uploader:
+        raise ValueError(f"No uploader found for platform {platform}")
+    # Normally pre-rendered after editing, so this is a cache hit
+    path = RenditionCache().get(path, platform)
+    return uploader.upload_content(path, credentials, metadata=metadata)
+
+
 @app.task
 def post_content(content_id):
-    """Post a specific content item."""
+    """Post a content item to every destination of its flow.
+
+    Uploads to the flow's destination accounts run concurrently, each under its
+    own account's rate limit. Per-destination progress is tracked in
+    DestinationPost rows. The queue item is removed once every destination has
+    been posted to. The item is POSTING while uploads run; destinations held
+    back by a rate limit are retried by the next check_and_post_content run.
+    """
     db = SessionLocal()
     try:
         item = db.query(ContentQueueItem).get(content_id)
@@ -437,7 +673,7 @@ def post_content(content_id):
             )
             return
 
-        flow = item.content_flow
+        flow = config_snapshots.flow(item.content_flow_id)
         if not flow or not flow.is_active:
             log_manager.error(
                 logger_name,
@@ -445,53 +681,98 @@ def post_content(content_id):
             )
             return
 
-        # Get uploader for destination platform
-        uploader = UploadRegistry.get_uploader(flow.destination_account.platform)
-        if not uploader:
-            log_manager.error(
-                logger_name,
-                f"No uploader found for platform {flow.destination_account.platform}"
-            )
-            return
-
-        try:
-            # Upload the content
-            result = uploader.upload_content(
-                item.edited_content_path,
-                flow.destination_account.credentials
-            )
+        claimed = _claim_destinations(item, flow, db)
+        metadata = {"caption": (item.source_data or {}).get("title", "")}
+        credential_cache = CredentialCache()
+        credentials = {account.id: thaw(credential_cache.credentials_for(db, account)) for _, account in claimed}
+
+        # Worker threads get plain values only; the session stays on this thread
+        with ThreadPoolExecutor(
+            max_workers=max(min(len(claimed), settings.POST_FANOUT_WORKERS), 1),
+            thread_name_prefix="post-fanout"
+        ) as executor:
+            futures = [
+                (post, account, executor.submit(
+                    _upload_to_destination,
+                    item.edited_content_path,
+                    account.platform,
+                    credentials[account.id],
+                    metadata
+                ))
+                for post, account in claimed
+            ]
+
+            for post, account, future in futures:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    post.status = DestinationPostStatus.FAILED
+                    post.error = str(e)
+                    if not _is_retryable(post):
+                        # Only a destination that gave up counts; retried attempts are not errors yet
+                        db.execute(destination_stats_increment(flow.id, account.id, account.platform, post_errors=1))
+                    db.commit()
+                    log_manager.error(
+                        logger_name,
+                        f"Error posting content {content_id} to account {account.id}: {str(e)}"
+                    )
+                    continue
 
-            # Create posted item record with all necessary data
-            posted_item = PostedItem(
-                content_flow_id=flow.id,
-                source_platform=flow.source_config.platform,
-                source_url=item.source_url,
-                source_data=item.source_data,
-                edited_content_path=item.edited_content_path,
-                external_id=result.get('id'),  # Platform-specific post ID
-                performance_metrics={}  # Initialize empty metrics
-            )
-            db.add(posted_item)
-            
-            # Delete the queue item since it's now posted
-            db.delete(item)
-            db.commit()
+                posted_item = PostedItem(
+                    content_flow_id=flow.id,
+                    source_platform=flow.source_config.platform,
+                    source_url=item.source_url,
+                    source_data=item.source_data,
+                    edited_content_path=item.edited_content_path,
+                    source_media_id=item.source_media_id,
+                    destination_account_id=account.id,
+                    external_id=result.get('id'),  # Platform-specific post ID
+                    performance_metrics={},  # Initialize empty metrics
+                    metrics_poll_count=0,
+                    metrics_next_poll_at=(
+                        datetime.now(timezone.utc).replace(tzinfo=None)
+                        + timedelta(seconds=settings.METRICS_POLL_BASE_SECONDS)
+                    )
+                )
+                db.add(posted_item)
+                db.flush()
+                post.status = DestinationPostStatus.POSTED
+                post.external_id = result.get('id')
+                post.posted_item_id = posted_item.id
+                post.posted_at = datetime.now(timezone.utc).replace(tzinfo=None)
+                post.error = None
+                db.execute(destination_stats_increment(
+                    flow.id,
+                    account.id,
+                    account.platform,
+                    latency_seconds=(post.posted_at - item.created_at).total_seconds() if item.created_at else None,
+                    posted=1
+                ))
+                db.commit()
 
-            log_manager.info(
-                logger_name,
-                f"Successfully posted content {content_id} to {flow.destination_account.platform}"
-            )
+                log_manager.info(
+                    logger_name,
+                    f"Successfully posted content {content_id} to account {account.id} on {account.platform}"
+                )
 
-        except Exception as e:
+        posts = db.query(DestinationPost).filter(DestinationPost.queue_item_id == item.id).all()
+        if posts and all(post.status == DestinationPostStatus.POSTED for post in posts):
+            # Delete the queue item since it's now posted everywhere
+            db.delete(item)
+        elif not any(_is_retryable(post) for post in posts):
             item.status = ContentStatus.POSTING_ERROR
-            item.error_log = {"error": str(e)}
-            db.add(item)
-            db.commit()
-            
-            log_manager.error(
-                logger_name,
-                f"Error posting content {content_id}: {str(e)}"
-            )
+            item.error_log = {
+                "destinations": {
+                    str(post.destination_account_id): post.error
+                    for post in posts if post.status == DestinationPostStatus.FAILED
+                }
+            }
+        elif item.status == ContentStatus.POSTING and not any(
+            post.status == DestinationPostStatus.POSTING for post in posts
+        ):
+            # Remaining destinations wait for the next check_and_post_content run
+            item.status = _postable_status(flow)
+        db.commit()
 
     except Exception as e:
         log_manager.error(
@@ -500,3 +781,89 @@ def post_content(content_id):
         )
     finally:
         db.close()
+
+
+@app.task
+def prerender_renditions(content_id):
+    """Encode the renditions an edited item needs for its flow's destination platforms."""
+    db = SessionLocal()
+    try:
+        item = db.query(ContentQueueItem).get(content_id)
+        flow = config_snapshots.flow(item.content_flow_id) if item else None
+        if not item or not item.edited_content_path or not flow:
+            return
+        platforms = {account.platform for account in flow.destinations}
+        RenditionCache().prerender(item.edited_content_path, platforms)
+    except Exception as e:
+        log_manager.error(
+            logger_name,
+            f"Error in prerender_renditions for content {content_id}: {str(e)}"
+        )
+    finally:
+        db.close()
+
+
+@app.task
+def collect_storage_garbage():
+    """Delete unreferenced media from storage, one bounded slice per run."""
+    db = SessionLocal()
+    try:
+        report = StorageGarbageCollector(db).run()
+        return report
+    except Exception as e:
+        log_manager.error(
+            logger_name,
+            f"Error in collect_storage_garbage: {str(e)}"
+        )
+    finally:
+        db.close()
+
+
+@app.task
+def poll_post_metrics():
+    """Fetch engagement metrics for the posted items that are due for a poll."""
+    db = SessionLocal()
+    try:
+        return MetricsPoller(db).poll()
+    except Exception as e:
+        log_manager.error(
+            logger_name,
+            f"Error in poll_post_metrics: {str(e)}"
+        )
+    finally:
+        db.close()
+
+
+@app.task
+def downsample_post_metrics():
+    """Thin out old metric samples to hourly and daily buckets."""
+    db = SessionLocal()
+    try:
+        return MetricsPoller(db).downsample()
+    except Exception as e:
+        log_manager.error(
+            logger_name,
+            f"Error in downsample_post_metrics: {str(e)}"
+        )
+    finally:
+        db.close()
+
+
+@app.task
+def rebuild_stats(days=None):
+    """Rebuild the daily stats of the last ``days`` days (default STATS_REBUILD_DAYS).
+
+    Run once with a large ``days`` to backfill history from before the rollups.
+    """
+    db = SessionLocal()
+    try:
+        days = days or settings.STATS_REBUILD_DAYS
+        end = datetime.now(timezone.utc).date()
+        return rebuild_daily_stats(db, end - timedelta(days=days - 1), end)
+    except Exception as e:
+        log_manager.error(
+            logger_name,
+            f"Error in rebuild_stats: {str(e)}"
+        )
+    finally:
+        db.close()
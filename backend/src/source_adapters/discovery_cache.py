@@ -0,0 +1,149 @@
+"""Persistent cache for source discovery results."""
+from typing import Any, Dict, Iterable, Optional
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+from src.database.models import DiscoveryCacheEntry, Platform
+from src.logging.log_manager import LogManager
+from config import Settings
+
+settings = Settings()
+log_manager = LogManager()
+logger_name = "discovery-cache"
+
+# Cacheable fields mapped to their positive TTL in seconds
+CACHE_FIELDS = {
+    "snippet": settings.DISCOVERY_SNIPPET_TTL,
+    "statistics": settings.DISCOVERY_STATISTICS_TTL,
+    "most_replayed": settings.DISCOVERY_MOST_REPLAYED_TTL,
+}
+
+
+class CacheMiss(Exception):
+    """Raised when a field is not cached or has expired."""
+    pass
+
+
+def _utcnow() -> datetime:
+    """Current UTC time as a naive datetime, matching the DateTime columns."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class DiscoveryCache:
+    """Video-level cache for discovery data with per-field TTLs.
+
+    Values are stored per (platform, video_id). Storing None records a negative
+    entry, which is kept for DISCOVERY_NEGATIVE_TTL so that rejected videos are
+    not fetched again on every sweep.
+    """
+
+    def __init__(self, db: Session, platform: Platform):
+        self.db = db
+        self.platform = platform
+
+    def _is_fresh(self, entry: DiscoveryCacheEntry, field: str, now: datetime) -> bool:
+        cached_at = getattr(entry, f"{field}_cached_at")
+        if cached_at is None:
+            return False
+        ttl = CACHE_FIELDS[field] if getattr(entry, field) is not None else settings.DISCOVERY_NEGATIVE_TTL
+        return now - cached_at < timedelta(seconds=ttl)
+
+    def get(self, video_id: str, field: str) -> Optional[Any]:
+        """Get a cached field for a video.
+
+        Args:
+            video_id: Platform video ID
+            field: One of CACHE_FIELDS
+
+        Returns:
+            Cached value, or None for a negative entry
+
+        Raises:
+            CacheMiss: If the field is not cached or has expired
+        """
+        hits = self.get_many([video_id], field)
+        if video_id not in hits:
+            raise CacheMiss(f"{field} not cached for {video_id}")
+        return hits[video_id]
+
+    def get_many(self, video_ids: Iterable[str], field: str) -> Dict[str, Optional[Any]]:
+        """Get a cached field for several videos in one query.
+
+        Args:
+            video_ids: Platform video IDs
+            field: One of CACHE_FIELDS
+
+        Returns:
+            Dictionary of video ID to cached value for fresh entries only. Negative
+            entries are included with a value of None.
+        """
+        if field not in CACHE_FIELDS:
+            raise ValueError(f"Unknown discovery cache field: {field}")
+        video_ids = list(video_ids)
+        if not video_ids:
+            return {}
+
+        entries = (
+            self.db.query(DiscoveryCacheEntry)
+            .filter(
+                DiscoveryCacheEntry.platform == self.platform,
+                DiscoveryCacheEntry.video_id.in_(video_ids)
+            )
+            .all()
+        )
+        now = _utcnow()
+        return {
+            entry.video_id: getattr(entry, field)
+            for entry in entries
+            if self._is_fresh(entry, field, now)
+        }
+
+    def set(self, video_id: str, field: str, value: Optional[Any]) -> None:
+        """Store a field for a video. A value of None stores a negative entry."""
+        self.set_many(field, {video_id: value})
+
+    def set_many(self, field: str, values: Dict[str, Optional[Any]]) -> None:
+        """Store a field for several videos with a single upsert.
+
+        Args:
+            field: One of CACHE_FIELDS
+            values: Dictionary of video ID to value (None for negative entries)
+        """
+        if field not in CACHE_FIELDS:
+            raise ValueError(f"Unknown discovery cache field: {field}")
+        if not values:
+            return
+
+        now = _utcnow()
+        rows = [
+            {
+                "platform": self.platform,
+                "video_id": video_id,
+                field: value,
+                f"{field}_cached_at": now,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for video_id, value in values.items()
+        ]
+        statement = insert(DiscoveryCacheEntry).values(rows)
+        statement = statement.on_conflict_do_update(
+            constraint="uq_discovery_cache_platform_video",
+            set_={
+                field: statement.excluded[field],
+                f"{field}_cached_at": statement.excluded[f"{field}_cached_at"],
+                "updated_at": now,
+            }
+        )
+        try:
+            self.db.execute(statement)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            # The cache is an optimisation, so a failed write must not fail discovery
+            log_manager.error(
+                logger_name,
+                "Failed to write discovery cache",
+                context={"field": field, "count": len(values)},
+                error=e
+            )
@@ -0,0 +1,170 @@
+"""Concurrent video clip downloads with yt-dlp."""
+from typing import Any, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+import yt_dlp
+from yt_dlp.utils import download_range_func
+from src.storage.media_store import MediaStoreError, SourceMediaStore
+from src.logging.log_manager import LogManager
+from config import Settings
+
+settings = Settings()
+log_manager = LogManager()
+logger_name = "download-manager"
+
+# Shared by all adapters in the process so the concurrency bound is global
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+class DownloadError(Exception):
+    """Raised when a clip cannot be downloaded."""
+    pass
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.MAX_CONCURRENT_DOWNLOADS,
+                thread_name_prefix="clip-download"
+            )
+        return _executor
+
+
+class DownloadManager:
+    """Downloads clips of a platform's videos through a bounded worker pool.
+
+    Clips are kept in the shared SourceMediaStore, so flows requesting the same
+    clip reuse one download. By default cuts are made at the nearest keyframes
+    with stream copy, which avoids a re-encode; enable precise_cuts when nothing
+    downstream will trim the clip.
+    """
+
+    def __init__(
+        self,
+        platform: str,
+        quality: str = "1080p",
+        precise_cuts: bool = False,
+        store: Optional[SourceMediaStore] = None
+    ):
+        self.platform = platform
+        self.max_height = int(quality.rstrip("p"))
+        self.precise_cuts = precise_cuts
+        self.store = store or SourceMediaStore()
+
+    def _options(self, output_template: str, start_time: int, end_time: int) -> Dict[str, Any]:
+        return {
+            'format': (
+                f'bestvideo[height<={self.max_height}][ext=mp4]+bestaudio[ext=m4a]'
+                f'/best[height<={self.max_height}][ext=mp4]/best'
+            ),
+            'outtmpl': output_template,
+            'download_ranges': download_range_func(None, [(start_time / 1000, end_time / 1000)]),
+            # Keyframe-accurate cuts force a re-encode around the cut points
+            'force_keyframes_at_cuts': self.precise_cuts,
+            'concurrent_fragment_downloads': settings.DOWNLOAD_FRAGMENT_CONCURRENCY,
+            'postprocessors': [{
+                'key': 'FFmpegVideoRemuxer',
+                'preferedformat': 'mp4',
+            }],
+            'quiet': True,
+            'noprogress': True,
+        }
+
+    def _download(self, url: str, output_dir: str, video_id: str, start_time: int, end_time: int) -> str:
+        """Run yt-dlp for one clip and return the path of the produced file."""
+        output_template = os.path.join(output_dir, f"{video_id}.%(ext)s")
+        with yt_dlp.YoutubeDL(self._options(output_template, start_time, end_time)) as ydl:
+            try:
+                info = ydl.extract_info(url, download=True)
+            except yt_dlp.utils.DownloadError as e:
+                raise DownloadError(f"Failed to download video: {str(e)}") from e
+
+            # After remuxing, the final path is reported on the requested download
+            requested = info.get("requested_downloads") or [{}]
+            downloaded_file = requested[0].get("filepath") or ydl.prepare_filename(info)
+            if not os.path.exists(downloaded_file):
+                raise DownloadError("Downloaded file not found")
+            return downloaded_file
+
+    def download_clip(self, url: str, video_id: str, start_time: int, end_time: int) -> Dict[str, Any]:
+        """Download a single clip, or reuse it if it is already stored.
+
+        Args:
+            url: Video page URL
+            video_id: Platform video ID
+            start_time: Clip start in milliseconds
+            end_time: Clip end in milliseconds
+
+        Returns:
+            Dictionary with file_path, duration (seconds), video_id, source_media_id
+            and source_media_key
+
+        Raises:
+            DownloadError: If the download fails or produces no file
+        """
+        try:
+            stored = self.store.fetch(
+                self.platform,
+                video_id,
+                (start_time, end_time),
+                "mp4",
+                lambda output_dir: self._download(url, output_dir, video_id, start_time, end_time),
+                variant=f"{self.max_height}p:{'precise' if self.precise_cuts else 'keyframe'}"
+            )
+        except MediaStoreError as e:
+            raise DownloadError(str(e)) from e
+
+        log_manager.info(
+            logger_name,
+            "Video clip available",
+            context={
+                "video_id": video_id,
+                "start_time": start_time,
+                "end_time": end_time,
+                "file": stored["file_path"],
+                "precise_cuts": self.precise_cuts
+            }
+        )
+        return {
+            "file_path": stored["file_path"],
+            "duration": (end_time - start_time) / 1000,
+            "video_id": video_id,
+            "source_media_id": stored["source_media_id"],
+            "source_media_key": stored["source_media_key"]
+        }
+
+    def download_clips(self, url: str, video_id: str, time_ranges: List[Tuple[int, int]]) -> List[Dict[str, Any]]:
+        """Download several clips of one video concurrently.
+
+        Failed clips are logged and left out of the result so one bad range
+        does not discard the others.
+
+        Args:
+            url: Video page URL
+            video_id: Platform video ID
+            time_ranges: List of (start, end) times in milliseconds
+
+        Returns:
+            Successfully downloaded clips, in the order of time_ranges
+        """
+        futures = [
+            _get_executor().submit(self.download_clip, url, video_id, start_time, end_time)
+            for start_time, end_time in time_ranges
+        ]
+
+        clips = []
+        for (start_time, end_time), future in zip(time_ranges, futures):
+            try:
+                clips.append(future.result())
+            except Exception as e:
+                log_manager.error(
+                    logger_name,
+                    "Error downloading video clip",
+                    context={"video_id": video_id, "start_time": start_time, "end_time": end_time},
+                    error=e
+                )
+        return clips
@@ -0,0 +1,149 @@
+"""Heatmap analysis for YouTube most replayed data.
+
+The most replayed heatmap is a list of markers, each with a start time and a
+normalised intensity score. These helpers convert the markers into NumPy arrays
+once and answer range queries over them without rescanning the marker list.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+
+
+def markers_to_arrays(markers: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Convert heatmap markers into sorted start time and intensity arrays.
+
+    Args:
+        markers: Markers from the most replayed data, each containing
+            startMillis and intensityScoreNormalized
+
+    Returns:
+        Tuple of (start times in milliseconds, intensity scores), sorted by start time
+    """
+    count = len(markers)
+    starts = np.fromiter((int(m["startMillis"]) for m in markers), dtype=np.int64, count=count)
+    intensities = np.fromiter(
+        (float(m.get("intensityScoreNormalized", 0)) for m in markers),
+        dtype=np.float64,
+        count=count
+    )
+    order = np.argsort(starts, kind="stable")
+    return starts[order], intensities[order]
+
+
+def _build_sparse_table(values: np.ndarray) -> List[np.ndarray]:
+    """Build a sparse table for O(1) range maximum queries.
+
+    Level k holds the maximum of every run of 2**k consecutive values.
+    """
+    table = [values]
+    width = 1
+    while 2 * width <= len(values):
+        previous = table[-1]
+        table.append(np.maximum(previous[:-width], previous[width:]))
+        width *= 2
+    return table
+
+
+def _range_max(table: List[np.ndarray], lo: np.ndarray, hi: np.ndarray, default: float = 0.0) -> np.ndarray:
+    """Maximum of values[lo:hi] for each pair of bounds.
+
+    Empty ranges evaluate to ``default``.
+    """
+    lengths = hi - lo
+    result = np.full(len(lo), default, dtype=np.float64)
+    non_empty = lengths > 0
+    if not non_empty.any():
+        return result
+
+    levels = np.zeros(len(lo), dtype=np.int64)
+    levels[non_empty] = np.floor(np.log2(lengths[non_empty])).astype(np.int64)
+    for level in np.unique(levels[non_empty]):
+        mask = non_empty & (levels == level)
+        row = table[level]
+        result[mask] = np.maximum(row[lo[mask]], row[hi[mask] - (1 << level)])
+    return result
+
+
+def decoration_intensities(
+    starts: np.ndarray,
+    intensities: np.ndarray,
+    decorations: List[Dict[str, Any]]
+) -> np.ndarray:
+    """Compute the maximum marker intensity inside each decoration's time range.
+
+    A marker belongs to a decoration when its start time falls within
+    [visibleTimeRangeStartMillis, visibleTimeRangeEndMillis].
+
+    Args:
+        starts: Sorted marker start times from markers_to_arrays
+        intensities: Marker intensities from markers_to_arrays
+        decorations: timedMarkerDecorations from the most replayed data
+
+    Returns:
+        Array with the maximum intensity for each decoration (0 if no markers fall in range)
+    """
+    if not decorations:
+        return np.zeros(0, dtype=np.float64)
+
+    range_starts = np.array([int(d["visibleTimeRangeStartMillis"]) for d in decorations], dtype=np.int64)
+    range_ends = np.array([int(d["visibleTimeRangeEndMillis"]) for d in decorations], dtype=np.int64)
+    if len(starts) == 0:
+        return np.zeros(len(decorations), dtype=np.float64)
+
+    lo = np.searchsorted(starts, range_starts, side="left")
+    hi = np.searchsorted(starts, range_ends, side="right")
+    return _range_max(_build_sparse_table(intensities), lo, hi)
+
+
+def top_windows(
+    starts: np.ndarray,
+    intensities: np.ndarray,
+    window_ms: int,
+    count: int = 1,
+    duration_ms: Optional[int] = None
+) -> List[Tuple[int, int, float]]:
+    """Find the highest-intensity, non-overlapping windows of a fixed length.
+
+    Every marker start is a candidate window start. A window is scored by the
+    mean intensity of the markers starting inside it, and windows are picked
+    greedily by score while skipping any that overlap an earlier pick.
+
+    Args:
+        starts: Sorted marker start times from markers_to_arrays
+        intensities: Marker intensities from markers_to_arrays
+        window_ms: Length of each window in milliseconds
+        count: Maximum number of windows to return
+        duration_ms: Video duration in milliseconds (defaults to the last marker start)
+
+    Returns:
+        List of (start_ms, end_ms, score) tuples, highest score first
+    """
+    if len(starts) == 0 or count < 1 or window_ms <= 0:
+        return []
+
+    if duration_ms is None:
+        duration_ms = int(starts[-1])
+    if duration_ms <= window_ms:
+        return [(0, int(duration_ms), float(intensities.mean()))]
+
+    # Clamp candidates so every window fits inside the video
+    window_starts = np.unique(np.clip(starts, 0, duration_ms - window_ms))
+    window_ends = window_starts + window_ms
+
+    prefix = np.concatenate(([0.0], np.cumsum(intensities)))
+    lo = np.searchsorted(starts, window_starts, side="left")
+    hi = np.searchsorted(starts, window_ends, side="left")
+    covered = hi - lo
+    scores = np.where(covered > 0, (prefix[hi] - prefix[lo]) / np.maximum(covered, 1), 0.0)
+
+    selected_starts = np.empty(0, dtype=np.int64)
+    windows = []
+    for index in np.argsort(-scores, kind="stable"):
+        start = window_starts[index]
+        if np.any(np.abs(selected_starts - start) < window_ms):
+            continue
+        selected_starts = np.append(selected_starts, start)
+        windows.append((int(start), int(window_ends[index]), float(scores[index])))
+        if len(windows) == count:
+            break
+
+    return windows
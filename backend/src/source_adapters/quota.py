@@ -0,0 +1,299 @@
+"""Daily API quota accounting for source platforms."""
+from typing import Any, Dict, Iterable, List, Optional
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+import hashlib
+from sqlalchemy import and_, func, literal, select
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+from src.database.models import (
+    ApiQuotaBudget,
+    ApiQuotaUsage,
+    ContentQueueItem,
+    Platform,
+    PostedItem,
+)
+from src.logging.log_manager import LogManager
+from config import Settings
+
+settings = Settings()
+log_manager = LogManager()
+logger_name = "quota-manager"
+
+# YouTube Data API v3 unit cost per method
+# https://developers.google.com/youtube/v3/determine_quota_cost
+YOUTUBE_METHOD_COSTS = {
+    "channels.list": 1,
+    "playlists.list": 1,
+    "playlistItems.list": 1,
+    "videos.list": 1,
+    "commentThreads.list": 1,
+    "captions.list": 50,
+    "search.list": 100,
+    "videos.insert": 1600,
+}
+
+# The YouTube quota resets at midnight Pacific time
+YOUTUBE_QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+
+# Flows at or above this priority may spend ahead of the daily pace and use the reserve
+HIGH_PRIORITY = 0.5
+
+
+class QuotaManager:
+    """Tracks API quota spend per key and decides which flows may spend it.
+
+    Spend is recorded per (API key, quota day, content flow). Low-priority flows
+    are held to an even pace across the day, so they are shed first and the
+    remaining budget is left to flows that have historically yielded content.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        platform: Platform = Platform.YOUTUBE,
+        daily_quota: int = settings.YOUTUBE_DAILY_QUOTA,
+        method_costs: Dict[str, int] = YOUTUBE_METHOD_COSTS,
+        quota_timezone: ZoneInfo = YOUTUBE_QUOTA_TIMEZONE
+    ):
+        self.db = db
+        self.platform = platform
+        self.daily_quota = daily_quota
+        self.method_costs = method_costs
+        self.quota_timezone = quota_timezone
+
+    @staticmethod
+    def key_id(api_key: str) -> str:
+        """Stable identifier for an API key that does not reveal the key."""
+        return hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+    def cost(self, method: str, calls: int = 1) -> int:
+        """Unit cost of calling an API method ``calls`` times."""
+        if method not in self.method_costs:
+            raise ValueError(f"Unknown quota cost for method: {method}")
+        return self.method_costs[method] * calls
+
+    def quota_day(self, now: Optional[datetime] = None) -> date:
+        """The quota day that ``now`` (UTC) falls into."""
+        now = now or datetime.now(timezone.utc)
+        return now.astimezone(self.quota_timezone).date()
+
+    def _day_fraction_elapsed(self, now: datetime) -> float:
+        local_now = now.astimezone(self.quota_timezone)
+        day_start = datetime.combine(local_now.date(), time.min, tzinfo=self.quota_timezone)
+        return min(max((local_now - day_start).total_seconds() / 86400, 0.0), 1.0)
+
+    def _reset_at(self, now: datetime) -> datetime:
+        local_now = now.astimezone(self.quota_timezone)
+        next_day = datetime.combine(local_now.date() + timedelta(days=1), time.min, tzinfo=self.quota_timezone)
+        return next_day.astimezone(timezone.utc)
+
+    def _usage(self, api_key: str, now: datetime) -> Dict[str, Any]:
+        spent, exhausted_at = (
+            self.db.query(
+                func.coalesce(func.sum(ApiQuotaUsage.units), 0),
+                func.max(ApiQuotaUsage.exhausted_at)
+            )
+            .filter(
+                ApiQuotaUsage.platform == self.platform,
+                ApiQuotaUsage.api_key_id == self.key_id(api_key),
+                ApiQuotaUsage.quota_day == self.quota_day(now)
+            )
+            .one()
+        )
+        return {"spent": int(spent), "exhausted": exhausted_at is not None}
+
+    def _allowance(self, priority: float, now: datetime) -> float:
+        """Units a flow with the given priority may have spent in total by ``now``.
+
+        High-priority flows may spend the whole quota. Everyone else is limited to
+        the pace line (quota * fraction of the day elapsed) and may never dip into
+        the reserve.
+        """
+        if priority >= HIGH_PRIORITY:
+            return self.daily_quota
+        reserve = self.daily_quota * settings.YOUTUBE_QUOTA_RESERVE
+        return (self.daily_quota - reserve) * self._day_fraction_elapsed(now)
+
+    def can_spend(self, api_key: str, units: int, priority: float = 1.0) -> bool:
+        """Check whether a flow with the given priority may spend ``units`` now.
+
+        A planning check only; spend is reserved atomically by try_charge.
+
+        Args:
+            api_key: API key the units would be charged to
+            units: Number of units to spend
+            priority: Flow priority in [0, 1], see flow_priorities
+        """
+        now = datetime.now(timezone.utc)
+        usage = self._usage(api_key, now)
+        if usage["exhausted"] or usage["spent"] + units > self.daily_quota:
+            return False
+        return usage["spent"] + units <= self._allowance(priority, now)
+
+    def try_charge(self, api_key: str, method: str, content_flow_id: int, priority: float = 1.0) -> bool:
+        """Charge one call of ``method`` if the flow may spend its cost now.
+
+        The budget check and the charge are one statement: the key's daily
+        budget row is only incremented while the total stays within the flow's
+        allowance, and the per-flow usage row is written from the budget
+        update's RETURNING, so concurrent workers can never overspend.
+
+        Returns:
+            True if the units were charged and the request may be sent
+        """
+        units = self.cost(method)
+        now = datetime.now(timezone.utc)
+        limit = min(self.daily_quota, self._allowance(priority, now))
+        if units > limit:
+            return False
+        key_id = self.key_id(api_key)
+        quota_day = self.quota_day(now)
+
+        budget = insert(ApiQuotaBudget).values(
+            platform=self.platform, api_key_id=key_id, quota_day=quota_day, units=units
+        )
+        budget = budget.on_conflict_do_update(
+            constraint="uq_api_quota_budget_key_day",
+            set_={"units": ApiQuotaBudget.units + budget.excluded.units, "updated_at": func.now()},
+            where=and_(
+                ApiQuotaBudget.exhausted_at.is_(None),
+                ApiQuotaBudget.units + budget.excluded.units <= limit
+            )
+        ).returning(ApiQuotaBudget.id).cte("budget")
+
+        usage = insert(ApiQuotaUsage).from_select(
+            ["platform", "api_key_id", "quota_day", "content_flow_id", "units", "request_count"],
+            select(
+                literal(self.platform, ApiQuotaUsage.platform.type),
+                literal(key_id),
+                literal(quota_day),
+                literal(content_flow_id),
+                literal(units),
+                literal(1)
+            ).select_from(budget)
+        )
+        usage = usage.on_conflict_do_update(
+            constraint="uq_api_quota_usage_key_day_flow",
+            set_={
+                "units": ApiQuotaUsage.units + usage.excluded.units,
+                "request_count": ApiQuotaUsage.request_count + usage.excluded.request_count,
+                "updated_at": func.now(),
+            }
+        ).returning(ApiQuotaUsage.id)
+
+        charged = self.db.execute(usage).first() is not None
+        self.db.commit()
+        return charged
+
+    def mark_exhausted(self, api_key: str, content_flow_id: int) -> None:
+        """Record that the platform rejected a request because the quota ran out."""
+        now = datetime.now(timezone.utc)
+        budget = insert(ApiQuotaBudget).values(
+            platform=self.platform,
+            api_key_id=self.key_id(api_key),
+            quota_day=self.quota_day(now),
+            units=0,
+            exhausted_at=now.replace(tzinfo=None)
+        )
+        self.db.execute(budget.on_conflict_do_update(
+            constraint="uq_api_quota_budget_key_day",
+            set_={"exhausted_at": budget.excluded.exhausted_at}
+        ))
+        statement = insert(ApiQuotaUsage).values(
+            platform=self.platform,
+            api_key_id=self.key_id(api_key),
+            quota_day=self.quota_day(now),
+            content_flow_id=content_flow_id,
+            units=0,
+            request_count=0,
+            exhausted_at=now.replace(tzinfo=None)
+        )
+        statement = statement.on_conflict_do_update(
+            constraint="uq_api_quota_usage_key_day_flow",
+            set_={"exhausted_at": statement.excluded.exhausted_at}
+        )
+        self.db.execute(statement)
+        self.db.commit()
+        log_manager.warning(
+            logger_name,
+            "API quota exhausted",
+            context={"platform": self.platform, "api_key_id": self.key_id(api_key)}
+        )
+
+    def flow_priorities(self, flow_ids: Iterable[int]) -> Dict[int, float]:
+        """Rank flows by expected yield: content items produced per quota unit.
+
+        Yield is measured over the last QUOTA_YIELD_WINDOW_DAYS and normalised so
+        the best flow has priority 1.0. Flows without spend history get 1.0 so
+        new flows are always tried.
+        """
+        flow_ids = list(flow_ids)
+        if not flow_ids:
+            return {}
+
+        since = datetime.now(timezone.utc) - timedelta(days=settings.QUOTA_YIELD_WINDOW_DAYS)
+        units = dict(
+            self.db.query(ApiQuotaUsage.content_flow_id, func.sum(ApiQuotaUsage.units))
+            .filter(
+                ApiQuotaUsage.platform == self.platform,
+                ApiQuotaUsage.content_flow_id.in_(flow_ids),
+                ApiQuotaUsage.quota_day >= self.quota_day(since)
+            )
+            .group_by(ApiQuotaUsage.content_flow_id)
+            .all()
+        )
+        produced = {flow_id: 0 for flow_id in flow_ids}
+        # Posted items leave the queue, so both tables count towards the yield
+        for model in (ContentQueueItem, PostedItem):
+            for flow_id, count in (
+                self.db.query(model.content_flow_id, func.count(model.id))
+                .filter(model.content_flow_id.in_(flow_ids), model.created_at >= since.replace(tzinfo=None))
+                .group_by(model.content_flow_id)
+            ):
+                produced[flow_id] += count
+
+        yields = {
+            flow_id: produced[flow_id] / units[flow_id]
+            for flow_id in flow_ids
+            if units.get(flow_id)
+        }
+        best = max(yields.values(), default=0)
+        return {
+            flow_id: (yields[flow_id] / best if best else 0.0) if flow_id in yields else 1.0
+            for flow_id in flow_ids
+        }
+
+    def metrics(self) -> List[Dict[str, Any]]:
+        """Today's spend and remaining budget for every API key that has been used."""
+        now = datetime.now(timezone.utc)
+        rows = (
+            self.db.query(
+                ApiQuotaUsage.api_key_id,
+                func.sum(ApiQuotaUsage.units),
+                func.sum(ApiQuotaUsage.request_count),
+                func.max(ApiQuotaUsage.exhausted_at)
+            )
+            .filter(
+                ApiQuotaUsage.platform == self.platform,
+                ApiQuotaUsage.quota_day == self.quota_day(now)
+            )
+            .group_by(ApiQuotaUsage.api_key_id)
+            .all()
+        )
+        reserve = self.daily_quota * settings.YOUTUBE_QUOTA_RESERVE
+        paced_allowance = int((self.daily_quota - reserve) * self._day_fraction_elapsed(now))
+        return [
+            {
+                "platform": self.platform.value,
+                "api_key_id": api_key_id,
+                "daily_quota": self.daily_quota,
+                "spent": int(spent),
+                "remaining": 0 if exhausted_at else max(self.daily_quota - int(spent), 0),
+                "request_count": int(request_count),
+                "paced_allowance": paced_allowance,
+                "exhausted": exhausted_at is not None,
+                "resets_at": self._reset_at(now),
+            }
+            for api_key_id, spent, request_count, exhausted_at in rows
+        ]
@@ -1,101 +1,368 @@
-from typing import Dict, Any, List
-import praw
+from typing import Dict, Any, AsyncIterator, List, Set, Tuple
+from datetime import datetime, timezone
+import asyncio
+import random
+from sqlalchemy.dialects.postgresql import insert
 from src.source_adapters.base import SourceAdapter
-from src.core.config import Settings
-from src.registry import SourceRegistry
-from src.database.models import Platform
+from src.source_adapters.registry import SourceRegistry
+from src.source_adapters.reddit_client import RedditAPIError, RedditClient, stream_listings
+from src.source_adapters.reddit_media import RedditMediaDownloader
+from src.source_adapters.types import ProcessedVideo
+from src.database.models import (
+    ContentQueueItem,
+    ContentSelectionStrategy,
+    Platform,
+    PostedItem,
+    SourceCursor,
+)
+from src.database.schemas import (
+    RedditDiscoveryParameters,
+    RedditSourcingParameters,
+)
+from src.database.session import SessionLocal
+from src.logging.log_manager import LogManager
+from config import Settings
 
 settings = Settings()
+log_manager = LogManager()
+logger_name = "reddit-adapter"
+
+# Strategies that read the chronological /new listing and can resume from a cursor
+CHRONOLOGICAL_STRATEGIES = (ContentSelectionStrategy.MOST_RECENT, ContentSelectionStrategy.NON_SELECTIVE)
+
+
+class RedditError(Exception):
+    """Base exception for Reddit adapter errors."""
+    pass
+
+
+class RedditContentError(RedditError):
+    """Raised when there's an error discovering or processing content."""
+    pass
 
 
 @SourceRegistry.register(Platform.REDDIT)
 class RedditAdapter(SourceAdapter):
-    def __init__(self):
-        self.reddit = None
-        self.config = None
-
-    def auth(self, config: Dict[str, Any]) -> None:
-        """Configure the Reddit adapter with API credentials and parameters"""
-        self.config = config
-        self.reddit = praw.Reddit(
-            client_id=settings.REDDIT_CLIENT_ID,
-            client_secret=settings.REDDIT_CLIENT_SECRET,
-            user_agent=settings.REDDIT_USER_AGENT,
-        )
+    """Sources media submissions from subreddits and users.
+
+    With chronological strategies each (flow, subreddit or user) keeps a
+    high-water mark in a SourceCursor row, and runs request only newer
+    submissions with ``before=`` pagination, so steady-state runs handle only
+    the delta. Ranked listings are not chronological, so they are scanned in
+    full and submissions the flow already sourced are skipped instead.
+    """
+
+    def __init__(
+        self,
+        content_flow_id: int,
+        credentials: Dict[str, str],
+        discovery_parameters: RedditDiscoveryParameters,
+        sourcing_parameters: RedditSourcingParameters
+    ):
+        self.content_flow_id = content_flow_id
+        self.discovery_parameters: RedditDiscoveryParameters = discovery_parameters
+        self.sourcing_parameters: RedditSourcingParameters = sourcing_parameters
+        # (fullname, created_utc, qualifies) per source of the last chronological discovery
+        self._seen: Dict[str, List[Tuple[str, float, bool]]] = {}
+        credentials = credentials or {}
+        self.credentials = {
+            "client_id": credentials.get("client_id", settings.REDDIT_CLIENT_ID),
+            "client_secret": credentials.get("client_secret", settings.REDDIT_CLIENT_SECRET),
+            "user_agent": credentials.get("user_agent", settings.REDDIT_USER_AGENT),
+        }
+        if not self.credentials["client_id"] or not self.credentials["client_secret"]:
+            raise RedditError("Reddit client_id and client_secret are required")
+
+    @property
+    def _chronological(self) -> bool:
+        return self.discovery_parameters.selection_strategy in CHRONOLOGICAL_STRATEGIES
 
-    def fetch_content(self) -> List[Dict[str, Any]]:
-        """Fetch content from configured subreddits"""
+    def _sources(self) -> List[Tuple[str, str, Dict[str, Any], str, Dict[str, Any]]]:
+        """(source key, new path, new params, ranked path, ranked params) per source."""
+        strategy = self.discovery_parameters.selection_strategy
+        time_filter = self.discovery_parameters.time_filter
+        sources = []
+        for name in self.discovery_parameters.subreddits:
+            if strategy == ContentSelectionStrategy.TRENDING:
+                ranked = (f"/r/{name}/hot", {})
+            else:
+                ranked = (f"/r/{name}/top", {"t": time_filter})
+            sources.append((f"r/{name}", f"/r/{name}/new", {}, *ranked))
+        for name in self.discovery_parameters.users:
+            ranked_sort = "hot" if strategy == ContentSelectionStrategy.TRENDING else "top"
+            sources.append((
+                f"u/{name}",
+                f"/user/{name}/submitted", {"sort": "new"},
+                f"/user/{name}/submitted", {"sort": ranked_sort, "t": time_filter}
+            ))
+        return sources
+
+    def _load_cursors(self, source_keys: List[str]) -> Dict[str, SourceCursor]:
+        db = SessionLocal()
         try:
-            content_list = []
-            subreddits = self.config.get("subreddits", [])
-            time_filter = self.config.get("time_filter", "day")
-            limit = self.config.get("limit", 10)
-
-            for subreddit_name in subreddits:
-                subreddit = self.reddit.subreddit(subreddit_name)
-
-                # Get top posts
-                for submission in subreddit.top(time_filter=time_filter, limit=limit):
-                    if self._is_valid_submission(submission):
-                        content_list.append(
-                            {
-                                "platform": "reddit",
-                                "post_id": submission.id,
-                                "url": submission.url,
-                                "title": submission.title,
-                                "subreddit": subreddit_name,
-                                "score": submission.score,
-                                "media_type": self._get_media_type(submission),
-                                "created_utc": submission.created_utc,
-                            }
-                        )
-
-            return content_list
-
-        except Exception as e:
-            raise Exception(f"Reddit API error: {str(e)}")
-
-    def validate_content(self, content: List[Dict[str, Any]]) -> bool:
-        """Validate that the content meets our requirements"""
-        if not content:
-            return False
+            cursors = (
+                db.query(SourceCursor)
+                .filter(
+                    SourceCursor.content_flow_id == self.content_flow_id,
+                    SourceCursor.platform == Platform.REDDIT,
+                    SourceCursor.source_key.in_(source_keys)
+                )
+                .all()
+            )
+            return {cursor.source_key: cursor for cursor in cursors}
+        finally:
+            db.close()
+
+    def _save_cursors(self, high_water: Dict[str, Tuple[str, float]]) -> None:
+        """Advance the cursor of every source that returned newer submissions."""
+        if not high_water:
+            return
+        rows = [
+            {
+                "content_flow_id": self.content_flow_id,
+                "platform": Platform.REDDIT,
+                "source_key": source_key,
+                "last_fullname": fullname,
+                "last_created_utc": created_utc,
+            }
+            for source_key, (fullname, created_utc) in high_water.items()
+        ]
+        db = SessionLocal()
+        try:
+            statement = insert(SourceCursor).values(rows)
+            statement = statement.on_conflict_do_update(
+                constraint="uq_source_cursor_flow_platform_source",
+                set_={
+                    "last_fullname": statement.excluded.last_fullname,
+                    "last_created_utc": statement.excluded.last_created_utc,
+                    "updated_at": datetime.now(timezone.utc).replace(tzinfo=None),
+                }
+            )
+            db.execute(statement)
+            db.commit()
+        finally:
+            db.close()
+
+    async def _newer(
+        self,
+        client: RedditClient,
+        path: str,
+        params: Dict[str, Any],
+        cursor: SourceCursor
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Submissions newer than the cursor.
+
+        ``before=`` returns nothing when the anchor submission has been removed, so
+        an empty delta is double-checked against the first page of the listing.
+        """
+        found = False
+        async for submission in client.listing_newer(
+            path, cursor.last_fullname, params, limit=settings.REDDIT_MAX_DELTA_ITEMS
+        ):
+            found = True
+            yield submission
+        if found or cursor.last_created_utc is None:
+            return
+        async for submission in client.listing(path, params):
+            if submission["created_utc"] <= cursor.last_created_utc:
+                return
+            yield submission
+
+    async def stream_content(
+        self,
+        client: RedditClient,
+        cursors: Dict[str, SourceCursor],
+        seen: Dict[str, List[Tuple[str, float, bool]]]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield qualifying submissions from all sources as they arrive.
+
+        Args:
+            client: Open RedditClient
+            cursors: Cursor of each source key that has one, for chronological strategies
+            seen: Filled with (fullname, created_utc, qualifies) of every new submission per source
 
-        required_fields = ["post_id", "url", "title", "media_type"]
+        Yields:
+            Content items for qualifying submissions
+        """
+        listings = []
+        for source_key, new_path, new_params, ranked_path, ranked_params in self._sources():
+            cursor = cursors.get(source_key)
+            if not self._chronological:
+                items = client.listing(ranked_path, ranked_params, limit=settings.REDDIT_RANKED_SCAN_LIMIT)
+            elif cursor and cursor.last_fullname:
+                items = self._newer(client, new_path, new_params, cursor)
+            else:
+                items = client.listing(new_path, new_params, limit=self.discovery_parameters.max_items)
+            listings.append((source_key, items))
 
-        for post in content:
-            if not all(field in post for field in required_fields):
-                return False
+        async for source_key, submission in stream_listings(listings):
+            if self._chronological:
+                cursor = cursors.get(source_key)
+                last_created = cursor.last_created_utc if cursor else None
+                if last_created is not None and submission["created_utc"] <= last_created:
+                    continue  # Already seen by a previous run
 
-            # Check if content type is supported
-            if post["media_type"] not in ["video", "image", "gif"]:
-                return False
+            item = self._to_content_item(submission) if self._is_valid_submission(submission) else None
+            qualifies = item is not None and self._within_duration(item)
+            seen.setdefault(source_key, []).append((submission["name"], submission["created_utc"], qualifies))
+            if qualifies:
+                yield item
 
-            # Check minimum score if specified
-            min_score = self.config.get("min_score", 0)
-            if post["score"] < min_score:
-                return False
+    async def _discover(self, seen: Dict[str, List[Tuple[str, float, bool]]]) -> List[Dict[str, Any]]:
+        cursors = {}
+        if self._chronological:
+            cursors = self._load_cursors([source[0] for source in self._sources()])
+        async with RedditClient(**self.credentials) as client:
+            return [item async for item in self.stream_content(client, cursors, seen)]
 
-        return True
+    @staticmethod
+    def _high_water(
+        seen: Dict[str, List[Tuple[str, float, bool]]],
+        returned: Set[str]
+    ) -> Dict[str, Tuple[str, float]]:
+        """Newest position per source below which every qualifying submission was returned.
 
-    def _is_valid_submission(self, submission) -> bool:
+        A qualifying submission the selection dropped stops the cursor just
+        before it, so the next run fetches it again instead of skipping it.
+        """
+        high_water = {}
+        for source_key, submissions in seen.items():
+            for fullname, created_utc, qualifies in sorted(submissions, key=lambda entry: entry[1]):
+                if qualifies and fullname not in returned:
+                    break
+                high_water[source_key] = (fullname, created_utc)
+        return high_water
+
+    def _already_sourced(self, urls: List[str]) -> Set[str]:
+        """Which of the URLs this flow has queued or posted before."""
+        if not urls:
+            return set()
+        db = SessionLocal()
+        try:
+            queued = db.query(ContentQueueItem.source_url).filter(
+                ContentQueueItem.content_flow_id == self.content_flow_id,
+                ContentQueueItem.source_url.in_(urls)
+            )
+            posted = db.query(PostedItem.source_url).filter(
+                PostedItem.content_flow_id == self.content_flow_id,
+                PostedItem.source_url.in_(urls)
+            )
+            return {url for (url,) in queued.union(posted)}
+        finally:
+            db.close()
+
+    def discover_content(self) -> List[Dict[str, Any]]:
+        """Fetch new qualifying submissions from all subreddits and users concurrently.
+
+        Cursors are not moved here; source_content advances them past the
+        submissions whose media was downloaded.
+
+        Returns:
+            Up to max_items content items, selected by the selection strategy
+
+        Raises:
+            RedditContentError: If the Reddit API cannot be reached
+        """
+        seen: Dict[str, List[Tuple[str, float, bool]]] = {}
+        self._seen = seen
+        try:
+            content = asyncio.run(self._discover(seen))
+        except RedditAPIError as e:
+            raise RedditContentError(f"Reddit API error: {str(e)}") from e
+
+        if not self._chronological:
+            # Ranked listings return the same top posts run after run
+            sourced = self._already_sourced([item["url"] for item in content])
+            return self._select([item for item in content if item["url"] not in sourced])
+        return self._select(content)
+
+    def _within_duration(self, item: Dict[str, Any]) -> bool:
+        max_duration = self.sourcing_parameters.max_duration
+        if not max_duration:
+            return True
+        return (item["media"] or {}).get("reddit_video", {}).get("duration", 0) <= max_duration
+
+    def _select(self, content: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        strategy = self.discovery_parameters.selection_strategy
+        now = datetime.now(timezone.utc).timestamp()
+        if strategy == ContentSelectionStrategy.MOST_RECENT:
+            content.sort(key=lambda item: item["created_utc"], reverse=True)
+        elif strategy == ContentSelectionStrategy.MOST_VIEWED:
+            content.sort(key=lambda item: item["score"], reverse=True)
+        elif strategy == ContentSelectionStrategy.TRENDING:
+            # Score per hour since posting
+            content.sort(
+                key=lambda item: item["score"] / max((now - item["created_utc"]) / 3600, 1),
+                reverse=True
+            )
+        elif strategy == ContentSelectionStrategy.RANDOM:
+            random.shuffle(content)
+        return content[:self.discovery_parameters.max_items]
+
+    def source_content(self) -> List[ProcessedVideo]:
+        """Discover new submissions and download their media."""
+        content = self.discover_content()
+        downloader = RedditMediaDownloader(
+            self.credentials["user_agent"],
+            quality=self.sourcing_parameters.quality
+        )
+        videos = downloader.download_many(content)
+        if self._chronological:
+            # Failed downloads stay ahead of the cursor and are fetched again next run
+            fullnames = {item["url"]: item["fullname"] for item in content}
+            self._save_cursors(self._high_water(self._seen, {fullnames[video["url"]] for video in videos}))
+        log_manager.info(
+            logger_name,
+            "Sourced Reddit content",
+            context={
+                "content_flow_id": self.content_flow_id,
+                "discovered": len(content),
+                "downloaded": len(videos)
+            }
+        )
+        return videos
+
+    def _to_content_item(self, submission: Dict[str, Any]) -> Dict[str, Any]:
+        # Crossposts carry the media on the original submission
+        origin = (submission.get("crosspost_parent_list") or [submission])[0]
+        return {
+            "platform": Platform.REDDIT.value,
+            "post_id": submission["id"],
+            "fullname": submission["name"],
+            "url": f"https://www.reddit.com{submission['permalink']}",
+            "media_url": origin["url"],
+            "title": submission["title"],
+            "subreddit": submission["subreddit"],
+            "author": submission.get("author"),
+            "score": submission["score"],
+            "media_type": self._get_media_type(submission),
+            "media": origin.get("secure_media") or origin.get("media"),
+            "preview": origin.get("preview"),
+            "thumbnail": submission.get("thumbnail"),
+            "created_utc": submission["created_utc"],
+        }
+
+    def _is_valid_submission(self, submission: Dict[str, Any]) -> bool:
         """Check if a submission meets basic criteria"""
         # Skip self posts and non-media posts
-        if submission.is_self or not hasattr(submission, "url"):
+        if submission.get("is_self") or not submission.get("url"):
+            return False
+
+        if submission.get("over_18") and not self.discovery_parameters.include_nsfw:
             return False
 
-        # Check domain whitelist if specified
-        allowed_domains = self.config.get("allowed_domains", [])
-        if allowed_domains and submission.domain not in allowed_domains:
+        min_score = self.discovery_parameters.min_score
+        if min_score is not None and submission["score"] < min_score:
             return False
 
-        return True
+        return self._get_media_type(submission) in ("video", "gif")
 
-    def _get_media_type(self, submission) -> str:
+    def _get_media_type(self, submission: Dict[str, Any]) -> str:
         """Determine the type of media in the submission"""
-        url = submission.url.lower()
+        url = submission["url"].lower()
 
         # Check if it's a video
-        if hasattr(submission, "is_video") and submission.is_video:
+        if submission.get("is_video"):
             return "video"
 
         # Check if it's an image
@@ -103,7 +370,7 @@ class RedditAdapter(SourceAdapter):
             return "image"
 
         # Check if it's a gif
-        if url.endswith(".gif") or "gfycat.com" in url or "imgur.com" in url:
+        if url.endswith((".gif", ".gifv")) or "gfycat.com" in url or "imgur.com" in url:
             return "gif"
 
         return "unknown"
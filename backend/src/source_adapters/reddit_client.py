@@ -0,0 +1,283 @@
+"""Asynchronous Reddit OAuth JSON client."""
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import asyncio
+import time
+import httpx
+from src.logging.log_manager import LogManager
+from config import Settings
+
+settings = Settings()
+log_manager = LogManager()
+logger_name = "reddit-client"
+
+TOKEN_URL = "https://www.reddit.com/api/v1/access_token"
+API_BASE_URL = "https://oauth.reddit.com"
+LISTING_PAGE_SIZE = 100  # Maximum page size Reddit accepts
+MAX_BACKOFF_SECONDS = 30  # Longest wait before retrying a failed request
+
+
+class RedditAPIError(Exception):
+    """Raised when the Reddit API returns an error."""
+    pass
+
+
+class RedditRateLimiter:
+    """Shares Reddit's per-client request budget between concurrent requests.
+
+    Reddit reports the budget of the current window in the X-Ratelimit-Remaining
+    and X-Ratelimit-Reset headers. Requests decrement a local copy of the
+    remaining count when they start, so concurrent requests cannot overspend the
+    window before the next response updates it. Once the budget is used up,
+    requests wait until the window resets.
+    """
+
+    def __init__(self, max_concurrent: int = settings.REDDIT_MAX_CONCURRENT_REQUESTS):
+        self._lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._remaining: Optional[float] = None
+        self._reset_at: float = 0.0
+
+    async def acquire(self) -> None:
+        await self._semaphore.acquire()
+        async with self._lock:
+            now = time.monotonic()
+            if self._remaining is not None and self._remaining < 1 and now < self._reset_at:
+                delay = self._reset_at - now
+                log_manager.info(
+                    logger_name,
+                    "Reddit rate limit reached, waiting for reset",
+                    context={"delay": round(delay, 1)}
+                )
+                # Holding the lock makes every other request wait for the reset too
+                await asyncio.sleep(delay)
+                self._remaining = None
+            if self._remaining is not None:
+                self._remaining -= 1
+
+    def release(self, headers: Optional[httpx.Headers] = None) -> None:
+        if headers is not None:
+            self.update(headers)
+        self._semaphore.release()
+
+    def update(self, headers: httpx.Headers) -> None:
+        """Update the budget from a response's rate-limit headers."""
+        remaining = headers.get("x-ratelimit-remaining")
+        reset = headers.get("x-ratelimit-reset")
+        if remaining is None or reset is None:
+            return
+        self._remaining = float(remaining)
+        self._reset_at = time.monotonic() + float(reset)
+
+    def block_until(self, seconds: float) -> None:
+        """Treat the budget as spent for ``seconds``, e.g. after a 429 response."""
+        self._remaining = 0
+        self._reset_at = max(self._reset_at, time.monotonic() + seconds)
+
+
+class RedditClient:
+    """Minimal asynchronous client for Reddit's OAuth JSON API.
+
+    Uses the application-only (client credentials) grant, which is enough to
+    read public listings. Use as an async context manager.
+    """
+
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        user_agent: str,
+        timeout: float = settings.REDDIT_REQUEST_TIMEOUT
+    ):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.user_agent = user_agent
+        self.rate_limiter = RedditRateLimiter()
+        self._http = httpx.AsyncClient(
+            base_url=API_BASE_URL,
+            headers={"User-Agent": user_agent},
+            timeout=timeout
+        )
+        self._token: Optional[str] = None
+        self._token_expires_at = 0.0
+        self._token_lock = asyncio.Lock()
+
+    async def __aenter__(self) -> "RedditClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        await self._http.aclose()
+
+    async def _access_token(self, force_refresh: bool = False) -> str:
+        async with self._token_lock:
+            if not force_refresh and self._token and time.monotonic() < self._token_expires_at:
+                return self._token
+            try:
+                response = await self._http.post(
+                    TOKEN_URL,
+                    data={"grant_type": "client_credentials"},
+                    auth=(self.client_id, self.client_secret)
+                )
+            except httpx.HTTPError as e:
+                raise RedditAPIError(f"Failed to get access token: {str(e)}") from e
+            if response.status_code != 200:
+                raise RedditAPIError(f"Failed to get access token: HTTP {response.status_code}")
+            payload = response.json()
+            self._token = payload["access_token"]
+            # Refresh a minute early so in-flight requests never use an expired token
+            self._token_expires_at = time.monotonic() + payload.get("expires_in", 3600) - 60
+            return self._token
+
+    async def get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """GET an API path and return the decoded JSON body.
+
+        Args:
+            path: API path, e.g. "/r/videos/top"
+            params: Query parameters
+
+        Returns:
+            Decoded JSON response
+
+        Raises:
+            RedditAPIError: If the request keeps failing
+        """
+        params = {**(params or {}), "raw_json": 1}
+        token_refreshed = False
+        for attempt in range(settings.REDDIT_MAX_RETRIES + 1):
+            token = await self._access_token()
+            await self.rate_limiter.acquire()
+            headers = None
+            try:
+                response = await self._http.get(path, params=params, headers={"Authorization": f"bearer {token}"})
+                headers = response.headers
+            except httpx.HTTPError as e:
+                self.rate_limiter.release()
+                if attempt == settings.REDDIT_MAX_RETRIES:
+                    raise RedditAPIError(f"Request to {path} failed: {str(e)}") from e
+                await asyncio.sleep(min(2 ** attempt, MAX_BACKOFF_SECONDS))
+                continue
+            self.rate_limiter.release(headers)
+
+            if response.status_code == 200:
+                return response.json()
+            if response.status_code == 401 and not token_refreshed:
+                await self._access_token(force_refresh=True)
+                token_refreshed = True
+                continue
+            if response.status_code == 429:
+                self.rate_limiter.block_until(float(response.headers.get("x-ratelimit-reset", 2 ** attempt)))
+                continue
+            if response.status_code >= 500:
+                # The rate limit window says nothing about when the server recovers
+                await asyncio.sleep(min(2 ** attempt, MAX_BACKOFF_SECONDS))
+                continue
+            raise RedditAPIError(f"Request to {path} failed: HTTP {response.status_code}")
+
+        raise RedditAPIError(f"Request to {path} failed after {settings.REDDIT_MAX_RETRIES} retries")
+
+    async def listing(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        limit: int = LISTING_PAGE_SIZE
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate the items of a listing, following ``after`` pagination.
+
+        Args:
+            path: Listing path, e.g. "/r/videos/top"
+            params: Query parameters, e.g. {"t": "day"}
+            limit: Maximum number of items to yield
+
+        Yields:
+            The ``data`` object of each listing child
+        """
+        after = None
+        yielded = 0
+        while yielded < limit:
+            page_params = {**(params or {}), "limit": min(LISTING_PAGE_SIZE, limit - yielded)}
+            if after:
+                page_params["after"] = after
+            page = (await self.get(path, page_params))["data"]
+            for child in page["children"]:
+                yield child["data"]
+                yielded += 1
+            after = page.get("after")
+            if not after or not page["children"]:
+                return
+
+    async def listing_newer(
+        self,
+        path: str,
+        before: str,
+        params: Optional[Dict[str, Any]] = None,
+        limit: int = LISTING_PAGE_SIZE
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate the items of a chronological listing that are newer than ``before``.
+
+        Reddit returns the page directly above the anchor, so pages are walked
+        towards the newest item, re-anchoring on each page's first item. Items
+        are yielded newest first within each page and the pages oldest first.
+
+        Args:
+            path: Listing path, e.g. "/r/videos/new"
+            before: Fullname of the newest item already seen, e.g. "t3_abc123"
+            params: Query parameters
+            limit: Maximum number of items to yield
+
+        Yields:
+            The ``data`` object of each listing child
+        """
+        yielded = 0
+        while yielded < limit:
+            page_params = {**(params or {}), "limit": LISTING_PAGE_SIZE, "before": before}
+            children = (await self.get(path, page_params))["data"]["children"]
+            if not children:
+                return
+            # Keep the items nearest the anchor so a truncated run leaves no gap
+            children = children[-(limit - yielded):]
+            for child in children:
+                yield child["data"]
+                yielded += 1
+            before = children[0]["data"]["name"]
+
+
+async def stream_listings(
+    sources: List[Tuple[str, AsyncIterator[Dict[str, Any]]]]
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """Consume several listings concurrently and yield items as they arrive.
+
+    A failing listing is logged and skipped so it does not stop the others.
+
+    Args:
+        sources: (source key, listing iterator) pairs, e.g. from RedditClient.listing
+
+    Yields:
+        (source key, item data) tuples in arrival order
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=LISTING_PAGE_SIZE)
+    done = object()
+
+    async def produce(key: str, items: AsyncIterator[Dict[str, Any]]) -> None:
+        try:
+            async for item in items:
+                await queue.put((key, item))
+        except Exception as e:
+            log_manager.error(logger_name, "Error fetching Reddit listing", context={"source": key}, error=e)
+        finally:
+            await queue.put(done)
+
+    tasks = [asyncio.create_task(produce(key, items)) for key, items in sources]
+    try:
+        pending = len(tasks)
+        while pending:
+            entry = await queue.get()
+            if entry is done:
+                pending -= 1
+                continue
+            yield entry
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
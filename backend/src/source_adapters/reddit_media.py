@@ -0,0 +1,275 @@
+"""Resolve and download the media of Reddit submissions."""
+from typing import Any, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from urllib.parse import urljoin, urlparse
+import os
+import xml.etree.ElementTree as ElementTree
+import ffmpeg
+import requests
+from src.source_adapters.download_manager import _get_executor
+from src.source_adapters.types import ProcessedVideo
+from src.storage.media_store import MediaStoreError, SourceMediaStore
+from src.database.models import Platform
+from src.logging.log_manager import LogManager
+from config import Settings
+
+settings = Settings()
+log_manager = LogManager()
+logger_name = "reddit-media"
+
+DASH_NAMESPACE = {"mpd": "urn:mpeg:dash:schema:mpd:2011"}
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class RedditMediaError(Exception):
+    """Raised when a submission's media cannot be resolved or downloaded."""
+    pass
+
+
+def _reddit_video(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The reddit_video object of a hosted video or of a GIF's MP4 preview."""
+    media = item.get("media") or {}
+    if media.get("reddit_video"):
+        return media["reddit_video"]
+    preview = item.get("preview") or {}
+    return preview.get("reddit_video_preview")
+
+
+def parse_dash_manifest(manifest: str, base_url: str, max_height: int) -> Tuple[str, Optional[str]]:
+    """Pick the video and audio streams to download from a DASH manifest.
+
+    Args:
+        manifest: DASHPlaylist.mpd XML
+        base_url: URL the representation BaseURLs are relative to
+        max_height: Highest acceptable video height
+
+    Returns:
+        (video URL, audio URL or None if the video has no audio track)
+
+    Raises:
+        RedditMediaError: If the manifest has no usable video stream
+    """
+    try:
+        root = ElementTree.fromstring(manifest)
+    except ElementTree.ParseError as e:
+        raise RedditMediaError(f"Invalid DASH manifest: {str(e)}") from e
+
+    videos = []
+    audios = []
+    for adaptation_set in root.iterfind(".//mpd:AdaptationSet", DASH_NAMESPACE):
+        content_type = adaptation_set.get("contentType") or adaptation_set.get("mimeType", "").split("/")[0]
+        for representation in adaptation_set.iterfind("mpd:Representation", DASH_NAMESPACE):
+            base = representation.find("mpd:BaseURL", DASH_NAMESPACE)
+            if base is None or not base.text:
+                continue
+            url = urljoin(base_url, base.text.strip())
+            bandwidth = int(representation.get("bandwidth", 0))
+            if content_type == "video":
+                videos.append((int(representation.get("height", 0)), bandwidth, url))
+            elif content_type == "audio":
+                audios.append((bandwidth, url))
+
+    fitting = [video for video in videos if video[0] <= max_height] or videos
+    if not fitting:
+        raise RedditMediaError("DASH manifest has no video stream")
+    video_url = max(fitting)[2]
+    audio_url = max(audios)[1] if audios else None
+    return video_url, audio_url
+
+
+class RedditMediaDownloader:
+    """Downloads Reddit-hosted videos, imgur and gfycat GIFs as MP4 files.
+
+    - v.redd.it videos are resolved through their DASH manifest. The video and
+      audio tracks are fetched concurrently and muxed with stream copy.
+    - imgur .gif/.gifv links are swapped for the MP4 imgur serves alongside them.
+    - gfycat links and other GIFs use Reddit's MP4 preview when there is one.
+      Otherwise the GIF is downloaded and converted with ffmpeg.
+
+    Files go into the shared SourceMediaStore. Submissions are downloaded in the
+    process-wide bounded download pool.
+    """
+
+    def __init__(self, user_agent: str, quality: str = "1080p", store: Optional[SourceMediaStore] = None):
+        self.max_height = int(quality.rstrip("p"))
+        self.store = store or SourceMediaStore()
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = user_agent
+
+    def _fetch(self, url: str, output_path: str) -> str:
+        """Stream a URL to disk in fixed-size chunks."""
+        try:
+            with self.session.get(url, stream=True, timeout=settings.REDDIT_REQUEST_TIMEOUT) as response:
+                response.raise_for_status()
+                with open(output_path, "wb") as f:
+                    for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+        except requests.RequestException as e:
+            raise RedditMediaError(f"Failed to download {url}: {str(e)}") from e
+        return output_path
+
+    def _download_dash(self, reddit_video: Dict[str, Any], output_dir: str) -> str:
+        dash_url = reddit_video.get("dash_url")
+        if not dash_url:
+            # Without a manifest only the silent fallback stream is available
+            return self._fetch(reddit_video["fallback_url"], os.path.join(output_dir, "video.mp4"))
+
+        try:
+            response = self.session.get(dash_url, timeout=settings.REDDIT_REQUEST_TIMEOUT)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            raise RedditMediaError(f"Failed to fetch DASH manifest: {str(e)}") from e
+        video_url, audio_url = parse_dash_manifest(response.text, dash_url, self.max_height)
+
+        video_path = os.path.join(output_dir, "video.mp4")
+        if not audio_url:
+            return self._fetch(video_url, video_path)
+
+        audio_path = os.path.join(output_dir, "audio.mp4")
+        # Tracks are independent, so fetch both at once; two threads per submission
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="dash-track") as tracks:
+            video_future = tracks.submit(self._fetch, video_url, video_path)
+            audio_future = tracks.submit(self._fetch, audio_url, audio_path)
+            video_future.result()
+            audio_future.result()
+
+        output_path = os.path.join(output_dir, "muxed.mp4")
+        try:
+            ffmpeg.output(
+                ffmpeg.input(video_path).video,
+                ffmpeg.input(audio_path).audio,
+                output_path,
+                c="copy",
+                movflags="+faststart"
+            ).overwrite_output().run(capture_stdout=True, capture_stderr=True)
+        except ffmpeg.Error as e:
+            error_message = e.stderr.decode() if e.stderr else str(e)
+            raise RedditMediaError(f"Failed to mux DASH tracks: {error_message}") from e
+        return output_path
+
+    def _convert_gif(self, gif_path: str, output_dir: str) -> str:
+        output_path = os.path.join(output_dir, "converted.mp4")
+        try:
+            (
+                ffmpeg.input(gif_path)
+                .output(
+                    output_path,
+                    vcodec="libx264",
+                    pix_fmt="yuv420p",
+                    movflags="+faststart",
+                    # H.264 with yuv420p needs even dimensions
+                    vf="scale=trunc(iw/2)*2:trunc(ih/2)*2"
+                )
+                .overwrite_output()
+                .run(capture_stdout=True, capture_stderr=True)
+            )
+        except ffmpeg.Error as e:
+            error_message = e.stderr.decode() if e.stderr else str(e)
+            raise RedditMediaError(f"Failed to convert GIF: {error_message}") from e
+        return output_path
+
+    def _imgur_mp4_url(self, url: str) -> Optional[str]:
+        parsed = urlparse(url)
+        if not parsed.netloc.endswith("imgur.com"):
+            return None
+        image_id, _ = os.path.splitext(os.path.basename(parsed.path))
+        if not image_id or "/a/" in parsed.path or "/gallery/" in parsed.path:
+            return None  # Albums need the imgur API
+        return f"https://i.imgur.com/{image_id}.mp4"
+
+    def _produce(self, item: Dict[str, Any], output_dir: str) -> str:
+        """Write the MP4 for a submission into ``output_dir`` and return its path."""
+        reddit_video = (item.get("media") or {}).get("reddit_video")
+        if reddit_video:
+            return self._download_dash(reddit_video, output_dir)
+
+        media_url = item["media_url"]
+        imgur_url = self._imgur_mp4_url(media_url)
+        if imgur_url:
+            return self._fetch(imgur_url, os.path.join(output_dir, "imgur.mp4"))
+
+        preview = _reddit_video(item)
+        if preview:
+            # gfycat is gone, but Reddit keeps an MP4 preview of GIF posts
+            return self._download_dash(preview, output_dir)
+
+        if urlparse(media_url).path.lower().endswith(".gif"):
+            gif_path = self._fetch(media_url, os.path.join(output_dir, "source.gif"))
+            return self._convert_gif(gif_path, output_dir)
+
+        raise RedditMediaError(f"Unsupported media URL: {media_url}")
+
+    def download(self, item: Dict[str, Any]) -> ProcessedVideo:
+        """Download a submission's media, or reuse it if it is already stored.
+
+        Args:
+            item: Content item produced by RedditAdapter
+
+        Returns:
+            ProcessedVideo for the downloaded MP4
+
+        Raises:
+            RedditMediaError: If the media cannot be resolved or downloaded
+        """
+        try:
+            stored = self.store.fetch(
+                Platform.REDDIT.value,
+                item["post_id"],
+                None,
+                "mp4",
+                lambda output_dir: self._produce(item, output_dir),
+                variant=f"{self.max_height}p"
+            )
+        except MediaStoreError as e:
+            raise RedditMediaError(str(e)) from e
+
+        reddit_video = _reddit_video(item)
+        if reddit_video and reddit_video.get("duration"):
+            duration = float(reddit_video["duration"])
+        else:
+            try:
+                duration = float(ffmpeg.probe(stored["file_path"])["format"]["duration"])
+            except (ffmpeg.Error, KeyError) as e:
+                raise RedditMediaError(f"Failed to probe {stored['file_path']}") from e
+
+        thumbnail = item.get("thumbnail") or ""
+        return {
+            "file_path": stored["file_path"],
+            "duration": duration,
+            "video_id": item["post_id"],
+            "title": item["title"],
+            "description": "",
+            "thumbnail": thumbnail if thumbnail.startswith("http") else "",
+            "published_at": datetime.fromtimestamp(item["created_utc"], timezone.utc).isoformat(),
+            "url": item["url"],
+            "platform": Platform.REDDIT.value,
+            "source_media_id": stored["source_media_id"],
+            "source_media_key": stored["source_media_key"],
+        }
+
+    def download_many(self, items: List[Dict[str, Any]]) -> List[ProcessedVideo]:
+        """Download several submissions in the bounded download pool.
+
+        Failed submissions are logged and left out of the result.
+
+        Args:
+            items: Content items produced by RedditAdapter
+
+        Returns:
+            Successfully downloaded videos, in the order of items
+        """
+        futures = [_get_executor().submit(self.download, item) for item in items]
+
+        videos = []
+        for item, future in zip(items, futures):
+            try:
+                videos.append(future.result())
+            except Exception as e:
+                log_manager.error(
+                    logger_name,
+                    "Error downloading Reddit media",
+                    context={"post_id": item.get("post_id"), "media_url": item.get("media_url")},
+                    error=e
+                )
+        return videos
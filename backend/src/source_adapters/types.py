@@ -18,7 +18,13 @@ class VideoMetadata(TypedDict):
     most_replayed_data: Optional[Dict[str, Any]]
 
 
-class ProcessedVideo(TypedDict):
+class StoredMediaFields(TypedDict, total=False):
+    """Optional fields of a ProcessedVideo downloaded through the media store."""
+    source_media_id: int  # SourceMedia row holding the downloaded file
+    source_media_key: str
+
+
+class ProcessedVideo(StoredMediaFields):
     """Video that has been processed and downloaded.
     
     This represents the final output of a source adapter after
@@ -1,12 +1,23 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple, Union
 import requests
 import re
 import json
+import copy
+import random
+import numpy as np
+import httplib2
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from bs4 import BeautifulSoup
-import yt_dlp
+import googleapiclient.discovery
 from googleapiclient.errors import HttpError
+from src.core.credentials import CredentialCache, credentials_version
 from src.source_adapters.base import SourceAdapter
 from src.source_adapters.types import VideoMetadata, ProcessedVideo
+from src.source_adapters.discovery_cache import DiscoveryCache, CacheMiss
+from src.source_adapters.quota import QuotaManager
+from src.source_adapters.download_manager import DownloadManager
+from src.source_adapters.heatmap import markers_to_arrays, decoration_intensities, top_windows
 from src.database.schemas import (
     YouTubeDiscoveryParameters,
     YouTubeSourcingParameters,
@@ -16,14 +27,17 @@ from src.database.schemas import (
     SourceSelectionStrategy,
 )
 from src.source_adapters.registry import SourceRegistry
-from src.database.models import Platform, PostedItem
+from src.database.models import Platform, PostedItem, ContentFlow, SourceConfig, Transformation
 from src.database.session import SessionLocal
 from isodate import parse_duration
 from src.logging.log_manager import LogManager
-import os
+from config import Settings
 
 logger_name = "youtube-adapter"
 log_manager = LogManager()
+settings = Settings()
+
+VIDEOS_LIST_MAX_IDS = 50  # Maximum number of IDs accepted by a single videos.list call
 
 
 class YouTubeError(Exception):
@@ -38,23 +52,30 @@ class YouTubeContentError(YouTubeError):
     """Raised when there's an error processing or downloading content."""
     pass
 
+class YouTubeQuotaError(YouTubeAPIError):
+    """Raised when the Data API quota for the key is exhausted or reserved for other flows."""
+    pass
+
 
 @SourceRegistry.register(Platform.YOUTUBE)
 class YouTubeAdapter(SourceAdapter):
     def __init__(
         self,
         content_flow_id: int,
-        credentials: str,
+        credentials: Union[str, Dict[str, str]],
         discovery_parameters: YouTubeDiscoveryParameters,
         sourcing_parameters: YouTubeSourcingParameters
     ):
         self.content_flow_id = content_flow_id
         self.discovery_parameters: YouTubeDiscoveryParameters = discovery_parameters
         self.sourcing_parameters: YouTubeSourcingParameters = sourcing_parameters
-        self.api = self._init_api(credentials)
+        # Source configs store credentials as JSON, e.g. {"api_key": "..."}
+        self.api_key = credentials.get("api_key") if isinstance(credentials, dict) else credentials
+        self._priority: Optional[float] = None
+        self.api = self._init_api(self.api_key)
 
     def _init_api(self, credentials: str):
-        """Initialize the YouTube API client.
+        """Get the YouTube API client for a key, built once per worker process.
         
         Args:
             credentials: YouTube API key
@@ -69,10 +90,16 @@ class YouTubeAdapter(SourceAdapter):
             raise YouTubeAPIError("YouTube API credentials are required")
             
         try:
-            return googleapiclient.discovery.build(
-                "youtube", "v3", 
-                developerKey=credentials,
-                cache_discovery=False  # Disable cache to prevent warnings
+            # Flows sharing a key share the client; each key has its own entry
+            return CredentialCache().client(
+                "youtube-data",
+                credentials_version(credentials),
+                credentials,
+                lambda: googleapiclient.discovery.build(
+                    "youtube", "v3",
+                    developerKey=credentials,
+                    cache_discovery=False  # Disable cache to prevent warnings
+                )
             )
         except Exception as e:
             log_manager.error(
@@ -83,6 +110,56 @@ class YouTubeAdapter(SourceAdapter):
             )
             raise YouTubeAPIError("Failed to initialize YouTube API") from e
 
+    @property
+    def priority(self) -> float:
+        """This flow's quota priority, computed once per adapter from its yield history.
+
+        Priorities are relative to the best yield, so they are computed over
+        every active YouTube flow, not this flow alone.
+        """
+        if self._priority is None:
+            db = SessionLocal()
+            try:
+                flow_ids = [
+                    flow_id for (flow_id,) in db.query(ContentFlow.id)
+                    .join(SourceConfig, SourceConfig.id == ContentFlow.source_config_id)
+                    .filter(ContentFlow.is_active.is_(True), SourceConfig.platform == Platform.YOUTUBE)
+                ]
+                priorities = QuotaManager(db).flow_priorities(set(flow_ids) | {self.content_flow_id})
+                self._priority = priorities[self.content_flow_id]
+            finally:
+                db.close()
+        return self._priority
+
+    def _execute(self, request, method: str, http: Optional[httplib2.Http] = None) -> Dict[str, Any]:
+        """Execute an API request after charging its unit cost to the daily quota.
+        
+        Args:
+            request: Prepared googleapiclient request
+            method: API method name used for costing, e.g. "videos.list"
+            http: Optional http object to execute the request with
+            
+        Raises:
+            YouTubeQuotaError: If the quota is exhausted or held back for higher-priority flows
+        """
+        priority = self.priority
+        db = SessionLocal()
+        try:
+            quota = QuotaManager(db)
+            # The API charges for a request whether or not it succeeds
+            if not quota.try_charge(self.api_key, method, self.content_flow_id, priority):
+                raise YouTubeQuotaError(f"Quota budget unavailable for {method}")
+            
+            try:
+                return request.execute(http=http)
+            except HttpError as e:
+                if e.resp.status == 403 and b"quotaExceeded" in (e.content or b""):
+                    quota.mark_exhausted(self.api_key, self.content_flow_id)
+                    raise YouTubeQuotaError("YouTube API quota exceeded") from e
+                raise
+        finally:
+            db.close()
+
     def source_content(self) -> List[ProcessedVideo]:
         """Fetch and process videos based on discovery and sourcing parameters."""
         try:
@@ -94,9 +171,7 @@ class YouTubeAdapter(SourceAdapter):
             extracted_content = []
             for content in discovered_content:
                 try:
-                    result = self.extract_content(content)
-                    if result:
-                        extracted_content.append(result)
+                    extracted_content.extend(self.extract_content(content))
                 except YouTubeContentError as e:
                     # Log but continue with other videos
                     log_manager.error(
@@ -117,6 +192,8 @@ class YouTubeAdapter(SourceAdapter):
                 error=e
             )
             raise YouTubeAPIError("Failed to fetch content from YouTube") from e
+        except YouTubeError:
+            raise
         except Exception as e:
             log_manager.critical(
                 logger_name,
@@ -168,8 +245,12 @@ class YouTubeAdapter(SourceAdapter):
             )
             raise YouTubeError("Failed to discover content") from e
 
-    def extract_content(self, content: VideoMetadata) -> Optional[ProcessedVideo]:
-        """Extract and process content based on specified processing type."""
+    def extract_content(self, content: VideoMetadata) -> List[ProcessedVideo]:
+        """Extract and process content based on specified processing type.
+
+        Most replayed processing yields one clip per selected heatmap window,
+        up to max_clips_per_video, so a single video may produce several items.
+        """
         if not content or not isinstance(content, dict) or "video_id" not in content:
             raise YouTubeError("Invalid content data provided")
             
@@ -182,25 +263,29 @@ class YouTubeAdapter(SourceAdapter):
                         "No most replayed data available",
                         context={"video_id": video_id}
                     )
-                    return None
+                    return []
                     
                 try:
-                    start_time = content["most_replayed_data"]["timedMarkerDecorations"][0]["visibleTimeRangeStartMillis"]
-                    end_time = content["most_replayed_data"]["timedMarkerDecorations"][0]["visibleTimeRangeEndMillis"]
-                except (KeyError, IndexError) as e:
+                    decorations = content["most_replayed_data"]["timedMarkerDecorations"]
+                    time_ranges = [
+                        (decoration["visibleTimeRangeStartMillis"], decoration["visibleTimeRangeEndMillis"])
+                        for decoration in decorations[:self.sourcing_parameters.max_clips_per_video]
+                    ]
+                except (KeyError, TypeError) as e:
                     raise YouTubeContentError(f"Invalid most replayed data structure: {str(e)}")
+                if not time_ranges:
+                    raise YouTubeContentError("Invalid most replayed data structure: no time ranges")
                     
-                downloaded_content = self._download_video_clip(video_id, start_time, end_time)
-                if not downloaded_content:
-                    return None
-                    
-                return self._add_metadata(downloaded_content, content)
+                return [
+                    self._add_metadata(downloaded_content, content)
+                    for downloaded_content in self._download_video_clips(video_id, time_ranges)
+                ]
                 
             elif self.sourcing_parameters.processing_type == ContentProcessingType.FULL:
                 downloaded_content = self._download_full_video(video_id)
                 if not downloaded_content:
-                    return None
-                return self._add_metadata(downloaded_content, content)
+                    return []
+                return [self._add_metadata(downloaded_content, content)]
                 
             elif self.sourcing_parameters.processing_type == ContentProcessingType.COMBINE:
                 raise NotImplementedError("Combine processing type not implemented")
@@ -248,71 +333,62 @@ class YouTubeAdapter(SourceAdapter):
         """Download the full video."""
         raise NotImplementedError()
 
+    def _download_manager(self) -> DownloadManager:
+        """Download manager configured from the sourcing parameters."""
+        precise_cuts = self.sourcing_parameters.precise_cuts
+        if precise_cuts is None:
+            # Keyframe cuts are fine when the editing pipeline trims the clip again
+            precise_cuts = not self._pipeline_trims()
+        return DownloadManager(
+            Platform.YOUTUBE.value,
+            quality=self.sourcing_parameters.quality,
+            precise_cuts=precise_cuts
+        )
+
+    def _pipeline_trims(self) -> bool:
+        """Check whether this flow's editing pipeline contains a trim step."""
+        db = SessionLocal()
+        try:
+            flow = db.query(ContentFlow).get(self.content_flow_id)
+            transformations = flow.editing_pipeline.transformations if flow and flow.editing_pipeline else None
+        finally:
+            db.close()
+            
+        if isinstance(transformations, dict):
+            names = transformations.get("transformations", transformations).keys()
+        elif isinstance(transformations, list):
+            names = [step.get("type") for step in transformations if isinstance(step, dict)]
+        else:
+            return False
+        return Transformation.TRIM.value in names
+
     def _download_video_clip(self, video_id: str, start_time: int, end_time: int) -> ProcessedVideo:
         """Download a specific segment of a video."""
+        clips = self._download_video_clips(video_id, [(start_time, end_time)])
+        if not clips:
+            raise YouTubeContentError(f"Failed to download video {video_id}")
+        return clips[0]
+
+    def _download_video_clips(self, video_id: str, time_ranges: List[Tuple[int, int]]) -> List[ProcessedVideo]:
+        """Download several segments of a video concurrently.
+        
+        Args:
+            video_id: YouTube video ID
+            time_ranges: List of (start, end) times in milliseconds
+            
+        Returns:
+            Downloaded clips; segments that fail to download are logged and skipped
+        """
         if not video_id or not isinstance(video_id, str):
             raise YouTubeError("Invalid video ID")
-        if not isinstance(start_time, (int, float)) or not isinstance(end_time, (int, float)):
-            raise YouTubeError("Invalid time range")
-        if start_time >= end_time:
-            raise YouTubeError("Start time must be less than end time")
-            
-        try:
-            url = f"https://www.youtube.com/watch?v={video_id}"
-            output_template = f"downloads/{video_id}_clip.%(ext)s"
-            
-            ydl_opts = {
-                'format': 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best',
-                'outtmpl': output_template,
-                'download_ranges': lambda info: [[start_time/1000, end_time/1000]],
-                'force_keyframes_at_cuts': True,
-                'postprocessors': [{
-                    'key': 'FFmpegVideoRemuxer',
-                    'preferedformat': 'mp4',
-                }],
-            }
+        for start_time, end_time in time_ranges:
+            if not isinstance(start_time, (int, float)) or not isinstance(end_time, (int, float)):
+                raise YouTubeError("Invalid time range")
+            if start_time >= end_time:
+                raise YouTubeError("Start time must be less than end time")
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                try:
-                    info = ydl.extract_info(url, download=True)
-                except yt_dlp.utils.DownloadError as e:
-                    raise YouTubeContentError(f"Failed to download video: {str(e)}")
-                    
-                downloaded_file = ydl.prepare_filename(info)
-                if not os.path.exists(downloaded_file):
-                    raise YouTubeContentError("Downloaded file not found")
-                
-                log_manager.info(
-                    logger_name,
-                    "Successfully downloaded video clip",
-                    context={
-                        "video_id": video_id,
-                        "start_time": start_time,
-                        "end_time": end_time,
-                        "file": downloaded_file
-                    }
-                )
-                
-                return {
-                    "file_path": downloaded_file,
-                    "duration": (end_time - start_time) / 1000,
-                    "video_id": video_id
-                }
-                
-        except YouTubeError:
-            raise
-        except Exception as e:
-            log_manager.error(
-                logger_name,
-                "Error downloading video clip",
-                context={
-                    "video_id": video_id,
-                    "start_time": start_time,
-                    "end_time": end_time
-                },
-                error=e
-            )
-            raise YouTubeContentError(f"Failed to download video {video_id}") from e
+        url = f"https://www.youtube.com/watch?v={video_id}"
+        return self._download_manager().download_clips(url, video_id, time_ranges)
 
     def _fetch_from_playlist(self) -> List[VideoMetadata]:
         """Fetch videos from a playlist with their metadata."""
@@ -320,6 +396,7 @@ class YouTubeAdapter(SourceAdapter):
         if self.discovery_parameters.content_selection_strategy == ContentSelectionStrategy.NON_SELECTIVE:
             try:
                 db = SessionLocal() if self.sourcing_parameters.processing_type == ContentProcessingType.MOST_REPLAYED else None
+                cache = DiscoveryCache(db, Platform.YOUTUBE) if db else None
                 next_page_token = None
                 
                 try:
@@ -331,12 +408,14 @@ class YouTubeAdapter(SourceAdapter):
                             maxResults=50,  # Maximum allowed by API
                             pageToken=next_page_token
                         )
-                        response = request.execute()
+                        response = self._execute(request, "playlistItems.list")
                         
                         if not response.get("items"):
                             break
 
                         if self.sourcing_parameters.processing_type == ContentProcessingType.MOST_REPLAYED:
+                            self._cache_snippets(cache, response["items"])
+                            
                             for item in response["items"]:
                                 video_id = item["contentDetails"]["videoId"]
                                 
@@ -349,25 +428,12 @@ class YouTubeAdapter(SourceAdapter):
                                 if posted:
                                     continue
                                 
-                                # Try to get most replayed data
-                                most_replayed_data = self._extract_most_replayed(video_id)
+                                # Try to get most replayed data (cached misses are skipped without scraping)
+                                most_replayed_data = self._most_replayed_or_skip(video_id, cache)
                                 if not most_replayed_data:
                                     continue
-                                    
-                                # Get video details
-                                # video_details = self._fetch_videos([video_id])[0]
-                                
                                 
-                                return [{
-                                    "platform": Platform.YOUTUBE.value,
-                                    "video_id": video_id,
-                                    "url": f"https://www.youtube.com/watch?v={video_id}",
-                                    "title": item["snippet"]["title"],
-                                    "description": item["snippet"]["description"],
-                                    "thumbnail": item["snippet"]["thumbnails"]["high"]["url"],
-                                    "published_at": item["snippet"]["publishedAt"],
-                                    "most_replayed_data": most_replayed_data
-                                }]
+                                return [self._playlist_item_metadata(item, most_replayed_data)]
                         else:
                             # For other content processing types
                             return []
@@ -392,166 +458,352 @@ class YouTubeAdapter(SourceAdapter):
                 )
                 raise YouTubeAPIError("Failed to fetch playlist") from e
         else:
-            return []
-            
-
-    def _fetch_videos(self, video_ids: List[str]) -> List[Dict[str, Any]]:
-        """Fetch specific videos by their IDs with full details"""
-        if not video_ids:
-            return []
+            return self._fetch_ranked_from_playlist(playlist_id)
 
+    def _fetch_ranked_from_playlist(self, playlist_id: str) -> List[VideoMetadata]:
+        """Fetch a whole playlist, enrich it with video details and rank it.
+        
+        All candidate IDs are enriched through batched videos.list calls, so
+        ranking by views or trend needs one API call per 50 videos.
+        """
+        db = SessionLocal()
+        cache = DiscoveryCache(db, Platform.YOUTUBE)
         try:
-            videos_response = (
-                self.api.videos()
-                .list(
-                    part="snippet,contentDetails,statistics",
-                    id=",".join(video_ids)
+            items = []
+            next_page_token = None
+            while True:
+                request = self.api.playlistItems().list(
+                    part="snippet,contentDetails",
+                    playlistId=playlist_id,
+                    maxResults=50,
+                    pageToken=next_page_token
                 )
-                .execute()
-            )
+                response = self._execute(request, "playlistItems.list")
+                items.extend(response.get("items", []))
+                self._cache_snippets(cache, response.get("items", []))
+                next_page_token = response.get("nextPageToken")
+                if not next_page_token:
+                    break
             
-            # we also need to put subtitles here
-            return [
-                {
-                    "platform": Platform.YOUTUBE.value,
-                    "id": video["id"],
-                    "url": f"https://www.youtube.com/watch?v={video['id']}",
-                    "title": video["snippet"]["title"],
-                    "description": video["snippet"]["description"],
-                    "thumbnail": video["snippet"]["thumbnails"]["high"]["url"],
-                    "published_at": video["snippet"]["publishedAt"],
-                    "duration": self._parse_duration(video["contentDetails"]["duration"]),
-                    "view_count": int(video["statistics"].get("viewCount", 0)),
-                    "like_count": int(video["statistics"].get("likeCount", 0)),
-                    "comment_count": int(video["statistics"].get("commentCount", 0)),
-                    "category": video["snippet"].get("categoryId")
-                }
-                for video in videos_response.get("items", [])
-            ]
-
-        except Exception as e:
+            candidates = [self._playlist_item_metadata(item) for item in items]
+            posted_urls = {
+                url for (url,) in db.query(PostedItem.source_url).filter(
+                    PostedItem.content_flow_id == self.content_flow_id,
+                    PostedItem.source_url.in_([c["url"] for c in candidates])
+                )
+            }
+            candidates = [c for c in candidates if c["url"] not in posted_urls]
+            candidates = self._rank_candidates(self._enrich_candidates(candidates, cache))
+            
+            if self.sourcing_parameters.processing_type == ContentProcessingType.MOST_REPLAYED:
+                for candidate in candidates:
+                    most_replayed_data = self._most_replayed_or_skip(candidate["video_id"], cache)
+                    if most_replayed_data:
+                        candidate["most_replayed_data"] = most_replayed_data
+                        return [candidate]
+                return []
+            
+            return candidates[:self.discovery_parameters.max_items]
+            
+        except HttpError as e:
             log_manager.error(
                 logger_name,
-                "Error fetching videos",
-                context={"video_ids": video_ids},
+                "Error fetching playlist",
+                context={"playlist_id": playlist_id},
                 error=e
             )
-            raise YouTubeAPIError("Failed to fetch videos") from e
+            raise YouTubeAPIError("Failed to fetch playlist") from e
+        finally:
+            db.close()
+
+    def _playlist_item_metadata(self, item: Dict[str, Any], most_replayed_data: Optional[Dict[str, Any]] = None) -> VideoMetadata:
+        """Build video metadata from a playlistItems resource."""
+        video_id = item["contentDetails"]["videoId"]
+        return {
+            "platform": Platform.YOUTUBE.value,
+            "video_id": video_id,
+            "url": f"https://www.youtube.com/watch?v={video_id}",
+            "title": item["snippet"]["title"],
+            "description": item["snippet"]["description"],
+            "thumbnail": item["snippet"]["thumbnails"]["high"]["url"],
+            "published_at": item["snippet"]["publishedAt"],
+            "most_replayed_data": most_replayed_data
+        }
+
+    def _enrich_candidates(self, candidates: List[VideoMetadata], cache: Optional[DiscoveryCache] = None) -> List[VideoMetadata]:
+        """Add duration and statistics to candidates and drop unavailable videos.
+        
+        Candidates longer than max_duration (when set) are dropped as well.
+        """
+        details = {
+            video["id"]: video
+            for video in self._fetch_videos([c["video_id"] for c in candidates], cache)
+        }
+        max_duration = self.sourcing_parameters.max_duration
+        
+        enriched = []
+        for candidate in candidates:
+            video = details.get(candidate["video_id"])
+            if not video:
+                continue
+            if max_duration and video["duration"] > max_duration:
+                continue
+            candidate.update({
+                "duration": video["duration"],
+                "view_count": video["view_count"],
+                "like_count": video["like_count"],
+                "comment_count": video["comment_count"],
+            })
+            enriched.append(candidate)
+        return enriched
+
+    def _rank_candidates(self, candidates: List[VideoMetadata]) -> List[VideoMetadata]:
+        """Order candidates according to the content selection strategy."""
+        strategy = self.discovery_parameters.content_selection_strategy
+        if strategy == ContentSelectionStrategy.MOST_VIEWED:
+            return sorted(candidates, key=lambda c: c.get("view_count", 0), reverse=True)
+        if strategy == ContentSelectionStrategy.TRENDING:
+            # Views per hour since publication favours videos gaining traction now
+            now = datetime.now(timezone.utc)
+            def views_per_hour(candidate):
+                published_at = datetime.fromisoformat(candidate["published_at"].replace("Z", "+00:00"))
+                age_hours = max((now - published_at).total_seconds() / 3600, 1)
+                return candidate.get("view_count", 0) / age_hours
+            return sorted(candidates, key=views_per_hour, reverse=True)
+        if strategy == ContentSelectionStrategy.MOST_RECENT:
+            return sorted(candidates, key=lambda c: c["published_at"], reverse=True)
+        if strategy == ContentSelectionStrategy.RANDOM:
+            return random.sample(candidates, len(candidates))
+        return candidates
+
+    def _cache_snippets(self, cache: Optional[DiscoveryCache], items: List[Dict[str, Any]]) -> None:
+        """Store snippets from a page of playlist items that are not already cached."""
+        if not cache:
+            return
+        snippets = {item["contentDetails"]["videoId"]: item["snippet"] for item in items}
+        cached = cache.get_many(snippets.keys(), "snippet")
+        cache.set_many(
+            "snippet",
+            {video_id: snippet for video_id, snippet in snippets.items() if video_id not in cached}
+        )
+
+    def _fetch_videos(self, video_ids: List[str], cache: Optional[DiscoveryCache] = None) -> List[Dict[str, Any]]:
+        """Fetch specific videos by their IDs with full details.
+        
+        Args:
+            video_ids: YouTube video IDs
+            cache: Optional discovery cache; cached videos are not requested again
+            
+        Returns:
+            List of video details in the order of video_ids, skipping unavailable videos
+        """
+        if not video_ids:
+            return []
+
+        cached = cache.get_many(video_ids, "statistics") if cache else {}
+        missing_ids = [video_id for video_id in dict.fromkeys(video_ids) if video_id not in cached]
+        details = dict(cached)
+
+        if missing_ids:
+            batches = [
+                missing_ids[i:i + VIDEOS_LIST_MAX_IDS]
+                for i in range(0, len(missing_ids), VIDEOS_LIST_MAX_IDS)
+            ]
+            try:
+                if len(batches) == 1:
+                    fetched = self._fetch_video_batch(batches[0])
+                else:
+                    # The API client's default http object is not thread safe,
+                    # so each concurrent batch executes on its own connection
+                    fetched = {}
+                    workers = min(len(batches), settings.YOUTUBE_ENRICHMENT_WORKERS)
+                    with ThreadPoolExecutor(max_workers=workers) as executor:
+                        for batch_result in executor.map(
+                            lambda batch: self._fetch_video_batch(batch, http=httplib2.Http()),
+                            batches
+                        ):
+                            fetched.update(batch_result)
+
+            except YouTubeQuotaError:
+                raise
+            except Exception as e:
+                log_manager.error(
+                    logger_name,
+                    "Error fetching videos",
+                    context={"video_ids": missing_ids},
+                    error=e
+                )
+                raise YouTubeAPIError("Failed to fetch videos") from e
+
+            if cache:
+                # Videos the API did not return (deleted or private) are cached as negative entries
+                cache.set_many("statistics", {video_id: fetched.get(video_id) for video_id in missing_ids})
+            details.update(fetched)
+
+        return [details[video_id] for video_id in dict.fromkeys(video_ids) if details.get(video_id)]
+
+    def _fetch_video_batch(self, video_ids: List[str], http: Optional[httplib2.Http] = None) -> Dict[str, Dict[str, Any]]:
+        """Fetch details for up to 50 videos with a single videos.list call.
+        
+        Args:
+            video_ids: At most VIDEOS_LIST_MAX_IDS video IDs
+            http: Optional http object to execute the request with
+            
+        Returns:
+            Dictionary of video ID to video details
+        """
+        request = self.api.videos().list(
+            part="snippet,contentDetails,statistics",
+            id=",".join(video_ids)
+        )
+        videos_response = self._execute(request, "videos.list", http=http)
+        
+        # we also need to put subtitles here
+        return {
+            video["id"]: {
+                "platform": Platform.YOUTUBE.value,
+                "id": video["id"],
+                "url": f"https://www.youtube.com/watch?v={video['id']}",
+                "title": video["snippet"]["title"],
+                "description": video["snippet"]["description"],
+                "thumbnail": video["snippet"]["thumbnails"]["high"]["url"],
+                "published_at": video["snippet"]["publishedAt"],
+                "duration": self._parse_duration(video["contentDetails"]["duration"]),
+                "view_count": int(video["statistics"].get("viewCount", 0)),
+                "like_count": int(video["statistics"].get("likeCount", 0)),
+                "comment_count": int(video["statistics"].get("commentCount", 0)),
+                "category": video["snippet"].get("categoryId")
+            }
+            for video in videos_response.get("items", [])
+        }
 
     def _parse_duration(self, duration: str) -> int:
         """Parse YouTube duration format (ISO 8601) to seconds"""
         return int(parse_duration(duration).total_seconds())
 
-    def _extract_most_replayed(self, video_id: str) -> Optional[Dict[str, Any]]:
-        """Extract most replayed data from a YouTube video"""
+    def _scrape_most_replayed(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """Scrape the raw most replayed heatmap from a YouTube video page.
+        
+        Returns:
+            The raw markersList, or None if the video has no most replayed data
+            
+        Raises:
+            YouTubeContentError: If the page cannot be fetched or parsed. Such
+                failures are usually transient (consent or bot-check pages), so
+                they are raised instead of being cached as a missing heatmap.
+        """
+        url = f"https://www.youtube.com/watch?v={video_id}"
+        headers = {'Accept-Language': 'en-US,en;q=0.9'}
+        
+        try:
+            response = requests.get(url, headers=headers)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            raise YouTubeContentError(f"Failed to fetch video page: {str(e)}")
+        
+        soup = BeautifulSoup(response.text, "html.parser")
+        script_tag = soup.find("script", string=re.compile("var ytInitialData = "))
+        if not script_tag:
+            raise YouTubeContentError(f"No ytInitialData found in page of {video_id}")
+            
+        try:
+            ytInitialData_str = re.search(r"var ytInitialData = ({.*?});", script_tag.string).group(1)
+            json_data = json.loads(ytInitialData_str)
+        except (AttributeError, json.JSONDecodeError) as e:
+            raise YouTubeContentError(f"Failed to parse most replayed data: {str(e)}")
+            
+        try:
+            return json_data['frameworkUpdates']['entityBatchUpdate']['mutations'][0]['payload']['macroMarkersListEntity']['markersList']
+        except (KeyError, IndexError, TypeError):
+            log_manager.info(
+                logger_name,
+                "Video has no most replayed data",
+                context={"video_id": video_id}
+            )
+            return None
+
+    def _most_replayed_or_skip(self, video_id: str, cache: Optional[DiscoveryCache] = None) -> Optional[Dict[str, Any]]:
+        """Most replayed data of a candidate, or None so a page that failed to load only skips that video.
+
+        The failure is not cached, so the video is tried again on the next sweep.
+        """
+        try:
+            return self._extract_most_replayed(video_id, cache)
+        except YouTubeContentError as e:
+            log_manager.warning(
+                logger_name,
+                "Skipping video, most replayed data unavailable",
+                context={"video_id": video_id, "error": str(e)}
+            )
+            return None
+
+    def _extract_most_replayed(self, video_id: str, cache: Optional[DiscoveryCache] = None) -> Optional[Dict[str, Any]]:
+        """Extract most replayed data from a YouTube video.
+        
+        The raw heatmap is read from the discovery cache when available, so
+        videos without a heatmap are only scraped once per negative TTL.
+        """
         if not video_id or not isinstance(video_id, str):
             raise YouTubeError("Invalid video ID")
             
         try:
-            url = f"https://www.youtube.com/watch?v={video_id}"
-            headers = {'Accept-Language': 'en-US,en;q=0.9'}
-            
-            try:
-                response = requests.get(url, headers=headers)
-                response.raise_for_status()
-            except requests.RequestException as e:
-                raise YouTubeContentError(f"Failed to fetch video page: {str(e)}")
+            if cache:
+                try:
+                    most_replayed = cache.get(video_id, "most_replayed")
+                except CacheMiss:
+                    most_replayed = self._scrape_most_replayed(video_id)
+                    cache.set(video_id, "most_replayed", most_replayed)
+            else:
+                most_replayed = self._scrape_most_replayed(video_id)
             
-            soup = BeautifulSoup(response.text, "html.parser")
-            script_tag = soup.find("script", string=re.compile("var ytInitialData = "))
-            if not script_tag:
-                log_manager.warning(
-                    logger_name,
-                    "No ytInitialData found in page",
-                    context={"video_id": video_id}
-                )
+            if not most_replayed:
                 return None
-                
-            try:
-                ytInitialData_str = re.search(r"var ytInitialData = ({.*?});", script_tag.string).group(1)
-                json_data = json.loads(ytInitialData_str)
-                most_replayed = json_data['frameworkUpdates']['entityBatchUpdate']['mutations'][0]['payload']['macroMarkersListEntity']['markersList']
-            except (AttributeError, KeyError, IndexError, json.JSONDecodeError) as e:
-                raise YouTubeContentError(f"Failed to parse most replayed data: {str(e)}")
+            most_replayed = copy.deepcopy(most_replayed)
             
             # Process markers
-            for marker in most_replayed['markers']:
+            markers = most_replayed['markers']
+            duration_ms = max(
+                (int(m['startMillis']) + int(m.get('durationMillis', 0)) for m in markers),
+                default=0
+            )
+            for marker in markers:
                 marker.pop('durationMillis', None)
                 marker['startMillis'] = int(marker['startMillis'])
+            starts, intensities = markers_to_arrays(markers)
             
             # Handle timedMarkerDecorations
             if 'markersDecoration' in most_replayed and 'timedMarkerDecorations' in most_replayed['markersDecoration']:
-                timed_decorations = most_replayed['markersDecoration']['timedMarkerDecorations']
-                
-                # Create a list of decorations with their max intensity
-                decorations_with_intensity = []
-                for dec in timed_decorations:
-                    start_ms = dec.get('visibleTimeRangeStartMillis')
-                    end_ms = dec.get('visibleTimeRangeEndMillis')
-                    
-                    # Find markers that fall within this time range
-                    range_markers = [
-                        m for m in most_replayed['markers']
-                        if start_ms <= m['startMillis'] <= end_ms
-                    ]
-                    
-                    # Get the maximum intensity in this range
-                    max_intensity = max(
-                        (m['intensityScoreNormalized'] for m in range_markers),
-                        default=0
-                    )
-                    
-                    decorations_with_intensity.append({
-                        'decoration': {
-                            'visibleTimeRangeStartMillis': start_ms,
-                            'visibleTimeRangeEndMillis': end_ms
-                        },
-                        'max_intensity': max_intensity
-                    })
-                
-                # Sort by intensity (highest first) and extract just the decorations
-                sorted_decorations = [
-                    d['decoration'] 
-                    for d in sorted(
-                        decorations_with_intensity,
-                        key=lambda x: x['max_intensity'],
-                        reverse=True
-                    )
+                timed_decorations = [
+                    {
+                        'visibleTimeRangeStartMillis': int(dec['visibleTimeRangeStartMillis']),
+                        'visibleTimeRangeEndMillis': int(dec['visibleTimeRangeEndMillis'])
+                    }
+                    for dec in most_replayed['markersDecoration']['timedMarkerDecorations']
                 ]
                 
-                most_replayed['timedMarkerDecorations'] = sorted_decorations
+                # Sort by the maximum intensity inside each decoration (highest first)
+                max_intensities = decoration_intensities(starts, intensities, timed_decorations)
+                order = np.argsort(-max_intensities, kind="stable")
+                most_replayed['timedMarkerDecorations'] = [timed_decorations[i] for i in order]
             else:
-                # Generate our own most replayed section based on intensity scores
-                markers = most_replayed['markers']
                 if not markers:
                     return None
                     
-                # Find the highest intensity section
-                max_intensity = max(markers, key=lambda x: x['intensityScoreNormalized'])
-                max_index = markers.index(max_intensity)
-                peak_time = max_intensity['startMillis']
-                
-                # Get video duration from markers (last marker's start time)
-                duration_ms = markers[-1]['startMillis']
-                
-                # Create a 30-second window centered around the peak
-                window_ms = 30000  # 30 seconds in milliseconds
-                half_window = window_ms // 2
-                
-                # Calculate start and end times with bounds checking
-                start_time = max(0, peak_time - half_window)
-                end_time = min(duration_ms, peak_time + half_window)
-                
-                # If we hit the bounds, shift the window to maintain 30 seconds
-                if start_time == 0:
-                    end_time = min(duration_ms, window_ms)
-                elif end_time == duration_ms:
-                    start_time = max(0, duration_ms - window_ms)
-                
-                most_replayed['timedMarkerDecorations'] = [{
-                    'visibleTimeRangeStartMillis': start_time,
-                    'visibleTimeRangeEndMillis': end_time
-                }]
+                # Generate our own most replayed sections from the top non-overlapping windows
+                windows = top_windows(
+                    starts,
+                    intensities,
+                    window_ms=self.sourcing_parameters.clip_duration * 1000,
+                    count=self.sourcing_parameters.max_clips_per_video,
+                    duration_ms=duration_ms
+                )
+                most_replayed['timedMarkerDecorations'] = [
+                    {
+                        'visibleTimeRangeStartMillis': start_time,
+                        'visibleTimeRangeEndMillis': end_time
+                    }
+                    for start_time, end_time, _ in windows
+                ]
             
             # Clean up unnecessary keys
             most_replayed = {
@@ -0,0 +1,196 @@
+"""Engagement metrics polling for posted items and downsampling of their history."""
+from typing import Any, Dict, List, Optional
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.orm import Session
+from src.core.credentials import CredentialCache
+from src.database.models import DestinationAccount, PostedItem, PostMetricSample
+from src.upload.base import PostMetrics, UploadError
+from src.upload.registry import UploadRegistry
+from src.logging.log_manager import LogManager
+from config import Settings
+
+settings = Settings()
+log_manager = LogManager()
+logger_name = "post-metrics"
+
+METRIC_FIELDS = ("views", "likes", "comments", "shares")
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def next_poll_at(posted_at: Optional[datetime], poll_count: int, now: datetime) -> Optional[datetime]:
+    """When to poll a post next, or None once it is too old to poll.
+
+    The delay starts at METRICS_POLL_BASE_SECONDS and doubles with every poll
+    up to METRICS_POLL_MAX_SECONDS, so fresh posts, whose numbers move fast,
+    are polled often and old posts rarely.
+    """
+    if posted_at and now - posted_at > timedelta(days=settings.METRICS_POLL_MAX_AGE_DAYS):
+        return None
+    delay = min(settings.METRICS_POLL_BASE_SECONDS * 2 ** min(poll_count, 32), settings.METRICS_POLL_MAX_SECONDS)
+    return now + timedelta(seconds=delay)
+
+
+class MetricsPoller:
+    """Polls due posted items for their metrics, one batched request per account and batch."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _due_items(self, now: datetime) -> List[PostedItem]:
+        # Posts stored before polling existed were never scheduled
+        never_scheduled = and_(
+            PostedItem.metrics_next_poll_at.is_(None),
+            PostedItem.metrics_poll_count == 0,
+            PostedItem.posted_at >= now - timedelta(days=settings.METRICS_POLL_MAX_AGE_DAYS)
+        )
+        return (
+            self.db.query(PostedItem)
+            .filter(
+                or_(PostedItem.metrics_next_poll_at <= now, never_scheduled),
+                PostedItem.destination_account_id.isnot(None),
+                PostedItem.external_id.isnot(None)
+            )
+            .order_by(PostedItem.metrics_next_poll_at.asc().nullsfirst())
+            .limit(settings.METRICS_POLL_BATCH_LIMIT)
+            .all()
+        )
+
+    def _fetch(self, account: DestinationAccount, items: List[PostedItem]) -> Dict[str, PostMetrics]:
+        """Fetch metrics keyed by the items' external IDs.
+
+        Provisional external IDs are resolved first and replaced by the post
+        ID. Items whose post can never be polled are retired.
+        """
+        uploader = UploadRegistry.get_uploader(account.platform)
+        if uploader is None:
+            return {}
+        credentials = CredentialCache().credentials_for(self.db, account)
+        resolved = uploader.resolve_post_ids(credentials, [item.external_id for item in items])
+
+        pollable = []
+        for item in items:
+            if item.external_id not in resolved:
+                continue  # Not resolvable yet, retried after the usual delay
+            post_id = resolved[item.external_id]
+            if post_id is None:
+                item.metrics_next_poll_at = None
+                item.metrics_poll_count = (item.metrics_poll_count or 0) + 1
+                log_manager.info(
+                    logger_name,
+                    "Post cannot be polled for metrics, retiring it",
+                    context={"posted_item_id": item.id, "external_id": item.external_id}
+                )
+                continue
+            item.external_id = post_id
+            pollable.append(item)
+
+        metrics: Dict[str, PostMetrics] = {}
+        batch_size = max(uploader.metrics_batch_size, 1)
+        for start in range(0, len(pollable), batch_size):
+            batch = [item.external_id for item in pollable[start:start + batch_size]]
+            metrics.update(uploader.fetch_metrics(credentials, batch))
+        return metrics
+
+    def poll(self) -> Dict[str, int]:
+        """Sample every due post and schedule its next poll.
+
+        Returns:
+            Dictionary with the number of posts polled, samples stored and failed accounts
+        """
+        now = _utcnow()
+        by_account: Dict[int, List[PostedItem]] = defaultdict(list)
+        for item in self._due_items(now):
+            by_account[item.destination_account_id].append(item)
+
+        polled = sampled = failed = 0
+        for account_id, items in by_account.items():
+            account = self.db.query(DestinationAccount).get(account_id)
+            try:
+                metrics = self._fetch(account, items) if account else {}
+            except UploadError as e:
+                failed += 1
+                log_manager.error(
+                    logger_name,
+                    "Failed to fetch post metrics",
+                    context={"destination_account_id": account_id, "posts": len(items)},
+                    error=e
+                )
+                metrics = None
+
+            samples = []
+            for item in items:
+                if metrics is not None and item.metrics_next_poll_at is None and item.metrics_poll_count:
+                    continue  # Retired by _fetch
+                item_metrics = metrics.get(item.external_id) if metrics else None
+                if item_metrics:
+                    values = {name: item_metrics.get(name) for name in METRIC_FIELDS}
+                    samples.append({"posted_item_id": item.id, "sampled_at": now, "bucket_seconds": 0, **values})
+                    # Latest values only; the history lives in post_metric_samples
+                    item.performance_metrics = {**values, "sampled_at": now.isoformat()}
+                if metrics is not None:
+                    item.metrics_poll_count = (item.metrics_poll_count or 0) + 1
+                # A failed account is retried after the delay of its posts' current poll count
+                item.metrics_next_poll_at = next_poll_at(item.posted_at, item.metrics_poll_count or 0, now)
+            if samples:
+                self.db.bulk_insert_mappings(PostMetricSample, samples)
+            self.db.commit()
+            polled += len(items)
+            sampled += len(samples)
+
+        log_manager.info(
+            logger_name,
+            "Polled post metrics",
+            context={"polled": polled, "sampled": sampled, "failed_accounts": failed}
+        )
+        return {"polled": polled, "sampled": sampled, "failed_accounts": failed}
+
+    def _downsample(self, older_than: datetime, bucket_seconds: int) -> int:
+        """Keep only the last sample per post and bucket among samples older than ``older_than``."""
+        bucket = func.floor(func.extract("epoch", PostMetricSample.sampled_at) / bucket_seconds)
+        finer = and_(
+            PostMetricSample.sampled_at < older_than,
+            PostMetricSample.bucket_seconds < bucket_seconds
+        )
+        ranked = (
+            select(
+                PostMetricSample.id,
+                func.row_number().over(
+                    partition_by=(PostMetricSample.posted_item_id, bucket),
+                    order_by=PostMetricSample.sampled_at.desc()
+                ).label("position")
+            )
+            .where(finer)
+            .subquery()
+        )
+        deleted = self.db.execute(
+            delete(PostMetricSample)
+            .where(PostMetricSample.id.in_(select(ranked.c.id).where(ranked.c.position > 1)))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        self.db.execute(
+            update(PostMetricSample)
+            .where(finer)
+            .values(bucket_seconds=bucket_seconds)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        return deleted
+
+    def downsample(self) -> Dict[str, Any]:
+        """Downsample raw samples to hourly and hourly buckets to daily ones.
+
+        Returns:
+            Dictionary with the number of samples removed per target bucket size
+        """
+        now = _utcnow()
+        removed = {
+            "hourly": self._downsample(now - timedelta(hours=settings.METRICS_RAW_RETENTION_HOURS), 60 * 60),
+            "daily": self._downsample(now - timedelta(days=settings.METRICS_HOURLY_RETENTION_DAYS), 24 * 60 * 60),
+        }
+        log_manager.info(logger_name, "Downsampled post metrics", context=removed)
+        return removed
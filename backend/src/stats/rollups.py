@@ -0,0 +1,404 @@
+"""Incrementally maintained daily statistics and the queries that read them."""
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import date, datetime, timedelta, timezone
+from sqlalchemy import func, literal, select, true, union_all
+from sqlalchemy.dialects.postgresql import Insert, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from src.database.models import (
+    ContentFlow,
+    ContentQueueItem,
+    ContentStatus,
+    DestinationAccount,
+    DestinationDailyStats,
+    DestinationPost,
+    DestinationPostStatus,
+    FlowDailyStats,
+    Platform,
+    PostedItem,
+)
+from config import Settings
+
+settings = Settings()
+
+FLOW_COUNTERS = ("sourced", "duplicates", "edited", "edit_errors", "approved", "rejected")
+# post_errors counts destinations that failed for good, not every failed attempt
+DESTINATION_COUNTERS = ("posted", "post_errors")
+
+
+def _stats_day(at: Optional[datetime] = None) -> date:
+    return (at or datetime.now(timezone.utc)).date()
+
+
+def _rate(part: float, total: float) -> Optional[float]:
+    return part / total if total else None
+
+
+def _mean(total: float, count: int) -> Optional[float]:
+    return total / count if count else None
+
+
+def flow_stats_increment(
+    content_flow_id: int,
+    source_platform: Platform,
+    edit_seconds: Optional[float] = None,
+    at: Optional[datetime] = None,
+    **counters: int
+) -> Insert:
+    """Upsert adding to a flow's counters for the day.
+
+    Execute it in the transaction that makes the counted change, so the
+    rollup never drifts from the queue.
+
+    Args:
+        content_flow_id: Flow the event belongs to
+        source_platform: Source platform of the flow
+        edit_seconds: Duration of a finished edit, added to the edit time totals
+        at: Time of the event, defaults to now
+        **counters: Increments of FLOW_COUNTERS, e.g. edited=1
+    """
+    unknown = set(counters) - set(FLOW_COUNTERS)
+    if unknown:
+        raise ValueError(f"Unknown flow counters: {', '.join(sorted(unknown))}")
+    statement = insert(FlowDailyStats).values(
+        day=_stats_day(at),
+        content_flow_id=content_flow_id,
+        source_platform=source_platform,
+        edit_seconds_total=edit_seconds or 0.0,
+        edit_seconds_max=edit_seconds or 0.0,
+        **{name: counters.get(name, 0) for name in FLOW_COUNTERS}
+    )
+    return statement.on_conflict_do_update(
+        constraint="uq_flow_daily_stats_day_flow_platform",
+        set_={
+            **{
+                name: getattr(FlowDailyStats, name) + statement.excluded[name]
+                for name in FLOW_COUNTERS + ("edit_seconds_total",)
+            },
+            "edit_seconds_max": func.greatest(FlowDailyStats.edit_seconds_max, statement.excluded.edit_seconds_max),
+            "updated_at": func.now(),
+        }
+    )
+
+
+def destination_stats_increment(
+    content_flow_id: int,
+    destination_account_id: int,
+    platform: Platform,
+    latency_seconds: Optional[float] = None,
+    at: Optional[datetime] = None,
+    **counters: int
+) -> Insert:
+    """Upsert adding to a destination account's posting counters for the day.
+
+    Args:
+        content_flow_id: Flow the post belongs to
+        destination_account_id: Account posted to
+        platform: Platform of the account
+        latency_seconds: Time from queue item creation to the post, for successful posts
+        at: Time of the event, defaults to now
+        **counters: Increments of DESTINATION_COUNTERS, e.g. posted=1
+    """
+    unknown = set(counters) - set(DESTINATION_COUNTERS)
+    if unknown:
+        raise ValueError(f"Unknown destination counters: {', '.join(sorted(unknown))}")
+    statement = insert(DestinationDailyStats).values(
+        day=_stats_day(at),
+        content_flow_id=content_flow_id,
+        destination_account_id=destination_account_id,
+        platform=platform,
+        post_latency_seconds_total=latency_seconds or 0.0,
+        post_latency_seconds_max=latency_seconds or 0.0,
+        **{name: counters.get(name, 0) for name in DESTINATION_COUNTERS}
+    )
+    return statement.on_conflict_do_update(
+        constraint="uq_destination_daily_stats_day_flow_account",
+        set_={
+            **{
+                name: getattr(DestinationDailyStats, name) + statement.excluded[name]
+                for name in DESTINATION_COUNTERS + ("post_latency_seconds_total",)
+            },
+            "post_latency_seconds_max": func.greatest(
+                DestinationDailyStats.post_latency_seconds_max,
+                statement.excluded.post_latency_seconds_max
+            ),
+            "updated_at": func.now(),
+        }
+    )
+
+
+def _day_bounds(start: date, end: date) -> Tuple[datetime, datetime]:
+    return datetime.combine(start, datetime.min.time()), datetime.combine(end + timedelta(days=1), datetime.min.time())
+
+
+def _rebuild(db: Session, model: Any, constraint: str, keys: tuple, counters: tuple, parts: List[Any]) -> int:
+    """Upsert per-day sums of ``parts``, raising each counter to at least the derived value.
+
+    Counters are never lowered: queue items are deleted once posted, so the
+    history undercounts what the live increments saw.
+    """
+    combined = union_all(*parts).subquery()
+    rows = (
+        select(*(combined.c[key] for key in keys), *(func.sum(combined.c[name]).label(name) for name in counters))
+        .group_by(*(combined.c[key] for key in keys))
+    )
+    statement = insert(model).from_select(list(keys) + list(counters), rows)
+    statement = statement.on_conflict_do_update(
+        constraint=constraint,
+        set_={
+            **{name: func.greatest(getattr(model, name), statement.excluded[name]) for name in counters},
+            "updated_at": func.now(),
+        }
+    )
+    return db.execute(statement).rowcount
+
+
+def rebuild_daily_stats(db: Session, start: date, end: date) -> Dict[str, int]:
+    """Rebuild the daily rollups of ``start``..``end`` from the queue and the posting history.
+
+    Fills days from before the rollups existed and repairs increments lost
+    to failed transactions. Duplicates, edit times and post latencies are not
+    recorded anywhere else, so they keep their incremented values.
+
+    Args:
+        db: Database session
+        start: First UTC day to rebuild
+        end: Last UTC day to rebuild, inclusive
+
+    Returns:
+        Dictionary with the number of flow and destination rows written
+    """
+    since, until = _day_bounds(start, end)
+    item = ContentQueueItem
+    flow_counters = ("sourced", "edited", "edit_errors", "approved", "rejected")
+    flow_sources = {
+        "sourced": (item.created_at, true()),
+        "edited": (item.created_at, item.edited_content_path.isnot(None)),
+        "edit_errors": (item.created_at, item.status == ContentStatus.EDITING_ERROR),
+        "approved": (item.approved_at, true()),
+        "rejected": (item.rejected_at, true()),
+    }
+    flow_parts = []
+    for counter, (at, condition) in flow_sources.items():
+        day = func.date(at)
+        flow_parts.append(
+            select(
+                day.label("day"),
+                item.content_flow_id.label("content_flow_id"),
+                item.source_platform.label("source_platform"),
+                *((func.count() if name == counter else literal(0)).label(name) for name in flow_counters)
+            )
+            .where(condition, at >= since, at < until, item.content_flow_id.isnot(None), item.source_platform.isnot(None))
+            .group_by(day, item.content_flow_id, item.source_platform)
+        )
+
+    posted_day = func.date(PostedItem.posted_at)
+    failed_day = func.date(DestinationPost.updated_at)
+    destination_parts = [
+        select(
+            posted_day.label("day"),
+            PostedItem.content_flow_id.label("content_flow_id"),
+            PostedItem.destination_account_id.label("destination_account_id"),
+            DestinationAccount.platform.label("platform"),
+            func.count().label("posted"),
+            literal(0).label("post_errors")
+        )
+        .join(DestinationAccount, DestinationAccount.id == PostedItem.destination_account_id)
+        .where(PostedItem.posted_at >= since, PostedItem.posted_at < until, PostedItem.content_flow_id.isnot(None))
+        .group_by(posted_day, PostedItem.content_flow_id, PostedItem.destination_account_id, DestinationAccount.platform),
+        select(
+            failed_day.label("day"),
+            item.content_flow_id.label("content_flow_id"),
+            DestinationPost.destination_account_id.label("destination_account_id"),
+            DestinationAccount.platform.label("platform"),
+            literal(0).label("posted"),
+            func.count().label("post_errors")
+        )
+        .join(item, item.id == DestinationPost.queue_item_id)
+        .join(DestinationAccount, DestinationAccount.id == DestinationPost.destination_account_id)
+        .where(
+            DestinationPost.status == DestinationPostStatus.FAILED,
+            DestinationPost.attempts >= settings.POST_MAX_ATTEMPTS,
+            DestinationPost.updated_at >= since,
+            DestinationPost.updated_at < until,
+            item.content_flow_id.isnot(None)
+        )
+        .group_by(failed_day, item.content_flow_id, DestinationPost.destination_account_id, DestinationAccount.platform),
+    ]
+
+    flows = _rebuild(
+        db, FlowDailyStats, "uq_flow_daily_stats_day_flow_platform",
+        ("day", "content_flow_id", "source_platform"), flow_counters, flow_parts
+    )
+    destinations = _rebuild(
+        db, DestinationDailyStats, "uq_destination_daily_stats_day_flow_account",
+        ("day", "content_flow_id", "destination_account_id", "platform"), DESTINATION_COUNTERS, destination_parts
+    )
+    db.commit()
+    return {"flow_rows": flows, "destination_rows": destinations}
+
+
+class StatsReader:
+    """Dashboard statistics read from the daily rollups.
+
+    Every query scans at most one row per day, flow and destination in the
+    window, so the cost depends on the window and not on the history size.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @staticmethod
+    def _window(days: int) -> date:
+        return _stats_day() - timedelta(days=days - 1)
+
+    async def overview(self, days: int) -> Dict[str, Any]:
+        """Totals and a per-day series of the whole pipeline."""
+        start = self._window(days)
+        flow_rows = (await self.db.execute(
+            select(
+                FlowDailyStats.day,
+                *(func.sum(getattr(FlowDailyStats, name)).label(name) for name in FLOW_COUNTERS)
+            )
+            .where(FlowDailyStats.day >= start)
+            .group_by(FlowDailyStats.day)
+        )).all()
+        destination_rows = (await self.db.execute(
+            select(
+                DestinationDailyStats.day,
+                *(func.sum(getattr(DestinationDailyStats, name)).label(name) for name in DESTINATION_COUNTERS)
+            )
+            .where(DestinationDailyStats.day >= start)
+            .group_by(DestinationDailyStats.day)
+        )).all()
+
+        series = {
+            start + timedelta(days=offset): dict.fromkeys(FLOW_COUNTERS + DESTINATION_COUNTERS, 0)
+            for offset in range(days)
+        }
+        for row in flow_rows:
+            series[row.day].update({name: int(getattr(row, name)) for name in FLOW_COUNTERS})
+        for row in destination_rows:
+            series[row.day].update({name: int(getattr(row, name)) for name in DESTINATION_COUNTERS})
+
+        totals = {
+            name: sum(day_counts[name] for day_counts in series.values())
+            for name in FLOW_COUNTERS + DESTINATION_COUNTERS
+        }
+        return {
+            "days": days,
+            "totals": {
+                **totals,
+                "edit_error_rate": _rate(totals["edit_errors"], totals["edited"] + totals["edit_errors"]),
+                "post_error_rate": _rate(totals["post_errors"], totals["posted"] + totals["post_errors"]),
+                "duplicate_rate": _rate(totals["duplicates"], totals["sourced"] + totals["duplicates"]),
+            },
+            "daily": [{"day": day.isoformat(), **counts} for day, counts in sorted(series.items())],
+        }
+
+    async def performance(self, days: int) -> List[Dict[str, Any]]:
+        """Editing and posting performance per flow."""
+        start = self._window(days)
+        flow_rows = (await self.db.execute(
+            select(
+                FlowDailyStats.content_flow_id,
+                ContentFlow.name,
+                *(func.sum(getattr(FlowDailyStats, name)).label(name) for name in FLOW_COUNTERS),
+                func.sum(FlowDailyStats.edit_seconds_total).label("edit_seconds_total"),
+                func.max(FlowDailyStats.edit_seconds_max).label("edit_seconds_max"),
+            )
+            .join(ContentFlow, ContentFlow.id == FlowDailyStats.content_flow_id)
+            .where(FlowDailyStats.day >= start)
+            .group_by(FlowDailyStats.content_flow_id, ContentFlow.name)
+        )).all()
+        posting = {
+            row.content_flow_id: row
+            for row in (await self.db.execute(
+                select(
+                    DestinationDailyStats.content_flow_id,
+                    *(func.sum(getattr(DestinationDailyStats, name)).label(name) for name in DESTINATION_COUNTERS),
+                    func.sum(DestinationDailyStats.post_latency_seconds_total).label("latency_total"),
+                    func.max(DestinationDailyStats.post_latency_seconds_max).label("latency_max"),
+                )
+                .where(DestinationDailyStats.day >= start)
+                .group_by(DestinationDailyStats.content_flow_id)
+            )).all()
+        }
+
+        flows = []
+        for row in flow_rows:
+            post = posting.get(row.content_flow_id)
+            posted = int(post.posted) if post else 0
+            post_errors = int(post.post_errors) if post else 0
+            reviewed = int(row.approved) + int(row.rejected)
+            flows.append({
+                "content_flow_id": row.content_flow_id,
+                "name": row.name,
+                **{name: int(getattr(row, name)) for name in FLOW_COUNTERS},
+                "avg_edit_seconds": _mean(float(row.edit_seconds_total), int(row.edited)),
+                "max_edit_seconds": float(row.edit_seconds_max) if row.edited else None,
+                "edit_error_rate": _rate(int(row.edit_errors), int(row.edited) + int(row.edit_errors)),
+                "approval_rate": _rate(int(row.approved), reviewed),
+                "posted": posted,
+                "post_errors": post_errors,
+                "post_error_rate": _rate(post_errors, posted + post_errors),
+                "avg_post_latency_seconds": _mean(float(post.latency_total), posted) if post else None,
+                "max_post_latency_seconds": float(post.latency_max) if posted else None,
+            })
+        return flows
+
+    async def destinations(self, days: int) -> Dict[str, Any]:
+        """Posting results per destination account and per platform."""
+        start = self._window(days)
+        rows = (await self.db.execute(
+            select(
+                DestinationDailyStats.destination_account_id,
+                DestinationAccount.name,
+                DestinationDailyStats.platform,
+                *(func.sum(getattr(DestinationDailyStats, name)).label(name) for name in DESTINATION_COUNTERS),
+                func.sum(DestinationDailyStats.post_latency_seconds_total).label("latency_total"),
+                func.max(DestinationDailyStats.post_latency_seconds_max).label("latency_max"),
+            )
+            .join(DestinationAccount, DestinationAccount.id == DestinationDailyStats.destination_account_id)
+            .where(DestinationDailyStats.day >= start)
+            .group_by(
+                DestinationDailyStats.destination_account_id,
+                DestinationAccount.name,
+                DestinationDailyStats.platform
+            )
+        )).all()
+
+        accounts = []
+        platforms: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            posted, post_errors = int(row.posted), int(row.post_errors)
+            accounts.append({
+                "destination_account_id": row.destination_account_id,
+                "name": row.name,
+                "platform": row.platform.value,
+                "posted": posted,
+                "post_errors": post_errors,
+                "post_error_rate": _rate(post_errors, posted + post_errors),
+                "avg_post_latency_seconds": _mean(float(row.latency_total), posted),
+                "max_post_latency_seconds": float(row.latency_max) if posted else None,
+            })
+            platform = platforms.setdefault(
+                row.platform.value, {"posted": 0, "post_errors": 0, "latency_total": 0.0}
+            )
+            platform["posted"] += posted
+            platform["post_errors"] += post_errors
+            platform["latency_total"] += float(row.latency_total)
+
+        return {
+            "days": days,
+            "accounts": accounts,
+            "platforms": {
+                name: {
+                    "posted": totals["posted"],
+                    "post_errors": totals["post_errors"],
+                    "post_error_rate": _rate(totals["post_errors"], totals["posted"] + totals["post_errors"]),
+                    "avg_post_latency_seconds": _mean(totals["latency_total"], totals["posted"]),
+                }
+                for name, totals in platforms.items()
+            },
+        }
@@ -0,0 +1,316 @@
+"""Garbage collection for source, intermediate and edited media."""
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from datetime import datetime, timedelta, timezone
+import os
+import shutil
+import time
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from src.database.models import ContentFingerprint, ContentQueueItem, PostedItem, SourceMedia
+from src.storage.media_store import TEMP_PREFIX, file_lock
+from src.logging.log_manager import LogManager
+from config import Settings
+
+settings = Settings()
+log_manager = LogManager()
+logger_name = "storage-gc"
+
+CURSOR_FILE = ".gc_cursor"
+
+
+class StorageGarbageCollector:
+    """Deletes media under STORAGE_PATH that no live row references.
+
+    Files are visited in a stable order, in batches of GC_BATCH_SIZE. Each batch
+    is checked against the database with a few IN queries and the collector
+    pauses between batches so it never monopolises disk I/O. A run stops after
+    GC_MAX_BATCHES and saves a cursor, so the next run continues where this one
+    stopped.
+
+    A file is deleted when it is older than the minimum age and is either:
+    - not referenced by any queue item, posted item or source media row
+      (intermediates such as _trimmed, _audio.wav, .srt and _list.txt files),
+    - source media unused for the minimum age that no queue item and no item
+      posted within GC_POSTED_RETENTION_DAYS references,
+    - edited media of an item posted more than GC_POSTED_RETENTION_DAYS ago, or
+    - a platform rendition unused for GC_RENDITION_MAX_AGE_SECONDS.
+    Source media is deleted under the media store's lock of the file and
+    rechecked there, so a concurrent fetch either finds the file or produces
+    it again. Lock files are never deleted. Directories that are empty and older than the minimum age,
+    e.g. leftover download temp directories and shards, are removed too.
+    When free disk space falls below GC_MIN_FREE_FRACTION, the shorter
+    GC_PRESSURE_MIN_AGE_SECONDS is used instead of the usual minimum age.
+    """
+
+    def __init__(self, db: Session, root: Optional[str] = None):
+        self.db = db
+        self.root = root or settings.STORAGE_PATH
+        self.cursor_path = os.path.join(self.root, CURSOR_FILE)
+
+    def _read_cursor(self) -> Optional[Tuple[str, ...]]:
+        try:
+            with open(self.cursor_path) as f:
+                cursor = f.read().strip()
+        except FileNotFoundError:
+            return None
+        return tuple(cursor.split("/")) if cursor else None
+
+    def _write_cursor(self, cursor: Optional[Tuple[str, ...]]) -> None:
+        if cursor is None:
+            if os.path.exists(self.cursor_path):
+                os.remove(self.cursor_path)
+            return
+        with open(self.cursor_path, "w") as f:
+            f.write("/".join(cursor))
+
+    def _walk(
+        self,
+        directory: str,
+        rel_parts: Tuple[str, ...],
+        cursor: Optional[Tuple[str, ...]]
+    ) -> Iterator[Tuple[Tuple[str, ...], os.DirEntry]]:
+        """Yield files and empty directories in lexicographic path order, starting after ``cursor``.
+
+        Store roots directly below the storage root are never yielded. A
+        directory emptied by this pass is yielded on the next one.
+        """
+        try:
+            entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            parts = rel_parts + (entry.name,)
+            if cursor and parts < cursor[:len(parts)]:
+                continue  # Entirely before the cursor
+            if entry.is_dir(follow_symlinks=False):
+                try:
+                    empty = next(os.scandir(entry.path), None) is None
+                except FileNotFoundError:
+                    continue
+                if not empty:
+                    yield from self._walk(entry.path, parts, cursor)
+                elif rel_parts and not (cursor and parts <= cursor):
+                    yield parts, entry
+            elif entry.is_file(follow_symlinks=False):
+                if cursor and parts <= cursor:
+                    continue
+                if rel_parts == () and entry.name == CURSOR_FILE:
+                    continue
+                yield parts, entry
+
+    def _min_age(self) -> timedelta:
+        """Minimum file age before deletion, shortened when the disk is nearly full."""
+        usage = shutil.disk_usage(self.root)
+        if usage.free / usage.total < settings.GC_MIN_FREE_FRACTION:
+            return timedelta(seconds=settings.GC_PRESSURE_MIN_AGE_SECONDS)
+        return timedelta(seconds=settings.GC_MIN_AGE_SECONDS)
+
+    def _retention_cutoff(self) -> datetime:
+        return (
+            datetime.now(timezone.utc) - timedelta(days=settings.GC_POSTED_RETENTION_DAYS)
+        ).replace(tzinfo=None)
+
+    def _live_media(self, media_ids: List[int], min_age: timedelta) -> Set[int]:
+        """Subset of ``media_ids`` that must be kept.
+
+        Media is live while it was used within the minimum age, or a queue item
+        or an item posted within GC_POSTED_RETENTION_DAYS references it.
+        """
+        if not media_ids:
+            return set()
+        used_cutoff = (datetime.now(timezone.utc) - min_age).replace(tzinfo=None)
+        live = {
+            media_id for (media_id,) in self.db.query(SourceMedia.id).filter(
+                SourceMedia.id.in_(media_ids),
+                SourceMedia.last_used_at >= used_cutoff
+            )
+        }
+        live.update(
+            media_id for (media_id,) in self.db.query(ContentQueueItem.source_media_id)
+            .filter(ContentQueueItem.source_media_id.in_(media_ids))
+            .distinct()
+        )
+        live.update(
+            media_id for (media_id,) in self.db.query(PostedItem.source_media_id)
+            .filter(
+                PostedItem.source_media_id.in_(media_ids),
+                PostedItem.posted_at >= self._retention_cutoff()
+            )
+            .distinct()
+        )
+        return live
+
+    def _live_paths(self, paths: List[str]) -> Set[str]:
+        """Subset of ``paths`` that must be kept because a live row references them.
+
+        Source media is left to _live_media; its paths are never returned here.
+        """
+        live = set()
+        queue_rows = (
+            self.db.query(ContentQueueItem.edited_content_path, ContentQueueItem.preview_path)
+            .filter(or_(
+                ContentQueueItem.edited_content_path.in_(paths),
+                ContentQueueItem.preview_path.in_(paths)
+            ))
+        )
+        for edited_path, preview_path in queue_rows:
+            live.update({edited_path, preview_path})
+
+        live.update(
+            path for (path,) in self.db.query(PostedItem.edited_content_path).filter(
+                PostedItem.edited_content_path.in_(paths),
+                PostedItem.posted_at >= self._retention_cutoff()
+            )
+        )
+        return live
+
+    def _delete_media(self, media_id: int, path: str, min_age: timedelta) -> bool:
+        """Delete a source media file and its row under the media store's lock.
+
+        The lock serialises with SourceMediaStore.fetch, and liveness is checked
+        again while holding it, so media a worker just fetched or attached to
+        an item is never deleted.
+        """
+        with file_lock(f"{path}.lock"):
+            if self._live_media([media_id], min_age):
+                self.db.rollback()
+                return False
+            # Old posted items and fingerprints only remember which media they came from
+            for model in (PostedItem, ContentFingerprint):
+                self.db.query(model).filter(model.source_media_id == media_id).update(
+                    {model.source_media_id: None}, synchronize_session=False
+                )
+            self.db.query(SourceMedia).filter(SourceMedia.id == media_id).delete(synchronize_session=False)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self.db.commit()
+        return True
+
+    def _remove_directory(self, path: str, age: float, min_age: timedelta) -> bool:
+        """Remove an empty directory, e.g. a download temp directory left by a crashed worker."""
+        required_age = min_age.total_seconds()
+        if os.path.basename(path).startswith(TEMP_PREFIX):
+            # A producer may still be about to write into it, so disk pressure does not shorten the wait
+            required_age = max(required_age, settings.GC_MIN_AGE_SECONDS)
+        if age < required_age:
+            return False
+        try:
+            os.rmdir(path)
+        except OSError:
+            return False  # Not empty anymore, or already gone
+        return True
+
+    def _collect_batch(self, batch: List[Tuple[str, os.DirEntry]], min_age: timedelta) -> Dict[str, int]:
+        """Delete the unreferenced, old enough files and empty directories of one batch."""
+        now = time.time()
+        renditions_root = os.path.abspath(settings.RENDITIONS_PATH) + os.sep
+        candidates = {}
+        directories = 0
+        for path, entry in batch:
+            if path.endswith(".lock"):
+                # A download creates its lock before the media, and a lock file
+                # replaced under a waiting worker would let a second producer in
+                continue
+            try:
+                stat = entry.stat(follow_symlinks=False)
+            except FileNotFoundError:
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                directories += self._remove_directory(path, now - stat.st_mtime, min_age)
+                continue
+            required_age = min_age.total_seconds()
+            if os.path.abspath(path).startswith(renditions_root):
+                # Renditions are never referenced by rows; cache hits refresh their mtime
+                required_age = max(required_age, settings.GC_RENDITION_MAX_AGE_SECONDS)
+            if now - stat.st_mtime < required_age:
+                continue
+            candidates[path] = stat.st_size
+        if not candidates:
+            return {"deleted": 0, "reclaimed_bytes": 0, "directories": directories}
+
+        # Stored paths may be relative to the working directory or absolute
+        lookup = {}
+        for path in candidates:
+            lookup[path] = path
+            lookup[os.path.abspath(path)] = path
+        live = {lookup[path] for path in self._live_paths(list(lookup)) if path in lookup}
+
+        media = {
+            lookup[path]: media_id for media_id, path in
+            self.db.query(SourceMedia.id, SourceMedia.file_path).filter(SourceMedia.file_path.in_(list(lookup)))
+        }
+        live_media = self._live_media(list(media.values()), min_age)
+        live.update(path for path, media_id in media.items() if media_id in live_media)
+        self.db.rollback()  # Do not hold a snapshot while deleting
+
+        deleted = 0
+        reclaimed = 0
+        for path, size in candidates.items():
+            if path in live:
+                continue
+            if path in media:
+                if not self._delete_media(media[path], path, min_age):
+                    continue
+            else:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    continue
+            deleted += 1
+            reclaimed += size
+        return {"deleted": deleted, "reclaimed_bytes": reclaimed, "directories": directories}
+
+    def run(self, max_batches: Optional[int] = None) -> Dict[str, Any]:
+        """Run one incremental collection pass.
+
+        Args:
+            max_batches: Batches to process before stopping (default GC_MAX_BATCHES)
+
+        Returns:
+            Dictionary with scanned and deleted file counts, reclaimed_bytes,
+            removed directories and whether the walk reached the end of the
+            storage tree
+        """
+        max_batches = max_batches or settings.GC_MAX_BATCHES
+        min_age = self._min_age()
+        cursor = self._read_cursor()
+        report = {"scanned": 0, "deleted": 0, "reclaimed_bytes": 0, "directories": 0, "complete": True}
+
+        batch: List[Tuple[str, os.DirEntry]] = []
+        batches = 0
+        for parts, entry in self._walk(self.root, (), cursor):
+            batch.append((os.path.join(self.root, *parts), entry))
+            cursor = parts
+            if len(batch) < settings.GC_BATCH_SIZE:
+                continue
+
+            result = self._collect_batch(batch, min_age)
+            report["scanned"] += len(batch)
+            report["deleted"] += result["deleted"]
+            report["reclaimed_bytes"] += result["reclaimed_bytes"]
+            report["directories"] += result["directories"]
+            batch = []
+            batches += 1
+            if batches >= max_batches:
+                report["complete"] = False
+                break
+            time.sleep(settings.GC_BATCH_PAUSE_SECONDS)
+
+        if batch:
+            result = self._collect_batch(batch, min_age)
+            report["scanned"] += len(batch)
+            report["deleted"] += result["deleted"]
+            report["reclaimed_bytes"] += result["reclaimed_bytes"]
+            report["directories"] += result["directories"]
+
+        # A complete pass starts again from the beginning next time
+        self._write_cursor(None if report["complete"] else cursor)
+
+        log_manager.info(
+            logger_name,
+            "Storage garbage collection finished",
+            context=report
+        )
+        return report
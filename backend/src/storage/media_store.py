@@ -0,0 +1,205 @@
+"""Content-addressed store for downloaded source media."""
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from contextlib import contextmanager
+import fcntl
+import hashlib
+import os
+import shutil
+import tempfile
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+from src.database.models import ContentQueueItem, Platform, PostedItem, SourceMedia
+from src.database.session import SessionLocal
+from src.storage.paths import sharded_path
+from src.logging.log_manager import LogManager
+from config import Settings
+
+settings = Settings()
+log_manager = LogManager()
+logger_name = "media-store"
+
+TEMP_PREFIX = ".tmp-"  # Prefix of in-progress download directories
+
+
+class MediaStoreError(Exception):
+    """Raised when media cannot be produced or stored."""
+    pass
+
+
+def media_key(
+    platform: str,
+    source_id: str,
+    time_range: Optional[Tuple[int, int]],
+    fmt: str,
+    variant: str = ""
+) -> str:
+    """Content address for a piece of source media.
+
+    Args:
+        platform: Platform name, e.g. "youtube"
+        source_id: Platform video/post ID
+        time_range: (start, end) in milliseconds, or None for the full video
+        fmt: Output container format, e.g. "mp4"
+        variant: Anything else that changes the produced bytes, e.g. quality
+    """
+    range_part = f"{time_range[0]}-{time_range[1]}" if time_range else "full"
+    return hashlib.sha256(f"{platform}:{source_id}:{range_part}:{fmt}:{variant}".encode()).hexdigest()
+
+
+@contextmanager
+def file_lock(path: str):
+    """Exclusive advisory lock on ``path``.
+
+    flock locks belong to the open file description, so the lock serialises
+    threads in this process as well as other worker processes.
+    """
+    with open(path, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class SourceMediaStore:
+    """Shared store of source media addressed by (platform, ID, range, format).
+
+    Concurrent requests for the same media wait on a single producer. Producers
+    write into a private temp directory and the result is renamed into place,
+    so readers never observe a partially written file.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or settings.SOURCE_CONTENT_PATH
+
+    def path_for(self, platform: str, source_id: str, key: str, fmt: str) -> str:
+        """Final path of a media file in the sharded layout."""
+        return sharded_path(self.root, platform, key, f"{source_id}_{key[:16]}.{fmt}")
+
+    def fetch(
+        self,
+        platform: str,
+        source_id: str,
+        time_range: Optional[Tuple[int, int]],
+        fmt: str,
+        producer: Callable[[str], str],
+        variant: str = ""
+    ) -> Dict[str, Any]:
+        """Return stored media, producing it first if it does not exist yet.
+
+        Args:
+            platform: Platform name, e.g. "youtube"
+            source_id: Platform video/post ID
+            time_range: (start, end) in milliseconds, or None for the full video
+            fmt: Output container format
+            producer: Called with a temp directory; must write the media there
+                and return the path of the produced file
+            variant: Anything else that changes the produced bytes, e.g. quality
+
+        Returns:
+            Dictionary with file_path, source_media_id and source_media_key
+
+        Raises:
+            MediaStoreError: If the producer fails or produces no file
+        """
+        key = media_key(platform, source_id, time_range, fmt, variant)
+        final_path = self.path_for(platform, source_id, key, fmt)
+        directory = os.path.dirname(final_path)
+        os.makedirs(directory, exist_ok=True)
+
+        with file_lock(f"{final_path}.lock"):
+            if not os.path.exists(final_path):
+                temp_dir = tempfile.mkdtemp(prefix=TEMP_PREFIX, dir=directory)
+                try:
+                    produced_path = producer(temp_dir)
+                    if not produced_path or not os.path.exists(produced_path):
+                        raise MediaStoreError(f"Producer did not create media for {source_id}")
+                    os.replace(produced_path, final_path)
+                except MediaStoreError:
+                    raise
+                except Exception as e:
+                    raise MediaStoreError(f"Failed to produce media for {source_id}: {str(e)}") from e
+                finally:
+                    shutil.rmtree(temp_dir, ignore_errors=True)
+
+                log_manager.info(
+                    logger_name,
+                    "Stored source media",
+                    context={"platform": platform, "source_id": source_id, "path": final_path}
+                )
+            else:
+                log_manager.debug(
+                    logger_name,
+                    "Source media already stored",
+                    context={"platform": platform, "source_id": source_id, "path": final_path}
+                )
+
+            media_id = self._register(platform, source_id, key, time_range, fmt, final_path)
+
+        return {
+            "file_path": final_path,
+            "source_media_id": media_id,
+            "source_media_key": key,
+        }
+
+    def _register(
+        self,
+        platform: str,
+        source_id: str,
+        key: str,
+        time_range: Optional[Tuple[int, int]],
+        fmt: str,
+        file_path: str
+    ) -> int:
+        """Insert or touch the SourceMedia row for a stored file."""
+        db = SessionLocal()
+        try:
+            statement = insert(SourceMedia).values(
+                media_key=key,
+                platform=Platform(platform),
+                source_id=source_id,
+                start_ms=time_range[0] if time_range else None,
+                end_ms=time_range[1] if time_range else None,
+                format=fmt,
+                file_path=file_path,
+                size_bytes=os.path.getsize(file_path)
+            )
+            statement = statement.on_conflict_do_update(
+                index_elements=[SourceMedia.media_key],
+                set_={
+                    "file_path": statement.excluded.file_path,
+                    "size_bytes": statement.excluded.size_bytes,
+                    "last_used_at": func.now(),
+                }
+            ).returning(SourceMedia.id)
+            media_id = db.execute(statement).scalar_one()
+            db.commit()
+            return media_id
+        finally:
+            db.close()
+
+
+def reference_counts(db: Session, media_ids: Iterable[int]) -> Dict[int, int]:
+    """Count queue and posted items referencing each media ID.
+
+    Args:
+        db: Database session
+        media_ids: SourceMedia IDs
+
+    Returns:
+        Dictionary of media ID to reference count (0 for unreferenced media)
+    """
+    media_ids = list(media_ids)
+    counts = {media_id: 0 for media_id in media_ids}
+    if not media_ids:
+        return counts
+
+    for model in (ContentQueueItem, PostedItem):
+        for media_id, count in (
+            db.query(model.source_media_id, func.count(model.id))
+            .filter(model.source_media_id.in_(media_ids))
+            .group_by(model.source_media_id)
+        ):
+            counts[media_id] += count
+    return counts
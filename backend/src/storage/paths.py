@@ -0,0 +1,25 @@
+"""Storage path layout helpers."""
+import hashlib
+import os
+
+
+def shard_for(key: str, depth: int = 2) -> str:
+    """Directory shard for a key, e.g. "3f/a1" for depth 2.
+
+    Sharding keeps any single directory small enough to list quickly even
+    when millions of files are stored.
+    """
+    digest = hashlib.sha1(key.encode()).hexdigest()
+    return os.path.join(*(digest[i * 2:i * 2 + 2] for i in range(depth)))
+
+
+def sharded_path(root: str, namespace: str, key: str, filename: str) -> str:
+    """Build a sharded path of the form root/namespace/xx/yy/filename.
+
+    Args:
+        root: Storage root, e.g. settings.SOURCE_CONTENT_PATH
+        namespace: Top-level grouping, usually the platform name
+        key: Value the shard is derived from, e.g. the video ID
+        filename: File name inside the shard directory
+    """
+    return os.path.join(root, namespace, shard_for(key), filename)
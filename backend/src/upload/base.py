@@ -1,12 +1,87 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, TypedDict
+
+
+class UploadError(Exception):
+    """Raised when content cannot be uploaded to a destination platform."""
+    pass
+
+
+class PostMetrics(TypedDict, total=False):
+    views: int
+    likes: int
+    comments: int
+    shares: int
 
 
 class UploadAdapter(ABC):
+    """Uploads edited content to a destination platform."""
+
+    # Post IDs accepted by a single fetch_metrics request
+    metrics_batch_size = 1
+
     @abstractmethod
-    def auth(self, config: Dict[str, Any]) -> None:
+    def auth(self, credentials: Dict[str, Any]) -> None:
+        """Validate credentials and prepare the adapter to use them.
+
+        Raises:
+            UploadError: If required credentials are missing
+        """
         pass
 
     @abstractmethod
-    def upload(self) -> Dict[str, Any]:
+    def upload_content(
+        self,
+        path: str,
+        credentials: Dict[str, Any],
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Upload a media file and publish it.
+
+        Args:
+            path: Path of the file to upload
+            credentials: Destination account credentials
+            metadata: Optional post metadata such as "caption"
+
+        Returns:
+            Dictionary with at least the platform post "id"
+
+        Raises:
+            UploadError: If the upload or publish fails
+        """
         pass
+
+    def fetch_metrics(self, credentials: Dict[str, Any], external_ids: List[str]) -> Dict[str, PostMetrics]:
+        """Fetch engagement counters of published posts in one platform request.
+
+        Args:
+            credentials: Destination account credentials
+            external_ids: Platform post IDs, at most ``metrics_batch_size``
+
+        Returns:
+            Dictionary of post ID to its counters; posts the platform no longer
+            knows are left out
+
+        Raises:
+            UploadError: If the request fails
+        """
+        return {}
+
+    def resolve_post_ids(self, credentials: Dict[str, Any], external_ids: List[str]) -> Dict[str, Optional[str]]:
+        """Map stored external IDs to the post IDs fetch_metrics accepts.
+
+        Some platforms return a provisional ID from the upload, e.g. a TikTok
+        publish ID, that only later resolves to the post ID.
+
+        Args:
+            credentials: Destination account credentials
+            external_ids: External IDs stored by upload_content
+
+        Returns:
+            Dictionary of external ID to post ID, or to None if the post can
+            never be polled; IDs that cannot be resolved yet are left out
+
+        Raises:
+            UploadError: If a request fails
+        """
+        return {external_id: external_id for external_id in external_ids}
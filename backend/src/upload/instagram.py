@@ -1,17 +1,192 @@
-from src.upload.platforms.base import UploadAdapter
-from src.upload.platforms.registry import UploadRegistry
+from typing import Any, Dict, List, Optional, Tuple
+import time
+import requests
+from src.core.credentials import CredentialCache
+from src.upload.base import PostMetrics, UploadAdapter, UploadError
+from src.upload.registry import UploadRegistry
+from src.upload.resumable import (
+    ChunkResult,
+    FileSlice,
+    ResumableTransport,
+    ResumableUploader,
+    TransientUploadError,
+    check_response,
+)
 from src.database.models import Platform
+from src.database.session import SessionLocal
+from src.logging.log_manager import LogManager
+from config import Settings
+
+settings = Settings()
+log_manager = LogManager()
+logger_name = "instagram-uploader"
+
+GRAPH_API_URL = f"https://graph.facebook.com/{settings.INSTAGRAM_GRAPH_API_VERSION}"
+
+
+class InstagramReelTransport(ResumableTransport):
+    """Resumable Reels upload through the Instagram Graph API.
+
+    A media container is created with upload_type=resumable, and its rupload
+    URI accepts the file in chunks addressed by the ``offset`` header. Once the
+    container has finished processing, it is published to the account.
+    """
+
+    def __init__(
+        self,
+        ig_user_id: str,
+        access_token: str,
+        caption: str = "",
+        http: Optional[requests.Session] = None
+    ):
+        self.ig_user_id = ig_user_id
+        self.access_token = access_token
+        self.caption = caption
+        self.http = http or requests
+
+    def _request(self, method: str, url: str, action: str, **kwargs: Any) -> Dict[str, Any]:
+        try:
+            response = self.http.request(method, url, timeout=settings.UPLOAD_REQUEST_TIMEOUT, **kwargs)
+        except requests.RequestException as e:
+            raise TransientUploadError(f"{action}: {str(e)}") from e
+        check_response(response, action)
+        return response.json()
+
+    def start(self, path: str, total: int) -> Tuple[str, Dict[str, Any]]:
+        container = self._request(
+            "POST",
+            f"{GRAPH_API_URL}/{self.ig_user_id}/media",
+            "Create media container",
+            data={
+                "media_type": "REELS",
+                "upload_type": "resumable",
+                "caption": self.caption,
+                "access_token": self.access_token,
+            }
+        )
+        return container["uri"], {"container_id": container["id"]}
+
+    def send_chunk(
+        self,
+        session_url: str,
+        session_data: Dict[str, Any],
+        body: FileSlice,
+        start: int,
+        end: int,
+        total: int
+    ) -> ChunkResult:
+        self._request(
+            "POST",
+            session_url,
+            "Upload chunk",
+            data=body,
+            headers={
+                "Authorization": f"OAuth {self.access_token}",
+                "offset": str(start),
+                "file_size": str(total),
+                "Content-Length": str(end - start),
+            }
+        )
+        return {"offset": end, "result": None}
+
+    def finish(self, session_url: str, session_data: Dict[str, Any], result: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        container_id = session_data["container_id"]
+        deadline = time.monotonic() + settings.UPLOAD_PUBLISH_TIMEOUT
+        while True:
+            status = self._request(
+                "GET",
+                f"{GRAPH_API_URL}/{container_id}",
+                "Get container status",
+                params={"fields": "status_code,status", "access_token": self.access_token}
+            )
+            if status.get("status_code") == "FINISHED":
+                break
+            if status.get("status_code") in ("ERROR", "EXPIRED"):
+                raise UploadError(f"Instagram could not process the video: {status.get('status')}")
+            if time.monotonic() > deadline:
+                raise TransientUploadError("Timed out waiting for Instagram to process the video")
+            time.sleep(settings.UPLOAD_PUBLISH_POLL_INTERVAL)
+
+        published = self._request(
+            "POST",
+            f"{GRAPH_API_URL}/{self.ig_user_id}/media_publish",
+            "Publish media",
+            data={"creation_id": container_id, "access_token": self.access_token}
+        )
+        return {"id": published["id"], "container_id": container_id}
 
 
 @UploadRegistry.register(Platform.INSTAGRAM)
 class InstaUploadAdapter(UploadAdapter):
-    def __init__(self, credentials, parameters):
-        self.api = None
-        self.credentials = credentials
-        self.parameters = parameters
+    metrics_batch_size = 50  # Graph API limit for ?ids= lookups
+
+    def __init__(self):
+        self.ig_user_id = None
+        self.access_token = None
+
+    def auth(self, credentials: Dict[str, Any]) -> None:
+        self.ig_user_id = credentials.get("ig_user_id")
+        self.access_token = credentials.get("access_token")
+        if not self.ig_user_id or not self.access_token:
+            raise UploadError("Instagram credentials require ig_user_id and access_token")
+
+    def upload_content(
+        self,
+        path: str,
+        credentials: Dict[str, Any],
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Upload a video as a Reel and publish it.
+
+        Args:
+            path: Path of the video file
+            credentials: Account credentials with ig_user_id and access_token
+            metadata: Optional post metadata; "caption" is used if present
+
+        Returns:
+            Dictionary with the published media "id"
+        """
+        self.auth(credentials)
+        # Reuses the account's connections across uploads
+        http = CredentialCache().client("instagram-http", self.ig_user_id, credentials, requests.Session)
+        transport = InstagramReelTransport(
+            self.ig_user_id,
+            self.access_token,
+            caption=(metadata or {}).get("caption", ""),
+            http=http
+        )
+        db = SessionLocal()
+        try:
+            return ResumableUploader(db, Platform.INSTAGRAM, transport).upload(path, self.ig_user_id)
+        finally:
+            db.close()
 
-    def auth(self, credentials):
-        pass
+    def fetch_metrics(self, credentials: Dict[str, Any], external_ids: List[str]) -> Dict[str, PostMetrics]:
+        """Fetch likes, comments and views of several Reels in one Graph API request."""
+        self.auth(credentials)
+        http = CredentialCache().client("instagram-http", self.ig_user_id, credentials, requests.Session)
+        transport = InstagramReelTransport(self.ig_user_id, self.access_token, http=http)
+        media = transport._request(
+            "GET",
+            f"{GRAPH_API_URL}/",
+            "Fetch media metrics",
+            params={
+                "ids": ",".join(external_ids),
+                "fields": "like_count,comments_count,insights.metric(views)",
+                "access_token": self.access_token,
+            }
+        )
+        metrics = {}
+        for media_id, fields in media.items():
+            insights = {
+                insight["name"]: insight["values"][0]["value"]
+                for insight in fields.get("insights", {}).get("data", [])
+                if insight.get("values")
+            }
+            metrics[media_id] = {
+                "views": insights.get("views"),
+                "likes": fields.get("like_count"),
+                "comments": fields.get("comments_count"),
+            }
+        return metrics
 
-    def upload(self):
-        pass
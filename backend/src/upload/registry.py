@@ -1,4 +1,4 @@
-from typing import Type, Dict
+from typing import Type, Dict, Optional
 from abc import ABC, abstractmethod
 from src.upload.base import UploadAdapter
 from src.database.models import Platform
@@ -20,3 +20,9 @@ class UploadRegistry:
         if platform not in cls._registry:
             raise ValueError(f"No adapter registered for platform: {platform}")
         return cls._registry[platform]
+
+    @classmethod
+    def get_uploader(cls, platform: Platform) -> Optional[UploadAdapter]:
+        """Return a new uploader for a platform, or None if none is registered."""
+        adapter_class = cls._registry.get(platform)
+        return adapter_class() if adapter_class else None
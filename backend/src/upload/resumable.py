@@ -0,0 +1,347 @@
+"""Chunked, resumable upload engine shared by the upload adapters."""
+from abc import ABC, abstractmethod
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Tuple, TypedDict
+from datetime import datetime, timedelta, timezone
+import hashlib
+import os
+import re
+import time
+import requests
+from sqlalchemy.orm import Session
+from src.database.models import Platform, UploadSession, UploadSessionStatus
+from src.upload.base import UploadError
+from src.logging.log_manager import LogManager
+from config import Settings
+
+settings = Settings()
+log_manager = LogManager()
+logger_name = "resumable-upload"
+
+
+class TransientUploadError(UploadError):
+    """Raised for failures worth retrying, e.g. timeouts and 5xx responses."""
+    pass
+
+
+class SessionExpiredError(UploadError):
+    """Raised when the platform no longer knows the upload session."""
+    pass
+
+
+class ChunkResult(TypedDict):
+    offset: int  # Bytes acknowledged by the platform
+    result: Optional[Dict[str, Any]]  # Set once the platform reports the upload complete
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class FileSlice:
+    """Read-only file-like view of bytes [start, end) of an open file.
+
+    HTTP clients read request bodies from it in small blocks, so a chunk is
+    streamed from disk and never held in memory as a whole.
+    """
+
+    def __init__(self, file: BinaryIO, start: int, end: int):
+        self._file = file
+        self._remaining = end - start
+        self._length = end - start
+        file.seek(start)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0 or size > settings.UPLOAD_BUFFER_SIZE:
+            size = settings.UPLOAD_BUFFER_SIZE
+        data = self._file.read(min(size, self._remaining))
+        self._remaining -= len(data)
+        return data
+
+
+def check_response(response: requests.Response, action: str) -> None:
+    """Raise the matching UploadError for a failed platform response."""
+    if response.status_code in (404, 410):
+        raise SessionExpiredError(f"{action}: upload session expired (HTTP {response.status_code})")
+    if response.status_code == 429 or response.status_code >= 500:
+        raise TransientUploadError(f"{action}: HTTP {response.status_code}")
+    if response.status_code >= 400:
+        raise UploadError(f"{action}: HTTP {response.status_code} {response.text[:500]}")
+
+
+class ResumableTransport(ABC):
+    """Platform side of a resumable upload: how to open a session and send chunks."""
+
+    # How long a platform keeps an unfinished upload session
+    session_ttl = timedelta(hours=24)
+
+    def chunk_ranges(self, total: int, offset: int) -> Iterator[Tuple[int, int]]:
+        """(start, end) byte ranges still to send, starting at ``offset``."""
+        for start in range(offset, total, settings.UPLOAD_CHUNK_SIZE):
+            yield start, min(start + settings.UPLOAD_CHUNK_SIZE, total)
+
+    @abstractmethod
+    def start(self, path: str, total: int) -> Tuple[str, Dict[str, Any]]:
+        """Open an upload session.
+
+        Returns:
+            (session URL, platform data needed to continue and finish the upload)
+        """
+        pass
+
+    @abstractmethod
+    def send_chunk(
+        self,
+        session_url: str,
+        session_data: Dict[str, Any],
+        body: FileSlice,
+        start: int,
+        end: int,
+        total: int
+    ) -> ChunkResult:
+        """Send bytes [start, end) of the file."""
+        pass
+
+    def query_offset(self, session_url: str, session_data: Dict[str, Any], total: int) -> Optional[ChunkResult]:
+        """Ask the platform how many bytes it has, or None to trust the stored offset."""
+        return None
+
+    def finish(self, session_url: str, session_data: Dict[str, Any], result: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Publish the uploaded media and return the platform result with its "id"."""
+        return result or {}
+
+
+class ContentRangeTransport(ResumableTransport):
+    """Resumable upload protocol based on Content-Range PUTs.
+
+    The session is opened with a POST that returns the session URL in the
+    Location header. Each chunk is a PUT with a Content-Range header. The server
+    answers 308 with a Range header while the upload is incomplete and 200/201
+    with the JSON result once it has every byte. A PUT with ``bytes */total``
+    asks for the current offset. This is the protocol of the YouTube Data API
+    and of the local mock upload server.
+    """
+
+    def __init__(self, init_url: str, headers: Optional[Dict[str, str]] = None, metadata: Optional[Dict[str, Any]] = None):
+        self.init_url = init_url
+        self.headers = headers or {}
+        self.metadata = metadata or {}
+
+    def start(self, path: str, total: int) -> Tuple[str, Dict[str, Any]]:
+        try:
+            response = requests.post(
+                self.init_url,
+                json=self.metadata,
+                headers={**self.headers, "X-Upload-Content-Length": str(total)},
+                timeout=settings.UPLOAD_REQUEST_TIMEOUT
+            )
+        except requests.RequestException as e:
+            raise TransientUploadError(f"Failed to open upload session: {str(e)}") from e
+        check_response(response, "Open upload session")
+        session_url = response.headers.get("Location")
+        if not session_url:
+            raise UploadError("Upload session response has no Location header")
+        return session_url, {}
+
+    def _parse(self, response: requests.Response, action: str) -> ChunkResult:
+        if response.status_code == 308:
+            # Range: bytes=0-N means bytes up to and including N were received
+            match = re.match(r"bytes=0-(\d+)", response.headers.get("Range", ""))
+            return {"offset": int(match.group(1)) + 1 if match else 0, "result": None}
+        check_response(response, action)
+        return {"offset": -1, "result": response.json() if response.content else {}}
+
+    def send_chunk(
+        self,
+        session_url: str,
+        session_data: Dict[str, Any],
+        body: FileSlice,
+        start: int,
+        end: int,
+        total: int
+    ) -> ChunkResult:
+        try:
+            response = requests.put(
+                session_url,
+                data=body,
+                headers={
+                    **self.headers,
+                    "Content-Length": str(end - start),
+                    "Content-Range": f"bytes {start}-{end - 1}/{total}",
+                },
+                timeout=settings.UPLOAD_REQUEST_TIMEOUT
+            )
+        except requests.RequestException as e:
+            raise TransientUploadError(f"Failed to upload chunk: {str(e)}") from e
+        result = self._parse(response, "Upload chunk")
+        if result["result"] is not None:
+            result["offset"] = total
+        return result
+
+    def query_offset(self, session_url: str, session_data: Dict[str, Any], total: int) -> Optional[ChunkResult]:
+        try:
+            response = requests.put(
+                session_url,
+                headers={**self.headers, "Content-Length": "0", "Content-Range": f"bytes */{total}"},
+                timeout=settings.UPLOAD_REQUEST_TIMEOUT
+            )
+        except requests.RequestException as e:
+            raise TransientUploadError(f"Failed to query upload offset: {str(e)}") from e
+        result = self._parse(response, "Query upload offset")
+        if result["result"] is not None:
+            result["offset"] = total
+        return result
+
+
+class ResumableUploader:
+    """Uploads a file in chunks, persisting progress in an UploadSession row.
+
+    The acknowledged offset is saved after every chunk. If a worker dies
+    mid-upload, the next attempt for the same file and account reopens the
+    session, asks the platform for its offset where supported and continues
+    from there. A completed upload is remembered, so retrying a post whose
+    upload already finished does not publish it twice.
+    """
+
+    def __init__(self, db: Session, platform: Platform, transport: ResumableTransport):
+        self.db = db
+        self.platform = platform
+        self.transport = transport
+
+    def _upload_key(self, account_key: str, path: str, size: int) -> str:
+        mtime = int(os.path.getmtime(path))
+        raw = f"{self.platform.value}:{account_key}:{os.path.abspath(path)}:{size}:{mtime}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _save(self, session: UploadSession, **values: Any) -> None:
+        for name, value in values.items():
+            setattr(session, name, value)
+        self.db.add(session)
+        self.db.commit()
+
+    def _open_session(self, session: UploadSession, path: str) -> None:
+        session_url, session_data = self.transport.start(path, session.file_size)
+        self._save(
+            session,
+            session_url=session_url,
+            session_data=session_data,
+            offset=0,
+            status=UploadSessionStatus.IN_PROGRESS,
+            error=None,
+            expires_at=_utcnow() + self.transport.session_ttl
+        )
+        log_manager.info(
+            logger_name,
+            "Opened upload session",
+            context={"platform": self.platform.value, "upload_session_id": session.id, "size": session.file_size}
+        )
+
+    def _send(self, session: UploadSession, path: str) -> Optional[Dict[str, Any]]:
+        """Send the remaining chunks and return the platform result once complete."""
+        status = self.transport.query_offset(session.session_url, session.session_data or {}, session.file_size)
+        if status is not None:
+            if status["result"] is not None:
+                return status["result"]
+            self._save(session, offset=status["offset"])
+
+        result = None
+        with open(path, "rb") as f:
+            for start, end in self.transport.chunk_ranges(session.file_size, session.offset):
+                chunk = self.transport.send_chunk(
+                    session.session_url,
+                    session.session_data or {},
+                    FileSlice(f, start, end),
+                    start,
+                    end,
+                    session.file_size
+                )
+                self._save(session, offset=chunk["offset"])
+                if chunk["result"] is not None:
+                    result = chunk["result"]
+                    break
+                if chunk["offset"] < end:
+                    # Retried from the acknowledged offset
+                    raise TransientUploadError(
+                        f"Platform acknowledged {chunk['offset']} of {end} bytes"
+                    )
+        return result
+
+    def upload(self, path: str, account_key: str) -> Dict[str, Any]:
+        """Upload a file, resuming an earlier attempt if there is one.
+
+        Args:
+            path: Path of the file to upload
+            account_key: Stable identifier of the destination account
+
+        Returns:
+            Platform result with the post "id"
+
+        Raises:
+            UploadError: If the upload fails after retries
+        """
+        size = os.path.getsize(path)
+        upload_key = self._upload_key(account_key, path, size)
+        session = self.db.query(UploadSession).filter(UploadSession.upload_key == upload_key).first()
+        if session and session.status == UploadSessionStatus.COMPLETED:
+            log_manager.info(
+                logger_name,
+                "Upload already completed",
+                context={"platform": self.platform.value, "upload_session_id": session.id}
+            )
+            return session.result
+        if session is None:
+            session = UploadSession(
+                upload_key=upload_key,
+                platform=self.platform,
+                file_path=path,
+                file_size=size,
+                offset=0
+            )
+            self._save(session)
+
+        attempts = 0
+        while True:
+            try:
+                if (
+                    not session.session_url
+                    or session.status == UploadSessionStatus.FAILED
+                    or (session.expires_at and session.expires_at <= _utcnow())
+                ):
+                    self._open_session(session, path)
+                else:
+                    log_manager.info(
+                        logger_name,
+                        "Resuming upload",
+                        context={"platform": self.platform.value, "upload_session_id": session.id, "offset": session.offset}
+                    )
+                result = self._send(session, path)
+                result = self.transport.finish(session.session_url, session.session_data or {}, result)
+                self._save(session, status=UploadSessionStatus.COMPLETED, result=result, offset=size)
+                log_manager.info(
+                    logger_name,
+                    "Upload completed",
+                    context={"platform": self.platform.value, "upload_session_id": session.id, "id": result.get("id")}
+                )
+                return result
+            except SessionExpiredError:
+                attempts += 1
+                if attempts > settings.UPLOAD_MAX_RETRIES:
+                    raise
+                self._save(session, session_url=None, offset=0)
+            except TransientUploadError as e:
+                attempts += 1
+                if attempts > settings.UPLOAD_MAX_RETRIES:
+                    # Leave the session in progress so the next attempt resumes it
+                    self._save(session, error=str(e))
+                    raise
+                log_manager.warning(
+                    logger_name,
+                    "Upload interrupted, retrying",
+                    context={"platform": self.platform.value, "upload_session_id": session.id, "attempt": attempts}
+                )
+                time.sleep(min(2 ** attempts, 60))
+            except UploadError as e:
+                self._save(session, status=UploadSessionStatus.FAILED, error=str(e))
+                raise
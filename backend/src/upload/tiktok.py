@@ -0,0 +1,252 @@
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from datetime import timedelta
+import hashlib
+import time
+import requests
+from src.core.credentials import CredentialCache
+from src.upload.base import PostMetrics, UploadAdapter, UploadError
+from src.upload.registry import UploadRegistry
+from src.upload.resumable import (
+    ChunkResult,
+    FileSlice,
+    ResumableTransport,
+    ResumableUploader,
+    TransientUploadError,
+    check_response,
+)
+from src.database.models import Platform
+from src.database.session import SessionLocal
+from src.logging.log_manager import LogManager
+from config import Settings
+
+settings = Settings()
+log_manager = LogManager()
+logger_name = "tiktok-uploader"
+
+TIKTOK_API_URL = "https://open.tiktokapis.com/v2"
+MIN_CHUNK_SIZE = 5 * 1024 * 1024  # Smaller files must be sent as a single chunk
+
+
+class TikTokTransport(ResumableTransport):
+    """Chunked upload through the TikTok Content Posting API.
+
+    TikTok fixes the chunk layout when the upload is initialised: every chunk
+    has the declared size except the last, which absorbs the remainder. Chunks
+    are PUT to the upload URL with a Content-Range header.
+    """
+
+    # Upload URLs are valid for one hour
+    session_ttl = timedelta(hours=1)
+
+    def __init__(
+        self,
+        access_token: str,
+        title: str = "",
+        privacy_level: str = "SELF_ONLY",
+        http: Optional[requests.Session] = None
+    ):
+        self.access_token = access_token
+        self.title = title
+        self.privacy_level = privacy_level
+        self.http = http or requests
+
+    def _layout(self, total: int) -> Tuple[int, int]:
+        """(chunk size, chunk count) for a file of ``total`` bytes."""
+        if total < MIN_CHUNK_SIZE:
+            return total, 1
+        # TikTok rejects a declared chunk size larger than the video
+        chunk_size = min(settings.TIKTOK_CHUNK_SIZE, total)
+        return chunk_size, max(total // chunk_size, 1)
+
+    def chunk_ranges(self, total: int, offset: int) -> Iterator[Tuple[int, int]]:
+        chunk_size, count = self._layout(total)
+        for index in range(count):
+            start = index * chunk_size
+            end = total if index == count - 1 else start + chunk_size
+            if end > offset:
+                yield start, end
+
+    def _request(self, method: str, url: str, action: str, **kwargs: Any) -> Dict[str, Any]:
+        try:
+            response = self.http.request(
+                method,
+                url,
+                headers={"Authorization": f"Bearer {self.access_token}"},
+                timeout=settings.UPLOAD_REQUEST_TIMEOUT,
+                **kwargs
+            )
+        except requests.RequestException as e:
+            raise TransientUploadError(f"{action}: {str(e)}") from e
+        check_response(response, action)
+        payload = response.json()
+        error = payload.get("error", {})
+        if error.get("code") not in (None, "ok"):
+            raise UploadError(f"{action}: {error.get('code')} {error.get('message')}")
+        return payload["data"]
+
+    def start(self, path: str, total: int) -> Tuple[str, Dict[str, Any]]:
+        chunk_size, count = self._layout(total)
+        data = self._request(
+            "POST",
+            f"{TIKTOK_API_URL}/post/publish/video/init/",
+            "Initialise upload",
+            json={
+                "post_info": {"title": self.title, "privacy_level": self.privacy_level},
+                "source_info": {
+                    "source": "FILE_UPLOAD",
+                    "video_size": total,
+                    "chunk_size": chunk_size,
+                    "total_chunk_count": count,
+                },
+            }
+        )
+        return data["upload_url"], {"publish_id": data["publish_id"]}
+
+    def send_chunk(
+        self,
+        session_url: str,
+        session_data: Dict[str, Any],
+        body: FileSlice,
+        start: int,
+        end: int,
+        total: int
+    ) -> ChunkResult:
+        try:
+            response = self.http.put(
+                session_url,
+                data=body,
+                headers={
+                    "Content-Type": "video/mp4",
+                    "Content-Length": str(end - start),
+                    "Content-Range": f"bytes {start}-{end - 1}/{total}",
+                },
+                timeout=settings.UPLOAD_REQUEST_TIMEOUT
+            )
+        except requests.RequestException as e:
+            raise TransientUploadError(f"Failed to upload chunk: {str(e)}") from e
+        check_response(response, "Upload chunk")
+        if response.status_code == 201:
+            return {"offset": total, "result": {"publish_id": session_data["publish_id"]}}
+        return {"offset": end, "result": None}
+
+    def finish(self, session_url: str, session_data: Dict[str, Any], result: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        publish_id = session_data["publish_id"]
+        deadline = time.monotonic() + settings.UPLOAD_PUBLISH_TIMEOUT
+        while time.monotonic() < deadline:
+            status = self._request(
+                "POST",
+                f"{TIKTOK_API_URL}/post/publish/status/fetch/",
+                "Fetch publish status",
+                json={"publish_id": publish_id}
+            )
+            if status.get("status") == "PUBLISH_COMPLETE":
+                post_ids = status.get("publicaly_available_post_id") or []
+                return {"id": str(post_ids[0]) if post_ids else publish_id, "publish_id": publish_id}
+            if status.get("status") == "FAILED":
+                raise UploadError(f"TikTok could not publish the video: {status.get('fail_reason')}")
+            time.sleep(settings.UPLOAD_PUBLISH_POLL_INTERVAL)
+
+        # Processing continues on TikTok's side, the publish ID identifies the post until then
+        log_manager.warning(
+            logger_name,
+            "TikTok publish still processing",
+            context={"publish_id": publish_id}
+        )
+        return {"id": publish_id, "publish_id": publish_id}
+
+
+@UploadRegistry.register(Platform.TIKTOK)
+class TikTokUploadAdapter(UploadAdapter):
+    metrics_batch_size = 20  # video/query accepts up to 20 video IDs
+
+    def __init__(self):
+        self.access_token = None
+        self.account_key = None
+
+    def auth(self, credentials: Dict[str, Any]) -> None:
+        self.access_token = credentials.get("access_token")
+        if not self.access_token:
+            raise UploadError("TikTok credentials require an access_token")
+        # open_id is stable across token refreshes, the token hash is a fallback
+        self.account_key = credentials.get("open_id") or hashlib.sha256(self.access_token.encode()).hexdigest()[:16]
+
+    def upload_content(
+        self,
+        path: str,
+        credentials: Dict[str, Any],
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Upload a video and publish it.
+
+        Args:
+            path: Path of the video file
+            credentials: Account credentials with access_token (and open_id)
+            metadata: Optional post metadata; "caption" and "privacy_level" are used if present
+
+        Returns:
+            Dictionary with the post "id" and the TikTok publish_id
+        """
+        self.auth(credentials)
+        metadata = metadata or {}
+        # Reuses the account's connections across uploads
+        http = CredentialCache().client("tiktok-http", self.account_key, credentials, requests.Session)
+        transport = TikTokTransport(
+            self.access_token,
+            title=metadata.get("caption", ""),
+            privacy_level=metadata.get("privacy_level", settings.TIKTOK_PRIVACY_LEVEL),
+            http=http
+        )
+        db = SessionLocal()
+        try:
+            return ResumableUploader(db, Platform.TIKTOK, transport).upload(path, self.account_key)
+        finally:
+            db.close()
+
+    def resolve_post_ids(self, credentials: Dict[str, Any], external_ids: List[str]) -> Dict[str, Optional[str]]:
+        """Resolve publish IDs stored for posts that were still processing or are private.
+
+        Video IDs are numeric. Any other ID is a publish ID, resolved through
+        the publish status; a post published without a public post ID, e.g.
+        with privacy level SELF_ONLY, is never returned by video/query.
+        """
+        self.auth(credentials)
+        http = CredentialCache().client("tiktok-http", self.account_key, credentials, requests.Session)
+        transport = TikTokTransport(self.access_token, http=http)
+        resolved: Dict[str, Optional[str]] = {}
+        for external_id in external_ids:
+            if external_id.isdigit():
+                resolved[external_id] = external_id
+                continue
+            status = transport._request(
+                "POST",
+                f"{TIKTOK_API_URL}/post/publish/status/fetch/",
+                "Fetch publish status",
+                json={"publish_id": external_id}
+            )
+            if status.get("status") == "PUBLISH_COMPLETE":
+                post_ids = status.get("publicaly_available_post_id") or []
+                resolved[external_id] = str(post_ids[0]) if post_ids else None
+            elif status.get("status") == "FAILED":
+                resolved[external_id] = None
+        return resolved
+
+    def fetch_metrics(self, credentials: Dict[str, Any], external_ids: List[str]) -> Dict[str, PostMetrics]:
+        """Fetch views, likes, comments and shares of several videos in one request."""
+        self.auth(credentials)
+        http = CredentialCache().client("tiktok-http", self.account_key, credentials, requests.Session)
+        data = TikTokTransport(self.access_token, http=http)._request(
+            "POST",
+            f"{TIKTOK_API_URL}/video/query/?fields=id,view_count,like_count,comment_count,share_count",
+            "Query video metrics",
+            json={"filters": {"video_ids": external_ids}}
+        )
+        return {
+            str(video["id"]): {
+                "views": video.get("view_count"),
+                "likes": video.get("like_count"),
+                "comments": video.get("comment_count"),
+                "shares": video.get("share_count"),
+            }
+            for video in data.get("videos", [])
+        }
+
@@ -0,0 +1,40 @@
+import os
+
+# Settings require a database URL; tests never connect to it
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/contentapp_test")
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from src.database.models import UploadSession
+from src.upload import resumable
+
+
+@pytest.fixture
+def db():
+    """Session on an in-memory database holding only the upload_sessions table."""
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    UploadSession.__table__.create(bind=engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    """Retry without the uploader's backoff sleeps."""
+    monkeypatch.setattr(resumable.time, "sleep", lambda seconds: None)
+
+
+@pytest.fixture
+def video_file(tmp_path):
+    """Write a file of ``size`` bytes with a recognisable pattern and return its path."""
+    def make(size: int) -> str:
+        path = tmp_path / f"video_{size}.mp4"
+        path.write_bytes(bytes(index % 251 for index in range(size)))
+        return str(path)
+    return make
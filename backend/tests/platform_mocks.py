@@ -0,0 +1,175 @@
+"""In-process mocks of the Instagram and TikTok resumable upload protocols.
+
+Both are passed to the transports as their ``http`` session. They keep the
+received bytes per upload session, check offsets and chunk boundaries the way
+the platforms do, and can drop chosen chunk requests or expire sessions.
+"""
+from typing import Any, Dict, Iterable, Optional
+import json
+import re
+import requests
+from src.upload.instagram import GRAPH_API_URL
+from src.upload.tiktok import TIKTOK_API_URL
+
+RUPLOAD_URL = "https://rupload.facebook.com/ig-api-upload"
+TIKTOK_UPLOAD_URL = "https://open-upload.tiktokapis.com/upload"
+
+
+def response(status_code: int, payload: Optional[Dict[str, Any]] = None) -> requests.Response:
+    result = requests.Response()
+    result.status_code = status_code
+    result._content = json.dumps(payload).encode() if payload is not None else b""
+    return result
+
+
+def read_body(body: Any) -> bytes:
+    """Drain a request body the way an HTTP client streams a FileSlice."""
+    if body is None:
+        return b""
+    if isinstance(body, bytes):
+        return body
+    data = b""
+    while True:
+        block = body.read(64 * 1024)
+        if not block:
+            return data
+        data += block
+
+
+class InstagramMock:
+    """Graph API media containers with a rupload URI that takes ``offset``-addressed chunks.
+
+    Args:
+        ig_user_id: Account the containers are created for
+        fail_requests: Numbers (from 1) of chunk requests that drop the connection
+    """
+
+    def __init__(self, ig_user_id: str, fail_requests: Iterable[int] = ()):
+        self.ig_user_id = ig_user_id
+        self.fail_requests = set(fail_requests)
+        self.containers: Dict[str, Dict[str, Any]] = {}
+        self.chunk_requests = 0
+        self.accepted_offsets = []  # (container ID, offset) of every stored chunk
+        self.published = []
+
+    def expire(self, container_id: str) -> None:
+        self.containers[container_id]["expired"] = True
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        if method == "POST" and url == f"{GRAPH_API_URL}/{self.ig_user_id}/media":
+            assert kwargs["data"]["upload_type"] == "resumable"
+            container_id = f"container-{len(self.containers) + 1}"
+            self.containers[container_id] = {"data": bytearray(), "total": None, "expired": False}
+            return response(200, {"id": container_id, "uri": f"{RUPLOAD_URL}/{container_id}"})
+
+        if method == "POST" and url.startswith(RUPLOAD_URL):
+            container_id = url.rsplit("/", 1)[1]
+            container = self.containers[container_id]
+            headers = kwargs["headers"]
+            body = read_body(kwargs.get("data"))
+            self.chunk_requests += 1
+            if container["expired"]:
+                return response(404, {"debug_info": {"message": "Upload session not found"}})
+            if self.chunk_requests in self.fail_requests:
+                raise requests.ConnectionError("Connection reset by peer")
+            offset = int(headers["offset"])
+            if offset != len(container["data"]):
+                return response(400, {"debug_info": {"message": f"Expected offset {len(container['data'])}"}})
+            container["total"] = int(headers["file_size"])
+            container["data"] += body
+            self.accepted_offsets.append((container_id, offset))
+            return response(200, {"success": True})
+
+        if method == "GET" and url.startswith(f"{GRAPH_API_URL}/container-"):
+            container = self.containers[url.rsplit("/", 1)[1]]
+            complete = container["total"] is not None and len(container["data"]) == container["total"]
+            return response(200, {"status_code": "FINISHED" if complete else "ERROR", "id": url.rsplit("/", 1)[1]})
+
+        if method == "POST" and url == f"{GRAPH_API_URL}/{self.ig_user_id}/media_publish":
+            self.published.append(kwargs["data"]["creation_id"])
+            return response(200, {"id": f"media-{len(self.published)}"})
+
+        raise AssertionError(f"Unexpected request {method} {url}")
+
+
+class TikTokMock:
+    """Content Posting API uploads with a chunk layout fixed at initialisation.
+
+    Args:
+        min_chunk_size: Smallest chunk accepted, unless the video is a single chunk
+        fail_requests: Numbers (from 1) of chunk requests that drop the connection
+    """
+
+    def __init__(self, min_chunk_size: int, fail_requests: Iterable[int] = ()):
+        self.min_chunk_size = min_chunk_size
+        self.fail_requests = set(fail_requests)
+        self.uploads: Dict[str, Dict[str, Any]] = {}
+        self.chunk_requests = 0
+        self.accepted_ranges = []  # (publish ID, start, end) of every stored chunk
+
+    def expire(self, publish_id: str) -> None:
+        self.uploads[publish_id]["expired"] = True
+
+    @staticmethod
+    def _error(code: str, message: str) -> requests.Response:
+        return response(400, {"data": {}, "error": {"code": code, "message": message}})
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        payload = kwargs.get("json") or {}
+        if method == "POST" and url == f"{TIKTOK_API_URL}/post/publish/video/init/":
+            source = payload["source_info"]
+            total, chunk_size, count = source["video_size"], source["chunk_size"], source["total_chunk_count"]
+            if chunk_size > total:
+                return self._error("invalid_params", "chunk_size must not exceed video_size")
+            if count > 1 and chunk_size < self.min_chunk_size:
+                return self._error("invalid_params", "chunk_size below the minimum")
+            if count != max(total // chunk_size, 1):
+                return self._error("invalid_params", "total_chunk_count does not match the layout")
+            publish_id = f"v_pub_file~v2-{len(self.uploads) + 1}"
+            self.uploads[publish_id] = {
+                "data": bytearray(),
+                "total": total,
+                "chunk_size": chunk_size,
+                "count": count,
+                "expired": False,
+            }
+            return response(200, {
+                "data": {"publish_id": publish_id, "upload_url": f"{TIKTOK_UPLOAD_URL}/{publish_id}"},
+                "error": {"code": "ok"},
+            })
+
+        if method == "POST" and url == f"{TIKTOK_API_URL}/post/publish/status/fetch/":
+            upload = self.uploads[payload["publish_id"]]
+            if len(upload["data"]) != upload["total"]:
+                return response(200, {"data": {"status": "FAILED", "fail_reason": "file_incomplete"}, "error": {"code": "ok"}})
+            return response(200, {
+                "data": {"status": "PUBLISH_COMPLETE", "publicaly_available_post_id": [7300000000000000000 + len(self.uploads)]},
+                "error": {"code": "ok"},
+            })
+
+        raise AssertionError(f"Unexpected request {method} {url}")
+
+    def put(self, url: str, data: Any = None, headers: Optional[Dict[str, str]] = None, **kwargs: Any) -> requests.Response:
+        publish_id = url.rsplit("/", 1)[1]
+        upload = self.uploads[publish_id]
+        body = read_body(data)
+        self.chunk_requests += 1
+        if upload["expired"]:
+            return response(404)
+        if self.chunk_requests in self.fail_requests:
+            raise requests.ConnectionError("Connection reset by peer")
+
+        start, last, total = (int(value) for value in re.match(r"bytes (\d+)-(\d+)/(\d+)", headers["Content-Range"]).groups())
+        index = start // upload["chunk_size"]
+        expected_end = total if index == upload["count"] - 1 else start + upload["chunk_size"]
+        if (
+            total != upload["total"]
+            or start != len(upload["data"])
+            or start != index * upload["chunk_size"]
+            or last + 1 != expected_end
+            or len(body) != expected_end - start
+        ):
+            return response(416)
+        upload["data"] += body
+        self.accepted_ranges.append((publish_id, start, last + 1))
+        return response(201 if len(upload["data"]) == total else 206)
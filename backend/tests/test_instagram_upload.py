@@ -0,0 +1,88 @@
+import pytest
+from platform_mocks import InstagramMock
+from src.database.models import Platform, UploadSession, UploadSessionStatus
+from src.upload import resumable
+from src.upload.instagram import InstagramReelTransport
+from src.upload.resumable import ResumableUploader, TransientUploadError
+
+IG_USER_ID = "17841400000000000"
+CHUNK_SIZE = 4096
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(resumable.settings, "UPLOAD_CHUNK_SIZE", CHUNK_SIZE)
+    monkeypatch.setattr(resumable.settings, "UPLOAD_MAX_RETRIES", 3)
+
+
+def upload(db, platform_mock, path):
+    transport = InstagramReelTransport(IG_USER_ID, "token", caption="caption", http=platform_mock)
+    return ResumableUploader(db, Platform.INSTAGRAM, transport).upload(path, IG_USER_ID)
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_retries_dropped_chunk_from_acknowledged_offset(db, video_file):
+    path = video_file(3 * CHUNK_SIZE + 100)
+    platform_mock = InstagramMock(IG_USER_ID, fail_requests={2})
+
+    result = upload(db, platform_mock, path)
+
+    assert result == {"id": "media-1", "container_id": "container-1"}
+    assert bytes(platform_mock.containers["container-1"]["data"]) == read(path)
+    # Every chunk was stored once, the dropped one after its retry
+    assert [offset for _, offset in platform_mock.accepted_offsets] == [0, CHUNK_SIZE, 2 * CHUNK_SIZE, 3 * CHUNK_SIZE]
+    assert platform_mock.published == ["container-1"]
+
+
+def test_resumes_interrupted_upload_in_a_new_attempt(db, video_file, monkeypatch):
+    path = video_file(3 * CHUNK_SIZE)
+    platform_mock = InstagramMock(IG_USER_ID, fail_requests={2})
+    monkeypatch.setattr(resumable.settings, "UPLOAD_MAX_RETRIES", 0)
+    with pytest.raises(TransientUploadError):
+        upload(db, platform_mock, path)
+
+    session = db.query(UploadSession).one()
+    assert session.status == UploadSessionStatus.IN_PROGRESS
+    assert session.offset == CHUNK_SIZE
+
+    # A later attempt, e.g. after a worker restart, continues the same container
+    monkeypatch.setattr(resumable.settings, "UPLOAD_MAX_RETRIES", 3)
+    result = upload(db, platform_mock, path)
+
+    assert result["container_id"] == "container-1"
+    assert len(platform_mock.containers) == 1
+    assert [offset for _, offset in platform_mock.accepted_offsets] == [0, CHUNK_SIZE, 2 * CHUNK_SIZE]
+    assert bytes(platform_mock.containers["container-1"]["data"]) == read(path)
+    assert db.query(UploadSession).one().status == UploadSessionStatus.COMPLETED
+
+
+def test_restarts_upload_when_session_expired(db, video_file, monkeypatch):
+    path = video_file(2 * CHUNK_SIZE + 10)
+    platform_mock = InstagramMock(IG_USER_ID, fail_requests={2})
+    monkeypatch.setattr(resumable.settings, "UPLOAD_MAX_RETRIES", 0)
+    with pytest.raises(TransientUploadError):
+        upload(db, platform_mock, path)
+    platform_mock.expire("container-1")
+
+    monkeypatch.setattr(resumable.settings, "UPLOAD_MAX_RETRIES", 3)
+    result = upload(db, platform_mock, path)
+
+    # The expired container is abandoned and the file is sent again from the start
+    assert result == {"id": "media-1", "container_id": "container-2"}
+    assert bytes(platform_mock.containers["container-2"]["data"]) == read(path)
+    assert platform_mock.published == ["container-2"]
+
+
+def test_completed_upload_is_not_published_twice(db, video_file):
+    path = video_file(CHUNK_SIZE + 1)
+    platform_mock = InstagramMock(IG_USER_ID)
+
+    first = upload(db, platform_mock, path)
+    second = upload(db, platform_mock, path)
+
+    assert first == second
+    assert platform_mock.published == ["container-1"]
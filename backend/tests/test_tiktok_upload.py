@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from platform_mocks import TikTokMock
+from src.database.models import Platform, UploadSession, UploadSessionStatus
+from src.upload import resumable, tiktok
+from src.upload.resumable import ResumableUploader, TransientUploadError
+from src.upload.tiktok import TikTokTransport
+
+ACCOUNT_KEY = "open-id"
+MIN_CHUNK_SIZE = 1024
+CHUNK_SIZE = 4096
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(tiktok, "MIN_CHUNK_SIZE", MIN_CHUNK_SIZE)
+    monkeypatch.setattr(tiktok.settings, "TIKTOK_CHUNK_SIZE", CHUNK_SIZE)
+    monkeypatch.setattr(resumable.settings, "UPLOAD_MAX_RETRIES", 3)
+
+
+def upload(db, platform_mock, path):
+    transport = TikTokTransport("token", title="title", http=platform_mock)
+    return ResumableUploader(db, Platform.TIKTOK, transport).upload(path, ACCOUNT_KEY)
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("size, layout", [
+    (MIN_CHUNK_SIZE - 1, (MIN_CHUNK_SIZE - 1, 1)),
+    (3000, (3000, 1)),  # Between the minimum and the configured chunk size
+    (CHUNK_SIZE, (CHUNK_SIZE, 1)),
+    (2 * CHUNK_SIZE + 100, (CHUNK_SIZE, 2)),  # The last chunk absorbs the remainder
+])
+def test_layout_never_declares_chunks_larger_than_the_video(size, layout):
+    assert TikTokTransport("token")._layout(size) == layout
+
+
+def test_uploads_file_smaller_than_the_chunk_size(db, video_file):
+    path = video_file(3000)
+    platform_mock = TikTokMock(MIN_CHUNK_SIZE)
+
+    result = upload(db, platform_mock, path)
+
+    assert result["publish_id"] == "v_pub_file~v2-1"
+    assert platform_mock.accepted_ranges == [("v_pub_file~v2-1", 0, 3000)]
+
+
+def test_retries_dropped_chunk_from_acknowledged_offset(db, video_file):
+    path = video_file(3 * CHUNK_SIZE + 500)
+    platform_mock = TikTokMock(MIN_CHUNK_SIZE, fail_requests={2})
+
+    result = upload(db, platform_mock, path)
+
+    assert result == {"id": "7300000000000000001", "publish_id": "v_pub_file~v2-1"}
+    assert bytes(platform_mock.uploads["v_pub_file~v2-1"]["data"]) == read(path)
+    assert [(start, end) for _, start, end in platform_mock.accepted_ranges] == [
+        (0, CHUNK_SIZE),
+        (CHUNK_SIZE, 2 * CHUNK_SIZE),
+        (2 * CHUNK_SIZE, 3 * CHUNK_SIZE + 500),
+    ]
+
+
+def test_resumes_interrupted_upload_in_a_new_attempt(db, video_file, monkeypatch):
+    path = video_file(3 * CHUNK_SIZE)
+    platform_mock = TikTokMock(MIN_CHUNK_SIZE, fail_requests={3})
+    monkeypatch.setattr(resumable.settings, "UPLOAD_MAX_RETRIES", 0)
+    with pytest.raises(TransientUploadError):
+        upload(db, platform_mock, path)
+
+    session = db.query(UploadSession).one()
+    assert session.status == UploadSessionStatus.IN_PROGRESS
+    assert session.offset == 2 * CHUNK_SIZE
+
+    monkeypatch.setattr(resumable.settings, "UPLOAD_MAX_RETRIES", 3)
+    result = upload(db, platform_mock, path)
+
+    assert result["publish_id"] == "v_pub_file~v2-1"
+    assert len(platform_mock.uploads) == 1
+    assert [start for _, start, _ in platform_mock.accepted_ranges] == [0, CHUNK_SIZE, 2 * CHUNK_SIZE]
+    assert bytes(platform_mock.uploads["v_pub_file~v2-1"]["data"]) == read(path)
+
+
+def test_restarts_upload_when_platform_expired_the_session(db, video_file, monkeypatch):
+    path = video_file(2 * CHUNK_SIZE)
+    platform_mock = TikTokMock(MIN_CHUNK_SIZE, fail_requests={2})
+    monkeypatch.setattr(resumable.settings, "UPLOAD_MAX_RETRIES", 0)
+    with pytest.raises(TransientUploadError):
+        upload(db, platform_mock, path)
+    platform_mock.expire("v_pub_file~v2-1")
+
+    monkeypatch.setattr(resumable.settings, "UPLOAD_MAX_RETRIES", 3)
+    result = upload(db, platform_mock, path)
+
+    assert result["publish_id"] == "v_pub_file~v2-2"
+    assert bytes(platform_mock.uploads["v_pub_file~v2-2"]["data"]) == read(path)
+
+
+def test_reopens_session_past_its_ttl_without_contacting_the_old_one(db, video_file, monkeypatch):
+    path = video_file(2 * CHUNK_SIZE)
+    platform_mock = TikTokMock(MIN_CHUNK_SIZE, fail_requests={2})
+    monkeypatch.setattr(resumable.settings, "UPLOAD_MAX_RETRIES", 0)
+    with pytest.raises(TransientUploadError):
+        upload(db, platform_mock, path)
+    session = db.query(UploadSession).one()
+    session.expires_at = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(minutes=1)
+    db.commit()
+    requests_before = platform_mock.chunk_requests
+
+    monkeypatch.setattr(resumable.settings, "UPLOAD_MAX_RETRIES", 3)
+    result = upload(db, platform_mock, path)
+
+    assert result["publish_id"] == "v_pub_file~v2-2"
+    # Only the two chunks of the new session were sent
+    assert platform_mock.chunk_requests == requests_before + 2
+    assert all(publish_id == "v_pub_file~v2-2" for publish_id, _, _ in platform_mock.accepted_ranges[1:])
@@ -2,7 +2,7 @@
 
 import { useEffect, useState } from 'react';
 import { ContentQueueItemResponse, ContentStatus } from '@/types/generated';
-import { getQueueItems } from '../services/queueService';
+import { getQueueItem, getQueueItems, subscribeToQueueEvents, QueueEvent } from '../services/queueService';
 import QueueItemModal from '../components/QueueItemModal';
 import { ClockIcon, ExclamationCircleIcon } from '@heroicons/react/24/outline';
 
@@ -15,8 +15,27 @@ export default function Home() {
 
   useEffect(() => {
     fetchQueueItems();
+    // Status changes are pushed by the server instead of re-fetching the queue
+    return subscribeToQueueEvents(handleQueueEvent, fetchQueueItems);
   }, []);
 
+  async function handleQueueEvent(event: QueueEvent) {
+    if (event.type === 'deleted') {
+      setQueueItems((items) => items.filter((item) => item.id !== event.item_id));
+    } else if (event.type === 'created') {
+      try {
+        const item = await getQueueItem(event.item_id);
+        setQueueItems((items) => [item, ...items.filter((existing) => existing.id !== item.id)]);
+      } catch {
+        // The item may already be gone; a later event or reset will catch up
+      }
+    } else {
+      setQueueItems((items) => items.map((item) => (
+        item.id === event.item_id ? { ...item, status: event.status ?? item.status, updated_at: event.at } : item
+      )));
+    }
+  }
+
   async function fetchQueueItems() {
     try {
       setLoading(true);
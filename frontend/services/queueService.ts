@@ -48,3 +48,42 @@ export async function rejectQueueItem(id: number, reason: string): Promise<void>
     throw new Error(error.detail || 'Failed to reject content');
   }
 }
+
+export type QueueEvent = {
+  type: 'created' | 'updated' | 'deleted';
+  item_id: number;
+  content_flow_id: number | null;
+  source_platform: string | null;
+  status: string | null;
+  previous_status: string | null;
+  at: string;
+};
+
+export type QueueEventFilters = {
+  flowId?: number;
+  platform?: string;
+  statuses?: string[];
+};
+
+/**
+ * Subscribe to queue item changes pushed by the server.
+ * onReset is called when events were missed and the queue must be re-fetched.
+ * Returns a function that closes the subscription.
+ */
+export function subscribeToQueueEvents(
+  onEvent: (event: QueueEvent) => void,
+  onReset: () => void,
+  filters: QueueEventFilters = {},
+): () => void {
+  const params = new URLSearchParams();
+  if (filters.flowId !== undefined) params.set('flow_id', String(filters.flowId));
+  if (filters.platform) params.set('platform', filters.platform);
+  if (filters.statuses?.length) params.set('status', filters.statuses.join(','));
+  const query = params.toString();
+
+  // EventSource reconnects by itself and resumes with the Last-Event-ID header
+  const source = new EventSource(`${API_BASE}/queues/events${query ? `?${query}` : ''}`);
+  source.addEventListener('queue_item', (event) => onEvent(JSON.parse((event as MessageEvent).data)));
+  source.addEventListener('reset', () => onReset());
+  return () => source.close();
+}
@@ -9,15 +9,22 @@ export type { OpenAPIConfig } from './core/OpenAPI';
 
 export type { BaseDiscoveryParameters } from './models/BaseDiscoveryParameters';
 export type { BaseSourcingParameters } from './models/BaseSourcingParameters';
+export type { ContentBulkFilter } from './models/ContentBulkFilter';
+export type { ContentBulkItemResult } from './models/ContentBulkItemResult';
+export type { ContentBulkReview } from './models/ContentBulkReview';
+export type { ContentBulkReviewResult } from './models/ContentBulkReviewResult';
 export type { ContentFlow } from './models/ContentFlow';
 export type { ContentFlowCreate } from './models/ContentFlowCreate';
 export { ContentProcessingType } from './models/ContentProcessingType';
 export type { ContentQueue } from './models/ContentQueue';
+export type { ContentQueueItemListEntry } from './models/ContentQueueItemListEntry';
 export type { ContentQueueItemResponse } from './models/ContentQueueItemResponse';
 export { ContentSelectionStrategy } from './models/ContentSelectionStrategy';
 export { ContentStatus } from './models/ContentStatus';
 export type { DestinationAccount } from './models/DestinationAccount';
 export type { DestinationAccountCreate } from './models/DestinationAccountCreate';
+export type { DestinationPostResponse } from './models/DestinationPostResponse';
+export { DestinationPostStatus } from './models/DestinationPostStatus';
 export type { DestinationRateLimit } from './models/DestinationRateLimit';
 export type { DestinationRateLimitCreate } from './models/DestinationRateLimitCreate';
 export type { DestinationRateLimitUpdate } from './models/DestinationRateLimitUpdate';
@@ -28,6 +35,8 @@ export type { GlobalConfigUpdate } from './models/GlobalConfigUpdate';
 export type { HTTPValidationError } from './models/HTTPValidationError';
 export type { InstagramDiscoveryParameters } from './models/InstagramDiscoveryParameters';
 export type { InstagramSourcingParameters } from './models/InstagramSourcingParameters';
+export type { PendingContentFlow } from './models/PendingContentFlow';
+export type { PendingContentItem } from './models/PendingContentItem';
 export { Platform } from './models/Platform';
 export type { PostSchedule } from './models/PostSchedule';
 export { RedditDiscoveryParameters } from './models/RedditDiscoveryParameters';
@@ -0,0 +1,19 @@
+/* generated using openapi-typescript-codegen -- do no edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+
+import type { ContentStatus } from './ContentStatus';
+import type { Platform } from './Platform';
+
+/**
+ * Selects queue items for a bulk review by their attributes instead of by id.
+ */
+export type ContentBulkFilter = {
+  content_flow_id?: (number | null);
+  source_platform?: (Platform | null);
+  status?: ContentStatus;
+  created_after?: (string | null);
+  created_before?: (string | null);
+};
+
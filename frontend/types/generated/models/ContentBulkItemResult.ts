@@ -0,0 +1,14 @@
+/* generated using openapi-typescript-codegen -- do no edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+
+import type { ContentStatus } from './ContentStatus';
+
+export type ContentBulkItemResult = {
+  id: number;
+  result: 'updated' | 'not_found' | 'not_reviewable';
+  status?: (ContentStatus | null);
+  previous_status?: (ContentStatus | null);
+};
+
@@ -0,0 +1,17 @@
+/* generated using openapi-typescript-codegen -- do no edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+
+import type { ContentBulkFilter } from './ContentBulkFilter';
+
+/**
+ * Approve or reject the listed items, or the items matching a filter.
+ */
+export type ContentBulkReview = {
+  action: 'approve' | 'reject';
+  ids?: (Array<number> | null);
+  filter?: (ContentBulkFilter | null);
+  reason?: (string | null);
+};
+
@@ -0,0 +1,14 @@
+/* generated using openapi-typescript-codegen -- do no edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+
+import type { ContentBulkItemResult } from './ContentBulkItemResult';
+
+export type ContentBulkReviewResult = {
+  action: 'approve' | 'reject';
+  updated: number;
+  has_more?: boolean;
+  results: Array<ContentBulkItemResult>;
+};
+
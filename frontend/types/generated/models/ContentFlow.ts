@@ -13,6 +13,10 @@ export type ContentFlow = {
   source_config_id: number;
   editing_pipeline_id: number;
   destination_account_id: number;
+  /**
+   * Further destination accounts each edited item is cross-posted to
+   */
+  additional_destination_ids?: Array<number>;
   source_interval?: (number | null);
   post_schedule?: (PostSchedule | null);
   is_active?: boolean;
@@ -23,5 +27,6 @@ export type ContentFlow = {
   source_config: SourceConfig;
   editing_pipeline: EditingPipeline;
   destination_account: DestinationAccount;
+  additional_destinations?: Array<DestinationAccount>;
 };
 
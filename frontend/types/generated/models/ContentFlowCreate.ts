@@ -10,6 +10,10 @@ export type ContentFlowCreate = {
   source_config_id: number;
   editing_pipeline_id: number;
   destination_account_id: number;
+  /**
+   * Further destination accounts each edited item is cross-posted to
+   */
+  additional_destination_ids?: Array<number>;
   source_interval?: (number | null);
   post_schedule?: (PostSchedule | null);
   is_active?: boolean;
@@ -0,0 +1,28 @@
+/* generated using openapi-typescript-codegen -- do no edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+
+import type { DestinationPostResponse } from './DestinationPostResponse';
+
+/**
+ * Schema for queue items in list views; only the requested fields are set.
+ */
+export type ContentQueueItemListEntry = {
+  id: number;
+  source_platform?: (string | null);
+  source_url?: (string | null);
+  source_data?: (Record<string, any> | null);
+  edited_content_path?: (string | null);
+  content_flow_id?: (number | null);
+  preview_path?: (string | null);
+  status?: (string | null);
+  error_log?: (Record<string, any> | null);
+  approved_at?: (string | null);
+  rejected_at?: (string | null);
+  rejection_reason?: (string | null);
+  destination_posts?: (Array<DestinationPostResponse> | null);
+  created_at?: (string | null);
+  updated_at?: (string | null);
+};
+
@@ -3,6 +3,8 @@
 /* tslint:disable */
 /* eslint-disable */
 
+import type { DestinationPostResponse } from './DestinationPostResponse';
+
 export type ContentQueueItemResponse = {
   id: number;
   source_platform: string;
@@ -14,6 +16,10 @@ export type ContentQueueItemResponse = {
   status: string;
   scheduled_time: (string | null);
   error_log: (Record<string, any> | null);
+  approved_at?: (string | null);
+  rejected_at?: (string | null);
+  rejection_reason?: (string | null);
+  destination_posts?: Array<DestinationPostResponse>;
   created_at: string;
   updated_at: string;
 };
@@ -10,6 +10,7 @@ export enum ContentStatus {
   EDITING = 'editing',
   READY = 'ready',
   APPROVED = 'approved',
+  REJECTED = 'rejected',
   POSTING = 'posting',
   COMPLETED = 'completed',
   EDITING_ERROR = 'editing_error',
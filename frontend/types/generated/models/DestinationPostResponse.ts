@@ -0,0 +1,17 @@
+/* generated using openapi-typescript-codegen -- do no edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+
+import type { DestinationPostStatus } from './DestinationPostStatus';
+
+export type DestinationPostResponse = {
+  id: number;
+  destination_account_id: number;
+  status: DestinationPostStatus;
+  attempts: number;
+  external_id: (string | null);
+  error: (string | null);
+  posted_at: (string | null);
+};
+
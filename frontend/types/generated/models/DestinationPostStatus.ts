@@ -0,0 +1,14 @@
+/* generated using openapi-typescript-codegen -- do no edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+
+/**
+ * Posting state of a queue item on one destination account.
+ */
+export enum DestinationPostStatus {
+  PENDING = 'pending',
+  POSTING = 'posting',
+  POSTED = 'posted',
+  FAILED = 'failed',
+}
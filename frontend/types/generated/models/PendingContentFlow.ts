@@ -0,0 +1,14 @@
+/* generated using openapi-typescript-codegen -- do no edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+
+/**
+ * Flow summary shown with items awaiting approval.
+ */
+export type PendingContentFlow = {
+  id: number;
+  name: string;
+  require_approval?: (boolean | null);
+};
+
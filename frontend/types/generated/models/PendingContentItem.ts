@@ -0,0 +1,23 @@
+/* generated using openapi-typescript-codegen -- do no edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+
+import type { PendingContentFlow } from './PendingContentFlow';
+import type { Platform } from './Platform';
+
+/**
+ * Schema for the approval inbox; carries what a reviewer needs and nothing more.
+ */
+export type PendingContentItem = {
+  id: number;
+  source_platform: Platform;
+  source_url: string;
+  source_data?: (Record<string, any> | null);
+  edited_content_path?: (string | null);
+  preview_path?: (string | null);
+  content_flow_id: number;
+  created_at: string;
+  content_flow: PendingContentFlow;
+};
+
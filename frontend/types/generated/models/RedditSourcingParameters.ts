@@ -12,5 +12,6 @@ export type RedditSourcingParameters = {
   processing_type?: ContentProcessingType;
   output_format?: string;
   max_duration?: (number | null);
+  quality?: string;
 };
 
@@ -16,5 +16,17 @@ export type YouTubeSourcingParameters = {
   end_time?: (number | null);
   quality?: string;
   include_audio?: boolean;
+  /**
+   * Length in seconds of clips generated from the most replayed heatmap
+   */
+  clip_duration?: number;
+  /**
+   * Maximum number of non-overlapping most replayed clips to extract per video
+   */
+  max_clips_per_video?: number;
+  /**
+   * Re-encode at clip boundaries for frame-accurate cuts. Defaults to keyframe cuts when the editing pipeline trims the clip
+   */
+  precise_cuts?: (boolean | null);
 };
 
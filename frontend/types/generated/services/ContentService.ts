@@ -2,7 +2,9 @@
 /* istanbul ignore file */
 /* tslint:disable */
 /* eslint-disable */
-import type { ContentQueue } from '../models/ContentQueue';
+import type { ContentBulkReview } from '../models/ContentBulkReview';
+import type { ContentBulkReviewResult } from '../models/ContentBulkReviewResult';
+import type { PendingContentItem } from '../models/PendingContentItem';
 
 import type { CancelablePromise } from '../core/CancelablePromise';
 import { OpenAPI } from '../core/OpenAPI';
@@ -12,28 +14,35 @@ export class ContentService {
 
   /**
    * Get Pending Content
-   * Get pending content that needs approval.
+   * Get content awaiting approval, newest first.
+   *
+   * Pages are chained with cursors: when more items exist, the response has an
+   * X-Next-Cursor header whose value is passed as ``cursor`` for the next page.
    *
    * Args:
-   * skip (int, optional): Number of records to skip. Defaults to 0.
-   * limit (int, optional): Maximum number of records to return. Defaults to 10.
+   * flow_id (int, optional): Only return items of this flow
+   * cursor (str, optional): Cursor of the next page
+   * limit (int, optional): Maximum number of records to return. Defaults to 50.
    *
    * Returns:
-   * List[ContentQueue]: List of pending content items
-   * @param skip
+   * List[PendingContentItem]: List of pending content items
+   * @param flowId
+   * @param cursor
    * @param limit
-   * @returns ContentQueue Successful Response
+   * @returns PendingContentItem Successful Response
    * @throws ApiError
    */
   public static getPendingContentApiContentPendingGet(
-    skip?: number,
-    limit: number = 10,
-  ): CancelablePromise<Array<ContentQueue>> {
+    flowId?: (number | null),
+    cursor?: (string | null),
+    limit: number = 50,
+  ): CancelablePromise<Array<PendingContentItem>> {
     return __request(OpenAPI, {
       method: 'GET',
       url: '/api/content/pending',
       query: {
-        'skip': skip,
+        'flow_id': flowId,
+        'cursor': cursor,
         'limit': limit,
       },
       errors: {
@@ -42,6 +51,41 @@ export class ContentService {
     });
   }
 
+  /**
+   * Review Content Bulk
+   * Approve or reject many items in one transaction.
+   *
+   * Items are selected either by ``ids``, which reports a result per id, or by
+   * ``filter``, which reports the updated items. A filter updates at most
+   * CONTENT_BULK_MAX_ITEMS items, oldest first; ``has_more`` tells whether to
+   * repeat the request.
+   *
+   * Args:
+   * request: Action, selection and rejection reason
+   *
+   * Returns:
+   * ContentBulkReviewResult: Number of updated items and per-item results
+   *
+   * Raises:
+   * HTTPException: If the selection is invalid or a rejection has no reason
+   * @param requestBody
+   * @returns ContentBulkReviewResult Successful Response
+   * @throws ApiError
+   */
+  public static reviewContentBulkApiContentBulkPost(
+    requestBody: ContentBulkReview,
+  ): CancelablePromise<ContentBulkReviewResult> {
+    return __request(OpenAPI, {
+      method: 'POST',
+      url: '/api/content/bulk',
+      body: requestBody,
+      mediaType: 'application/json',
+      errors: {
+        422: `Validation Error`,
+      },
+    });
+  }
+
   /**
    * Approve Content
    * Approve content for posting.
@@ -53,7 +97,7 @@ export class ContentService {
    * dict: Success message
    *
    * Raises:
-   * HTTPException: If content not found or approval fails
+   * HTTPException: If content not found or cannot be approved
    * @param contentId
    * @returns any Successful Response
    * @throws ApiError
@@ -85,7 +129,7 @@ export class ContentService {
    * dict: Success message
    *
    * Raises:
-   * HTTPException: If content not found
+   * HTTPException: If content not found or cannot be rejected
    * @param contentId
    * @param reason
    * @returns any Successful Response
@@ -2,6 +2,7 @@
 /* istanbul ignore file */
 /* tslint:disable */
 /* eslint-disable */
+import type { ContentQueueItemListEntry } from '../models/ContentQueueItemListEntry';
 import type { ContentQueueItemResponse } from '../models/ContentQueueItemResponse';
 
 import type { CancelablePromise } from '../core/CancelablePromise';
@@ -12,22 +13,27 @@ export class QueuesService {
 
   /**
    * Get Queue Items
-   * Get queue items with optional filtering.
+   * Get queue items with optional filtering, newest first.
+   *
+   * Pages are chained with cursors: when more items exist, the response has an
+   * X-Next-Cursor header whose value is passed as ``cursor`` for the next page.
    * @param flowId
    * @param platform
    * @param status
-   * @param skip
+   * @param cursor
    * @param limit
-   * @returns ContentQueueItemResponse Successful Response
+   * @param fields Comma-separated fields to return, e.g. id,status,preview_path. Defaults to all.
+   * @returns ContentQueueItemListEntry Successful Response
    * @throws ApiError
    */
   public static getQueueItemsApiQueuesItemsGet(
     flowId?: (number | null),
     platform?: (string | null),
     status?: (string | null),
-    skip?: number,
+    cursor?: (string | null),
     limit: number = 100,
-  ): CancelablePromise<Array<ContentQueueItemResponse>> {
+    fields?: (string | null),
+  ): CancelablePromise<Array<ContentQueueItemListEntry>> {
     return __request(OpenAPI, {
       method: 'GET',
       url: '/api/queues/items',
@@ -35,8 +41,51 @@ export class QueuesService {
         'flow_id': flowId,
         'platform': platform,
         'status': status,
-        'skip': skip,
+        'cursor': cursor,
         'limit': limit,
+        'fields': fields,
+      },
+      errors: {
+        422: `Validation Error`,
+      },
+    });
+  }
+
+  /**
+   * Stream Queue Events
+   * Stream queue item changes as server-sent events.
+   *
+   * Each ``queue_item`` event carries the item ID, its flow and platform and the
+   * status transition. A status filter matches transitions into or out of the
+   * watched statuses. Browsers resume with the Last-Event-ID header after a
+   * reconnect; ``since`` does the same for the first connection. A ``reset``
+   * event means events were missed and the client must re-fetch the queue.
+   * @param flowId
+   * @param platform
+   * @param status Comma-separated statuses to watch
+   * @param since Event ID to resume after
+   * @param lastEventId
+   * @returns any Successful Response
+   * @throws ApiError
+   */
+  public static streamQueueEventsApiQueuesEventsGet(
+    flowId?: (number | null),
+    platform?: (string | null),
+    status?: (string | null),
+    since?: (string | null),
+    lastEventId?: (string | null),
+  ): CancelablePromise<any> {
+    return __request(OpenAPI, {
+      method: 'GET',
+      url: '/api/queues/events',
+      headers: {
+        'last-event-id': lastEventId,
+      },
+      query: {
+        'flow_id': flowId,
+        'platform': platform,
+        'status': status,
+        'since': since,
       },
       errors: {
         422: `Validation Error`,